@@ -1,9 +1,42 @@
 import os
+import asyncio
+import logging
 import contextlib
 from fastapi import FastAPI
 from config.setting import env
+from app.tools.process_pool import ProcessPool
+from app.tools.pddikti_client import PddiktiClient
+from app.tools.office_converter_pool import OfficeConverterPool
+from app.tools.storage_cleanup import StorageCleanup
+from app.tools.activity_log_sink import ActivityLogSink
+from app.utils.AsyncUtils import LoopLagWatchdog, shutdown_executor, run_blocking
 from contextlib import asynccontextmanager
 
+logger = logging.getLogger(__name__)
+
+# Keeps fire-and-forget startup tasks referenced until they finish
+_startup_tasks = set()
+
+def _start_background(coro):
+    task = asyncio.create_task(coro)
+    _startup_tasks.add(task)
+    task.add_done_callback(_startup_tasks.discard)
+
+
+async def _prewarm_papi_summaries():
+    from app.services.PapiService import PapiService
+    try:
+        await run_blocking(PapiService.prewarm_summary_cache)
+    except Exception as e:
+        logger.error(f"PAPI summary cache prewarm failed: {str(e)}")
+
+
+async def _retry_storage_orphans():
+    try:
+        await StorageCleanup.retry_orphans()
+    except Exception as e:
+        logger.error(f"Orphan ledger retry failed: {str(e)}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -16,6 +49,33 @@ async def lifespan(app: FastAPI):
         
     # Phoenix.init()
 
+    # Reports coroutines that block the event loop
+    LoopLagWatchdog.start()
+
+    # Warm office workers up front (no-op unless OFFICE_CONVERTER_ENABLED)
+    try:
+        await OfficeConverterPool.start()
+    except Exception as e:
+        logger.error(f"Office converter pool failed to start: {str(e)}")
+
+    # Write-behind activity logs; replays entries spilled while the DB was down
+    ActivityLogSink.start()
+
+    # Retry storage files left behind by earlier deletions
+    _start_background(_retry_storage_orphans())
+
+    # Seed the PAPI summary cache from past logs without delaying startup
+    if env.PAPI_SUMMARY_CACHE_PREWARM:
+        _start_background(_prewarm_papi_summaries())
+
     yield
 
+    await ActivityLogSink.shutdown()
+    ProcessPool.shutdown()
+    PddiktiClient.shutdown()
+    OfficeConverterPool.shutdown()
+    StorageCleanup.shutdown()
+    LoopLagWatchdog.stop()
+    shutdown_executor()
+
 app = FastAPI(lifespan=lifespan)
@@ -2,6 +2,8 @@ from fastapi import UploadFile, HTTPException
 from typing import List, Dict, Any
 from app.services.BgCheckService import BgCheckService
 from app.tools.file_handler import FileHandler
+from app.tools.office_converter_pool import OfficeConverterPool
+from app.tools.media_payload import MediaPayload
 from app.llm.factory import get_llm
 import uuid
 
@@ -21,14 +23,14 @@ class BgCheckController:
             
             # Helper to upload
             async def process_file(file, key, folder):
-                bytes_ = await file.read()
+                media = await MediaPayload.from_upload(file)
                 path = f"{folder}/{uuid.uuid4()}_{file.filename}"
-                await FileHandler.upload_file(bytes_, path, file.content_type)
+                await FileHandler.upload_file(media.bytes, path, media.mime_type)
                 processed_files[key] = {
                     "name": file.filename,
-                    "bytes": bytes_,
+                    "media": media,
                     "path": path,
-                    "mime_type": file.content_type
+                    "mime_type": media.mime_type
                 }
 
             await process_file(file_ktp, "ktp", "bg_check/ktp")
@@ -46,18 +48,21 @@ class BgCheckController:
             
             # Analyze only
             result = await service.analyze(user_id, manual_data, processed_files)
+            MediaPayload.log_request_savings("bg_check_analyze", [f["media"] for f in processed_files.values()])
             return {"status": "success", "data": result}
             
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def generate_doc(self, data: Dict[str, Any], user_id: str):
+    async def generate_doc(self, data: Dict[str, Any], user_id: str, pdf: bool = False):
+        if pdf and not OfficeConverterPool.is_enabled():
+            raise HTTPException(status_code=400, detail="PDF output is not enabled on this server")
         try:
             llm = get_llm()
             service = BgCheckService(llm=llm)
             
             # Generate doc only
-            url = await service.generate_document(user_id, data)
-            return {"status": "success", "document_url": url}
+            urls = await service.generate_document(user_id, data, pdf=pdf)
+            return {"status": "success", **urls}
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,9 @@
+import uuid
 from fastapi import UploadFile, HTTPException
 from app.services.CvAnalyzerService import CvAnalyzerService
 from app.tools.file_handler import FileHandler
+from app.tools.media_payload import MediaPayload
 from app.llm.factory import get_llm
-import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,11 +14,12 @@ class CvController:
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
         try:
-            file_bytes = await file.read()
+            media = await MediaPayload.from_upload(file)
+            # One object per request: a history delete can never remove a CV another log still needs
             file_path = f"cvs/{uuid.uuid4()}.pdf"
             
             # Upload to Storage
-            await FileHandler.upload_file(file_bytes, file_path)
+            await FileHandler.upload_file(media.bytes, file_path)
             
             # Init Service with LLM
             llm = get_llm()
@@ -25,7 +27,8 @@ class CvController:
             
             # Process
             # User ID is now passed from the route
-            result = await service(user_id, job_position_id, file_path, file_bytes)
+            result = await service(user_id, job_position_id, file_path, media)
+            MediaPayload.log_request_savings("cv_analyzer", [media])
             
             return {"status": "success", "data": result}
             
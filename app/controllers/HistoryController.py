@@ -1,19 +1,73 @@
-from fastapi import HTTPException
+from datetime import datetime
+from typing import Optional, List
+from fastapi import HTTPException, Response
 from app.services.HistoryService import HistoryService
 
 class HistoryController:
-    async def get_history(self, limit: int, offset: int):
+    @staticmethod
+    def _require_user(user_id: Optional[str]):
+        # Owner-scoped routes must never fall back to unscoped queries
+        if not user_id:
+            raise HTTPException(status_code=401, detail={"msg": "Token has no user id"})
+
+    async def get_history(
+        self,
+        limit: int,
+        user_id: str,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        tool_type: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ):
+        self._require_user(user_id)
         try:
-            data = await HistoryService.get_logs(limit, offset)
+            page = await HistoryService.get_logs(
+                limit, cursor=cursor, tool_type=tool_type, user_id=user_id,
+                date_from=date_from, date_to=date_to, offset=offset
+            )
+            return {"status": "success", "data": page["data"], "next_cursor": page["next_cursor"]}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def get_history_detail(self, log_id: str, user_id: str):
+        self._require_user(user_id)
+        try:
+            data = await HistoryService.get_log(log_id, owner_id=user_id)
             return {"status": "success", "data": data}
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def get_artifact(self, log_id: str, field: str, user_id: str) -> Response:
+        self._require_user(user_id)
+        try:
+            data, content_type = await HistoryService.get_artifact(log_id, field, owner_id=user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        return Response(content=data, media_type=content_type)
 
-    async def delete_history(self, log_id: str):
+    async def delete_history(self, log_id: str, user_id: str):
+        self._require_user(user_id)
         try:
-            await HistoryService.delete_log(log_id)
-            return {"status": "success", "message": "Log and files deleted"}
+            await HistoryService.delete_log(log_id, owner_id=user_id)
+            return {"status": "success", "message": "Log deleted, files are being removed"}
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+
+    async def delete_history_bulk(self, log_ids: List[str], user_id: str):
+        self._require_user(user_id)
+        if not log_ids:
+            raise HTTPException(status_code=400, detail="log_ids is empty")
+        try:
+            result = await HistoryService.delete_logs(log_ids, owner_id=user_id)
+            return {"status": "success", **result}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,10 @@
 from fastapi import UploadFile, HTTPException
 from typing import List, Dict, Any
 from app.services.OnboardingService import OnboardingService
+from app.schemas.HrSchemas import BatchGenerateRequest, OnboardingDocument
 from app.tools.file_handler import FileHandler
+from app.tools.office_converter_pool import OfficeConverterPool
+from app.tools.media_payload import MediaPayload
 from app.llm.factory import get_llm
 import uuid
 
@@ -19,14 +22,14 @@ class OnboardingController:
             
             # Helper to upload
             async def process_file(file, key, folder):
-                bytes_ = await file.read()
+                media = await MediaPayload.from_upload(file)
                 path = f"{folder}/{uuid.uuid4()}_{file.filename}"
-                await FileHandler.upload_file(bytes_, path, file.content_type)
+                await FileHandler.upload_file(media.bytes, path, media.mime_type)
                 processed_files[key] = {
                     "name": file.filename,
-                    "bytes": bytes_,
+                    "media": media,
                     "path": path,
-                    "mime_type": file.content_type
+                    "mime_type": media.mime_type
                 }
 
             await process_file(file_ktp, "ktp", "onboarding/ktp")
@@ -37,18 +40,36 @@ class OnboardingController:
             
             # Analyze only
             result = await service.analyze(user_id, job_position_id, join_date, processed_files)
+            MediaPayload.log_request_savings("onboarding_analyze", [f["media"] for f in processed_files.values()])
             return {"status": "success", "data": result}
             
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def generate_doc(self, data: Dict[str, Any], user_id: str):
+    async def generate_doc(self, data: Dict[str, Any], user_id: str, pdf: bool = False):
+        if pdf and not OfficeConverterPool.is_enabled():
+            raise HTTPException(status_code=400, detail="PDF output is not enabled on this server")
         try:
             llm = get_llm()
             service = OnboardingService(llm=llm)
             
             # Generate doc only
-            url = await service.generate_document(user_id, data)
-            return {"status": "success", "document_url": url}
+            urls = await service.generate_document(user_id, data, pdf=pdf)
+            return {"status": "success", **urls}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def generate_batch(self, request: BatchGenerateRequest, user_id: str):
+        # Invalid items are reported individually; the rest of the batch still renders
+        items, errors = request.validate_items(OnboardingDocument)
+        if not items:
+            raise HTTPException(status_code=400, detail={"msg": "No valid items in the batch", "data": errors})
+        try:
+            llm = get_llm()
+            service = OnboardingService(llm=llm)
+            
+            # Render all documents, upload once (zip) or per document (urls)
+            result = await service.generate_documents_batch(user_id, items, request.output)
+            return {"status": "success", "data": {**result, "failed": len(errors), "errors": errors}}
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,21 @@
+import json
+import uuid
+import asyncio
 import logging
+from typing import Dict, Any, AsyncIterator
+from fastapi import UploadFile, HTTPException
+from fastapi.responses import StreamingResponse
 
-from config.supabase import supabase_client
+from config.setting import env
 from app.services.PapiService import PapiService
 from app.schemas.PapiSchemas import PapiScoringRequest, PapiScoringResponse
+from app.tools.file_handler import FileHandler
+from app.tools.activity_log_sink import ActivityLogSink
+from app.tools.artifact_store import ArtifactStore
+from app.tools.papi_image_renderer import PapiImageRenderer
+from app.tools.papi_scorer import PapiScorer
+from app.tools.papi_interpretation import PapiInterpretation
+from app.tools.papi_sheet import PapiSheet
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +31,12 @@ class PapiController:
         interpretations = self.service.get_interpretation(scores)
         
         # 3. Generate AI Summary (Strengths & Weaknesses)
-        strengths, weaknesses = await self.service.generate_summary(scores, interpretations)
+        strengths, weaknesses, summary_source = await self.service.generate_summary(scores, interpretations, request.mode)
         
         # 4. Generate Summary Image
-        image_base64 = self.service.generate_image(request.candidate_name, request.email, strengths, weaknesses)
+        image_base64 = await self.service.generate_image(
+            request.candidate_name, request.email, strengths, weaknesses, request.image_format
+        )
         
         # 5. Return Response
         response = PapiScoringResponse(
@@ -29,31 +44,140 @@ class PapiController:
             interpretations=interpretations,
             strengths=strengths,
             weaknesses=weaknesses,
-            summary_image=image_base64
+            summary_image=image_base64,
+            summary_image_format=request.image_format,
+            summary_source=summary_source
         )
 
-        # 6. Log Activity
+        # 6. Log Activity (the image goes to storage, the log keeps a reference)
         try:
-            log_data = {
-                "user_id": user_id,
-                "tool_type": "papi_scoring",
-                "input_files": [],
-                "output_files": [],
-                "result_json": {
+            result_json, artifact_paths = await ArtifactStore.offload(
+                {
                     "candidate_name": request.candidate_name,
                     "email": str(request.email),
                     "scores": response.scores,
                     "interpretations": response.interpretations,
                     "strengths": response.strengths,
                     "weaknesses": response.weaknesses,
-                    "summary_image": response.summary_image
+                    "summary_image": response.summary_image,
+                    "summary_source": response.summary_source
                 },
+                "papi",
+                base64_fields={"summary_image": PapiImageRenderer.mime_type(request.image_format)}
+            )
+            log_data = {
+                "user_id": user_id,
+                "tool_type": "papi_scoring",
+                "input_files": [],
+                "output_files": artifact_paths,
+                "result_json": result_json,
                 "cost_usd": 0,
                 "token_usage": {}
             }
-            supabase_client.table("activity_logs").insert(log_data).execute()
+            ActivityLogSink.log(log_data)
         except Exception as e:
             logger.error(f"PAPI logging failed: {str(e)}")
 
         return response
 
+    async def score_bulk(self, file: UploadFile, user_id: str, mode: str = "auto") -> StreamingResponse:
+        """
+        Scores a CSV/XLSX of candidates. Streams NDJSON lines: one "error" line per
+        invalid row, one "result" line per candidate as its summary completes, and a
+        final "summary" line with the uploaded results sheet.
+        """
+        file_bytes = await file.read()
+        try:
+            candidates, answers, errors = await asyncio.to_thread(PapiSheet.parse, file_bytes, file.filename)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid PAPI sheet: {str(e)}")
+        if len(candidates) + len(errors) > env.PAPI_BULK_MAX_ROWS:
+            raise HTTPException(status_code=400, detail=f"Sheet exceeds {env.PAPI_BULK_MAX_ROWS} rows")
+
+        # 1. Score and interpret every valid row in one vectorized pass
+        scores, interpretations = [], []
+        if candidates:
+            matrix = PapiScorer.score_matrix(answers)
+            scores = PapiScorer.to_dicts(matrix)
+            interpretations = PapiInterpretation.to_dicts(PapiInterpretation.lookup_matrix(matrix))
+
+        return StreamingResponse(
+            self._stream_bulk(candidates, scores, interpretations, errors, user_id, mode),
+            media_type="application/x-ndjson"
+        )
+
+    async def _stream_bulk(self, candidates, scores, interpretations, errors, user_id: str, mode: str) -> AsyncIterator[str]:
+        results = [dict(error) for error in errors]
+        for error in errors:
+            yield json.dumps({"type": "error", **error}) + "\n"
+
+        # 2. Summaries with bounded LLM concurrency, streamed as they complete
+        semaphore = asyncio.Semaphore(env.PAPI_BULK_LLM_CONCURRENCY)
+
+        async def summarize(candidate: Dict[str, Any], candidate_scores: Dict[str, int], candidate_interpretations: Dict[str, str]) -> Dict[str, Any]:
+            async with semaphore:
+                strengths, weaknesses, summary_source = await self.service.generate_summary(
+                    candidate_scores, candidate_interpretations, mode
+                )
+            return {
+                **candidate,
+                "scores": candidate_scores,
+                "interpretations": candidate_interpretations,
+                "strengths": strengths,
+                "weaknesses": weaknesses,
+                "summary_source": summary_source,
+            }
+
+        tasks = [asyncio.create_task(summarize(*row)) for row in zip(candidates, scores, interpretations)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                results.append(result)
+                yield json.dumps({"type": "result", **result}) + "\n"
+        finally:
+            # Client went away: don't keep spending LLM calls
+            for task in tasks:
+                task.cancel()
+
+        # 3. Results sheet (single upload) + activity log
+        results_url = None
+        storage_path = f"generated/papi/bulk/{uuid.uuid4()}.xlsx"
+        try:
+            sheet = await asyncio.to_thread(PapiSheet.write_results, results)
+            await FileHandler.upload_file(
+                sheet, storage_path, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+            results_url = FileHandler.get_public_url(storage_path)
+        except Exception as e:
+            logger.error(f"PAPI results sheet upload failed: {str(e)}")
+
+        try:
+            result_json, artifact_paths = await ArtifactStore.offload(
+                {
+                    "total": len(results),
+                    "scored": len(candidates),
+                    "failed": len(errors),
+                    "results": [{key: r.get(key) for key in ("row", "candidate_name", "email", "scores", "error")} for r in results],
+                },
+                "papi_bulk"
+            )
+            log_data = {
+                "user_id": user_id,
+                "tool_type": "papi_scoring_bulk",
+                "input_files": [],
+                "output_files": ([storage_path] if results_url else []) + artifact_paths,
+                "result_json": result_json,
+                "cost_usd": 0,
+                "token_usage": {}
+            }
+            ActivityLogSink.log(log_data)
+        except Exception as e:
+            logger.error(f"PAPI bulk logging failed: {str(e)}")
+
+        yield json.dumps({
+            "type": "summary",
+            "total": len(results),
+            "scored": len(candidates),
+            "failed": len(errors),
+            "results_url": results_url,
+        }) + "\n"
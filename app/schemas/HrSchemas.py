@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Dict, Any, Literal, Tuple, Type
 
 class CvAnalysisOutput(BaseModel):
     score: int = Field(description="Score of the candidate (0-100)")
@@ -50,3 +50,47 @@ class CriminalExtractionOutput(BaseModel):
 
 class InterviewAnalysisRequest(BaseModel):
     file_path: str = Field(..., description="Path to the file in Supabase Storage (hr-files bucket)")
+
+class CriminalLetterDocument(BaseModel):
+    candidate_name: str = Field(..., description="Candidate Name")
+    candidate_gender: str = Field(..., description="Candidate Gender")
+    birth_location: str = Field(..., description="Birth Place")
+    birth_date: str = Field(..., description="Birth Date (DD-MM-YYYY)")
+    candidate_age: str = Field(..., description="Age, e.g. '25 Tahun'")
+    job_position: str = Field(..., description="Job Position Title")
+    candidate_address: str = Field(..., description="Candidate Address")
+    date_now_2: str = Field(..., description="Letter Date, e.g. '13 December 2025'")
+
+class OnboardingDocument(BaseModel):
+    candidate_name: str = Field(..., description="Candidate Name")
+    candidate_nik: str = Field("", description="Candidate NIK")
+    candidate_address: str = Field("", description="Candidate Address")
+    job_department: str = Field("", description="Job Department")
+    job_position: str = Field("", description="Job Position Title")
+    join_date: str = Field("", description="Join Date")
+    email: str = Field("", description="Candidate Email")
+    phone: str = Field("", description="Candidate Phone")
+    email_and_phone_number_candidate: str = Field("", description="'email / phone' as shown on the form")
+
+BATCH_GENERATE_MAX_ITEMS = 200
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+class BatchGenerateRequest(BaseModel):
+    # Items stay untyped here so one bad payload is reported per item instead of rejecting the batch
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=BATCH_GENERATE_MAX_ITEMS, description="Reviewed payloads, same shape as the single generate endpoint")
+    output: Literal["zip", "urls"] = Field("zip", description="zip: one archive upload; urls: one document per item")
+
+    def validate_items(self, model: Type[BaseModel]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Validates every item against the tool's document schema. Returns (valid items
+        as dicts, errors), errors as {"index", "candidate_name", "error"}.
+        """
+        valid, errors = [], []
+        for index, item in enumerate(self.items):
+            try:
+                valid.append(model.model_validate(item).model_dump())
+            except ValidationError as e:
+                errors.append({"index": index, "candidate_name": item.get("candidate_name"), "error": validation_message(e)})
+        return valid, errors
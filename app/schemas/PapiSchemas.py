@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr, validator
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Literal
 
 class PapiScoringRequest(BaseModel):
     candidate_name: str = Field(..., description="Full name of the candidate")
@@ -10,6 +10,11 @@ class PapiScoringRequest(BaseModel):
         min_items=90, 
         max_items=90
     )
+    mode: Literal["auto", "llm", "fast"] = Field(
+        "auto",
+        description="Summary mode: llm (wait for the LLM), fast (rule-based, no LLM), auto (LLM within the latency budget, else rule-based)"
+    )
+    image_format: Literal["png", "webp", "jpeg"] = Field("png", description="Format of the summary image")
 
     @validator('answers')
     def validate_answers(cls, v):
@@ -23,6 +28,8 @@ class PapiScoringResponse(BaseModel):
     strengths: List[str] = Field(..., description="List of inferred strengths")
     weaknesses: List[str] = Field(..., description="List of inferred weaknesses")
     summary_image: str = Field(..., description="Base64 encoded image of the summary")
+    summary_image_format: str = Field("png", description="Format of summary_image: png, webp or jpeg")
+    summary_source: str = Field("llm", description="Where strengths/weaknesses came from: llm, cache or rule_based")
 
 class PapiSummaryOutput(BaseModel):
     strengths: List[str] = Field(..., description="Daftar kekuatan kandidat.")
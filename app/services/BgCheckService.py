@@ -1,24 +1,36 @@
-import os
+import re
 import uuid
+import asyncio
 import datetime
-import tempfile
-from docx import Document
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from config.setting import env
 from config.supabase import supabase_client
+from app.utils.AsyncUtils import aexecute
 from app.tools.file_handler import FileHandler
+from app.tools.activity_log_sink import ActivityLogSink
+from app.tools.docx_template_engine import DocxTemplateEngine
 from app.tools.validators.ktp_validator import KtpValidator
+from app.tools.ktp_cache import KtpCache
+from app.tools.nik_decoder import NikDecoder
 from app.tools.validators.academic_validator import AcademicValidator
 from app.tools.validators.criminal_validator import CriminalValidator
+from app.tools.extractors.bg_check_document_extractor import BgCheckDocumentExtractor
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Candidate name the criminal validator treats as "skip the name check"
+UNKNOWN_NAME = "Unknown"
+PLACEHOLDER_NAMES = {"unknown", "-", "n/a", "tidak diketahui", "tidak terbaca"}
+
 class BgCheckService:
-    def __init__(self, llm):
+    def __init__(self, llm, extraction_mode: Optional[str] = None):
         self.llm = llm
+        self.extraction_mode = extraction_mode or env.BG_CHECK_EXTRACTION_MODE
         self.ktp_validator = KtpValidator(llm)
         self.academic_validator = AcademicValidator(llm)
         self.criminal_validator = CriminalValidator(llm)
+        self.document_extractor = BgCheckDocumentExtractor(llm)
 
     async def analyze(self, user_id: str, manual_data: Dict[str, Any], files: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -26,53 +38,16 @@ class BgCheckService:
         Does NOT generate the document.
         """
         try:
-            # 0. Fetch Job Position Title
-            job_position_title = "Unknown"
-            if "job_position_id" in manual_data:
-                try:
-                    job_res = supabase_client.table("job_positions").select("title").eq("id", manual_data["job_position_id"]).single().execute()
-                    if job_res.data:
-                        job_position_title = job_res.data["title"]
-                except Exception as e:
-                    logger.error(f"Error fetching job position: {str(e)}")
-
-            # Fetch HR Name from Profiles
-            hr_name = "Unknown HR"
-            try:
-                profile_res = supabase_client.table("profiles").select("full_name").eq("id", user_id).single().execute()
-                if profile_res.data:
-                    hr_name = profile_res.data.get("full_name", hr_name)
-            except Exception as e:
-                logger.error(f"Error fetching profile: {str(e)}")
-            
-            # 1. KTP Validation
-            ktp_result = {"is_valid": False, "reasoning": "No KTP file"}
-            if "ktp" in files:
-                try:
-                    ktp_result = await self.ktp_validator(files["ktp"]["bytes"], files["ktp"]["mime_type"])
-                except Exception as e:
-                    logger.error(f"KTP Validator failed: {str(e)}")
-                    ktp_result = {"is_valid": False, "reasoning": f"Validator Error: {str(e)}"}
-            
-            # 2. Academic Validation
-            academic_result = {"is_valid": False, "reasoning": "No Academic file"}
-            if "academic" in files:
-                try:
-                    academic_result = await self.academic_validator(files["academic"]["bytes"], files["academic"]["mime_type"])
-                except Exception as e:
-                    logger.error(f"Academic Validator failed: {str(e)}")
-                    academic_result = {"is_valid": False, "reasoning": f"Validator Error: {str(e)}"}
-                
-            # 3. Criminal Validation
-            criminal_result = {"is_valid": False, "reasoning": "No Criminal file"}
+            # 0-3. Lookups and validators run concurrently. The criminal check cannot
+            # wait for the KTP name, so its validator skips the name check ("Unknown")
+            # and the SKCK name is compared with the KTP-extracted name afterwards.
+            job_position_title, hr_name, (ktp_result, academic_result, criminal_result) = await asyncio.gather(
+                self._fetch_job_title(manual_data.get("job_position_id")),
+                self._fetch_hr_name(user_id),
+                self.extract_documents(files, UNKNOWN_NAME),
+            )
             if "criminal" in files:
-                try:
-                    # We need name from KTP or manual input to cross-reference
-                    candidate_name = ktp_result.get("full_name") or manual_data.get("full_name") or "Unknown"
-                    criminal_result = await self.criminal_validator(files["criminal"]["bytes"], candidate_name, files["criminal"]["mime_type"])
-                except Exception as e:
-                    logger.error(f"Criminal Validator failed: {str(e)}")
-                    criminal_result = {"is_valid": False, "reasoning": f"Validator Error: {str(e)}"}
+                criminal_result = self._reconcile_criminal_name(criminal_result, self._real_name(ktp_result.get("full_name")))
             
             # 4. Aggregate Results
             now = datetime.datetime.now()
@@ -98,7 +73,7 @@ class BgCheckService:
                     "cost_usd": 0.005, # Estimate
                     "token_usage": {"prompt": 300, "completion": 150} # Estimate
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
 
@@ -108,49 +83,151 @@ class BgCheckService:
             logger.error(f"BgCheckService Analysis Fatal Error: {str(e)}", exc_info=True)
             raise e
 
-    async def generate_document(self, user_id: str, data: Dict[str, Any]) -> str:
+    async def extract_documents(self, files: Dict[str, Any], provisional_name: str) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Returns (ktp, academic, criminal) results, either from three concurrent
+        validator calls or from one combined call (see BG_CHECK_EXTRACTION_MODE).
+        """
+        if self.extraction_mode == "combined" and all(key in files for key in ("ktp", "academic", "criminal")):
+            try:
+                sections = await self.document_extractor(
+                    files["ktp"]["media"], files["academic"]["media"], files["criminal"]["media"]
+                )
+                academic_result = await self.academic_validator.verify(sections["academic"])
+                ktp_result = NikDecoder.reconcile(sections["ktp"])
+                KtpCache.get_instance().put(files["ktp"]["media"].sha256, ktp_result)
+                return ktp_result, academic_result, sections["criminal"]
+            except Exception as e:
+                logger.error(f"Combined extraction failed, falling back to concurrent validators: {str(e)}")
+
+        ktp_result, academic_result, criminal_result = await asyncio.gather(
+            self._validate_ktp(files),
+            self._validate_academic(files),
+            self._validate_criminal(files, provisional_name),
+        )
+        return ktp_result, academic_result, criminal_result
+
+    async def _fetch_job_title(self, job_position_id) -> str:
+        if job_position_id is None:
+            return "Unknown"
+        try:
+            job_res = await aexecute(
+                supabase_client.table("job_positions").select("title").eq("id", job_position_id).single()
+            )
+            if job_res.data:
+                return job_res.data["title"]
+        except Exception as e:
+            logger.error(f"Error fetching job position: {str(e)}")
+        return "Unknown"
+
+    async def _fetch_hr_name(self, user_id: str) -> str:
+        hr_name = "Unknown HR"
+        try:
+            profile_res = await aexecute(
+                supabase_client.table("profiles").select("full_name").eq("id", user_id).single()
+            )
+            if profile_res.data:
+                hr_name = profile_res.data.get("full_name", hr_name)
+        except Exception as e:
+            logger.error(f"Error fetching profile: {str(e)}")
+        return hr_name
+
+    async def _validate_ktp(self, files: Dict[str, Any]) -> Dict[str, Any]:
+        if "ktp" not in files:
+            return {"is_valid": False, "reasoning": "No KTP file"}
+        try:
+            return await self.ktp_validator(files["ktp"]["media"])
+        except Exception as e:
+            logger.error(f"KTP Validator failed: {str(e)}")
+            return {"is_valid": False, "reasoning": f"Validator Error: {str(e)}"}
+
+    async def _validate_academic(self, files: Dict[str, Any]) -> Dict[str, Any]:
+        if "academic" not in files:
+            return {"is_valid": False, "reasoning": "No Academic file"}
+        try:
+            return await self.academic_validator(files["academic"]["media"])
+        except Exception as e:
+            logger.error(f"Academic Validator failed: {str(e)}")
+            return {"is_valid": False, "reasoning": f"Validator Error: {str(e)}"}
+
+    async def _validate_criminal(self, files: Dict[str, Any], candidate_name: str) -> Dict[str, Any]:
+        if "criminal" not in files:
+            return {"is_valid": False, "reasoning": "No Criminal file"}
+        try:
+            return await self.criminal_validator(files["criminal"]["media"], candidate_name)
+        except Exception as e:
+            logger.error(f"Criminal Validator failed: {str(e)}")
+            return {"is_valid": False, "reasoning": f"Validator Error: {str(e)}"}
+
+    def _reconcile_criminal_name(self, criminal_result: Dict[str, Any], ktp_name: Optional[str]) -> Dict[str, Any]:
+        """
+        Cheap re-check of the SKCK name against the KTP-extracted name once both are
+        known, instead of a second LLM call with the final name. Without a usable KTP
+        name nothing is compared and name_check marks the name as unverified.
+        """
+        skck_name = criminal_result.get("full_name")
+        if not skck_name:
+            return criminal_result
+        if not ktp_name:
+            return {**criminal_result, "name_check": {"ktp_name": None, "skck_name": skck_name, "matches": None}}
+        matches = self._names_match(skck_name, ktp_name)
+        result = {**criminal_result, "name_check": {"ktp_name": ktp_name, "skck_name": skck_name, "matches": matches}}
+        if not matches:
+            result["is_valid"] = False
+            result["reasoning"] = f"{criminal_result.get('reasoning', '')} Nama pada SKCK ({skck_name}) tidak sesuai dengan KTP ({ktp_name}).".strip()
+        return result
+
+    @staticmethod
+    def _real_name(name: Optional[str]) -> Optional[str]:
+        # Validators fill unreadable names with placeholders; those are not names
+        if not name or name.strip().lower() in PLACEHOLDER_NAMES:
+            return None
+        return name.strip()
+
+    @staticmethod
+    def _names_match(name_a: str, name_b: str) -> bool:
+        tokens_a = set(re.sub(r"[^a-z\s]", " ", name_a.lower()).split())
+        tokens_b = set(re.sub(r"[^a-z\s]", " ", name_b.lower()).split())
+        if not tokens_a or not tokens_b:
+            return False
+        # Tolerate an omitted middle name on one of the documents
+        return tokens_a <= tokens_b or tokens_b <= tokens_a
+
+    async def generate_document(self, user_id: str, data: Dict[str, Any], pdf: bool = False) -> Dict[str, Any]:
         """
         Generates the DOCX file from the reviewed data.
         """
         try:
             # Generate Document (Filling Template)
-            docx_path = self._fill_template(data)
+            docx_bytes = await asyncio.to_thread(self._fill_template, data)
             
             # Upload Docx
-            with open(docx_path, "rb") as f:
-                docx_bytes = f.read()
             storage_path = f"generated/bg_check/{uuid.uuid4()}.docx"
-            await FileHandler.upload_file(docx_bytes, storage_path, "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-            os.remove(docx_path)
+            upload = await FileHandler.upload_document(docx_bytes, storage_path, "application/vnd.openxmlformats-officedocument.wordprocessingml.document", pdf=pdf)
 
             # Log Generation Activity
             try:
                 log_data = {
                     "user_id": user_id,
                     "tool_type": "bg_check_generate",
-                    "output_files": [storage_path],
+                    "output_files": upload["paths"],
                     "result_json": {"document_generated": True},
                     "cost_usd": 0, 
                     "token_usage": {} 
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
             
-            return FileHandler.get_public_url(storage_path)
+            return {key: value for key, value in upload.items() if key != "paths"}
 
         except Exception as e:
             logger.error(f"BgCheckService Doc Gen Fatal Error: {str(e)}", exc_info=True)
             raise e
 
-    def _fill_template(self, data: Dict[str, Any]) -> str:
+    def _fill_template(self, data: Dict[str, Any]) -> bytes:
         # Load Template
         template_path = "assets/template/Template_Formulir Pelaksanaan Background Screening.docx"
-        if not os.path.exists(template_path):
-             doc = Document()
-             doc.add_paragraph("Template not found, generated blank.")
-        else:
-             doc = Document(template_path)
         
         manual = data["manual"]
         ktp = data["ktp"]
@@ -170,28 +247,6 @@ class BgCheckService:
             "{criminal_check}": "v" if data["criminal"].get("is_valid") else "",
         }
         
-        # Replace in Paragraphs
-        for paragraph in doc.paragraphs:
-            self._replace_text_in_paragraph(paragraph, replacements)
-            
-        # Replace in Tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_text_in_paragraph(paragraph, replacements)
-                
-        # Save - using cross-platform temp directory
-        temp_dir = tempfile.gettempdir()
-        filename = os.path.join(temp_dir, f"{uuid.uuid4()}.docx")
-        doc.save(filename)
-        return filename
-
-    def _replace_text_in_paragraph(self, paragraph, replacements):
-        if not paragraph.text:
-            return
-        
-        # Iterate over all replacements
-        for key, value in replacements.items():
-            if key in paragraph.text:
-                paragraph.text = paragraph.text.replace(key, value)
+        # Patch only the indexed placeholder runs of the compiled template (formatting kept)
+        docx_bytes = DocxTemplateEngine.render(template_path, replacements, missing_text="Template not found, generated blank.")
+        return docx_bytes
@@ -1,17 +1,23 @@
-import os
 import uuid
+import asyncio
 import datetime
-import tempfile
-from docx import Document
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from config.supabase import supabase_client
+from app.utils.AsyncUtils import aexecute
 from app.tools.file_handler import FileHandler
+from app.tools.activity_log_sink import ActivityLogSink
+from app.tools.docx_template_engine import DocxTemplateEngine
 from app.tools.validators.ktp_validator import KtpValidator
+from app.tools.nik_decoder import NikDecoder
 import logging
 
 logger = logging.getLogger(__name__)
 
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
 class CriminalLetterService:
+    TEMPLATE_PATH = "assets/template/Template_Surat Keterangan Bebas Tindakan Kriminal.docx"
+
     def __init__(self, llm):
         self.llm = llm
         self.ktp_validator = KtpValidator(llm)
@@ -29,7 +35,7 @@ class CriminalLetterService:
             # 1. Fetch Job Position Title
             job_position_title = "Unknown"
             try:
-                job_res = supabase_client.table("job_positions").select("title").eq("id", job_position_id).single().execute()
+                job_res = await aexecute(supabase_client.table("job_positions").select("title").eq("id", job_position_id).single())
                 if job_res.data:
                     job_position_title = job_res.data["title"]
             except Exception as e:
@@ -39,22 +45,17 @@ class CriminalLetterService:
             ktp_data = {}
             if "ktp" in files:
                 try:
-                    ktp_data = await self.ktp_validator(files["ktp"]["bytes"], files["ktp"]["mime_type"])
+                    ktp_data = await self.ktp_validator(files["ktp"]["media"])
                 except Exception as e:
                     logger.error(f"KTP Extraction failed: {str(e)}")
             
-            # 3. Calculate Age (Simple approximation)
+            # 3. Calculate Age
+            birth_date, birth_date_raw, warnings = self._resolve_birth_date(ktp_data)
             age = ""
-            if "birth_date" in ktp_data:
-                try:
-                    # Expected format DD-MM-YYYY
-                    birth_date_str = ktp_data["birth_date"]
-                    birth_date = datetime.datetime.strptime(birth_date_str, "%d-%m-%Y")
-                    today = datetime.datetime.now()
-                    age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-                    age = f"{age} Tahun"
-                except Exception as e:
-                    logger.warning(f"Could not calculate age: {str(e)}")
+            if birth_date:
+                age = f"{NikDecoder.age(birth_date)} Tahun"
+            elif ktp_data:
+                logger.warning(f"Could not calculate age from birth date: {birth_date_raw}")
 
             # 4. Prepare Final Data
             now = datetime.datetime.now()
@@ -62,11 +63,12 @@ class CriminalLetterService:
                 "candidate_name": ktp_data.get("full_name", ""),
                 "candidate_gender": ktp_data.get("gender", ""),
                 "birth_location": ktp_data.get("birth_place", ""),
-                "birth_date": ktp_data.get("birth_date", ""),
+                "birth_date": birth_date_raw,
                 "candidate_age": str(age),
                 "job_position": job_position_title,
                 "candidate_address": ktp_data.get("address", ""),
-                "date_now_2": now.strftime("%d %B %Y")
+                "date_now_2": now.strftime("%d %B %Y"),
+                "warnings": warnings
             }
 
             # 5. Log Analysis
@@ -80,7 +82,7 @@ class CriminalLetterService:
                     "cost_usd": 0.002, 
                     "token_usage": {"prompt": 150, "completion": 80} 
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
 
@@ -90,50 +92,103 @@ class CriminalLetterService:
             logger.error(f"CriminalLetterService Analysis Fatal Error: {str(e)}", exc_info=True)
             raise e
 
-    async def generate_document(self, user_id: str, data: Dict[str, Any]) -> str:
+    async def generate_document(self, user_id: str, data: Dict[str, Any], pdf: bool = False) -> Dict[str, Any]:
         """
         Generates the 'Surat Keterangan Bebas Tindakan Kriminal' DOCX.
         """
         try:
             # Generate Document
-            docx_path = self._fill_template(data)
+            docx_bytes = await asyncio.to_thread(self._fill_template, data)
             
             # Upload
-            with open(docx_path, "rb") as f:
-                docx_bytes = f.read()
             storage_path = f"generated/criminal_letter/{uuid.uuid4()}.docx"
-            await FileHandler.upload_file(docx_bytes, storage_path, "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-            os.remove(docx_path)
+            upload = await FileHandler.upload_document(docx_bytes, storage_path, DOCX_CONTENT_TYPE, pdf=pdf)
             
             # Log Generation
             try:
                 log_data = {
                     "user_id": user_id,
                     "tool_type": "criminal_letter_generate",
-                    "output_files": [storage_path],
+                    "output_files": upload["paths"],
                     "result_json": {"document_generated": True},
                     "cost_usd": 0,
                     "token_usage": {}
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
 
-            return FileHandler.get_public_url(storage_path)
+            return {key: value for key, value in upload.items() if key != "paths"}
 
         except Exception as e:
             logger.error(f"CriminalLetterService Doc Gen Fatal Error: {str(e)}", exc_info=True)
             raise e
 
-    def _fill_template(self, data: Dict[str, Any]) -> str:
-        template_path = "assets/template/Template_Surat Keterangan Bebas Tindakan Kriminal.docx"
-        if not os.path.exists(template_path):
-             doc = Document()
-             doc.add_paragraph("Template not found.")
-        else:
-             doc = Document(template_path)
-        
-        replacements = {
+    async def generate_documents_batch(self, user_id: str, items: List[Dict[str, Any]], output: str = "zip") -> Dict[str, Any]:
+        """
+        Generates criminal letters for a whole cohort of reviewed payloads.
+        Renders in the process pool; output "zip" uploads one archive, "urls" one DOCX per item.
+        """
+        try:
+            documents = await DocxTemplateEngine.render_many(
+                self.TEMPLATE_PATH, [self._build_replacements(item) for item in items]
+            )
+            names = [DocxTemplateEngine.archive_name(i, item.get("candidate_name")) for i, item in enumerate(items)]
+            storage_paths = await FileHandler.upload_batch(
+                list(zip(names, documents)), "generated/criminal_letter", DOCX_CONTENT_TYPE, as_zip=output == "zip"
+            )
+            urls = [FileHandler.get_public_url(path) for path in storage_paths]
+            result = {"count": len(documents), "output": output}
+            if output == "zip":
+                result["document_url"] = urls[0]
+            else:
+                result["document_urls"] = urls
+
+            # Log Generation (one entry per batch)
+            try:
+                log_data = {
+                    "user_id": user_id,
+                    "tool_type": "criminal_letter_generate",
+                    "output_files": storage_paths,
+                    "result_json": {"document_generated": True, "batch_size": len(items), "output": output},
+                    "cost_usd": 0,
+                    "token_usage": {}
+                }
+                ActivityLogSink.log(log_data)
+            except Exception as e:
+                logger.error(f"Logging failed: {str(e)}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"CriminalLetterService Batch Doc Gen Fatal Error: {str(e)}", exc_info=True)
+            raise e
+
+    @staticmethod
+    def _resolve_birth_date(ktp_data: Dict[str, Any]) -> Tuple[Optional[datetime.date], str, List[str]]:
+        """
+        Returns (birth date, its DD-MM-YYYY text, warnings). The NIK-decoded date is
+        used only when the NIK is valid and agrees with the date read from the card
+        (or none was read); otherwise the card's date stands and a mismatch is flagged.
+        """
+        nik_check = ktp_data.get("nik_check") or {}
+        extracted_raw = nik_check.get("extracted_birth_date", ktp_data.get("birth_date")) or ""
+        extracted = NikDecoder.parse_date(extracted_raw)
+        nik_date = NikDecoder.parse_date(nik_check.get("birth_date") or "")
+
+        if nik_check.get("valid") and nik_date and (extracted is None or extracted == nik_date):
+            return nik_date, nik_check["birth_date"], []
+        warnings = []
+        if nik_date and extracted and nik_date != extracted:
+            warnings.append(f"Tanggal lahir pada KTP ({extracted_raw}) tidak sesuai dengan NIK ({nik_check['birth_date']}); tanggal pada KTP digunakan.")
+        elif nik_check and not nik_check.get("valid") and not extracted:
+            warnings.append("NIK tidak valid dan tanggal lahir tidak terbaca; umur tidak dapat dihitung.")
+        if warnings:
+            logger.warning(f"Birth date check: {warnings}")
+        return extracted, extracted_raw, warnings
+
+    def _build_replacements(self, data: Dict[str, Any]) -> Dict[str, str]:
+        return {
             "{candidate_name}": data["candidate_name"],
             "{candidate_gender}": data["candidate_gender"],
             "{birth_location}": data["birth_location"],
@@ -143,28 +198,7 @@ class CriminalLetterService:
             "{candidate_address}": data["candidate_address"],
             "{date_now_2}": data["date_now_2"]
         }
-        
-        # Replace in Paragraphs
-        for paragraph in doc.paragraphs:
-            self._replace_text_in_paragraph(paragraph, replacements)
-            
-        # Replace in Tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_text_in_paragraph(paragraph, replacements)
-                        
-        # Save - using cross-platform temp directory
-        temp_dir = tempfile.gettempdir()
-        filename = os.path.join(temp_dir, f"{uuid.uuid4()}.docx")
-        doc.save(filename)
-        return filename
-
-    def _replace_text_in_paragraph(self, paragraph, replacements):
-        if not paragraph.text:
-            return
-        for key, value in replacements.items():
-            if key in paragraph.text:
-                paragraph.text = paragraph.text.replace(key, value)
 
+    def _fill_template(self, data: Dict[str, Any]) -> bytes:
+        # Patch only the indexed placeholder runs of the compiled template (formatting kept)
+        return DocxTemplateEngine.render(self.TEMPLATE_PATH, self._build_replacements(data), missing_text="Template not found.")
@@ -1,12 +1,18 @@
 import json
-import base64
+import hashlib
 from config.supabase import supabase_client
+from app.utils.AsyncUtils import aexecute
 # Removed PdfExtractor
+from app.tools.activity_log_sink import ActivityLogSink
 from app.tools.cost_calculator import CostCalculator
+from app.tools.media_payload import MediaPayload
 from app.schemas.HrSchemas import CvAnalysisOutput
 from core.BaseAgent import BaseAgent
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage
+import logging
+
+logger = logging.getLogger(__name__)
 
 prompt_template = """
 # Role and Goal
@@ -50,45 +56,27 @@ class CvAnalyzerService(BaseAgent):
             **kwargs
         )
     
-    async def __call__(self, user_id: str, job_id: int, file_path: str, file_bytes: bytes) -> Dict[str, Any]:
+    async def __call__(self, user_id: str, job_id: int, file_path: str, media: MediaPayload) -> Dict[str, Any]:
         # 1. Fetch Job Criteria
-        job_res = supabase_client.table("job_positions").select("criteria_text, title").eq("id", job_id).single().execute()
+        job_res = await aexecute(supabase_client.table("job_positions").select("criteria_text, title").eq("id", job_id).single())
         if not job_res.data:
             raise ValueError("Job position not found")
         job_criteria = job_res.data["criteria_text"]
         job_title = job_res.data["title"]
 
-        # 2. Prepare Multimodal Input (Base64)
-        # Convert bytes to base64 string
-        base64_pdf = base64.b64encode(file_bytes).decode('utf-8')
+        # Reuse this user's prior analysis of the same file content against unchanged criteria
+        # (hash of the upload as received, the prepared payload below has another one)
+        content_sha256 = media.sha256
+        criteria_hash = hashlib.sha256(f"{job_title}\n{job_criteria}".encode("utf-8")).hexdigest()
+        prior_result = await self._find_prior_analysis(user_id, content_sha256, criteria_hash)
+        if prior_result is not None:
+            self._log_analysis(user_id, file_path, prior_result, content_sha256, criteria_hash, reused=True)
+            return {**prior_result, "reused": True}
 
-        # Construct Multimodal Message
-        # This matches the structure LangChain expects for "blob" or "file" content
-        # Note: For LangChain Google GenAI specifically, we often use `image_url` structure or raw content blocks.
-        # But per the generic Multimodal docs, we can try the dictionary format.
-        
-        multimodal_input = [
-            {
-                "type": "text", 
-                "text": "Please analyze this CV document based on the job criteria provided in the system prompt."
-            },
-            {
-                "type": "media", # or "image_url" for some providers, but "media" / "blob" for generic files if supported
-                # For Gemini specifically, standard usage often involves passing the blob with mime_type
-                "file_uri": None,
-                "mime_type": "application/pdf",
-                "data": base64_pdf
-            }
-        ]
-        
-        # Alternatively, using the format you referenced (LangChain generic message content):
-        message_content = [
-            {"type": "text", "text": "Analyze this CV document."},
-            {
-                "type": "image_url", # LangChain often maps "image_url" to generic media inputs for Gemini
-                "image_url": {"url": f"data:application/pdf;base64,{base64_pdf}"} 
-            }
-        ]
+        # 2. Prepare Multimodal Input
+        # Shrink the PDF (page cap, image downsampling) once; the payload encodes base64 lazily
+        media = await media.prepared("cv")
+        message_content = self.build_media_message("Analyze this CV document.", media)
         
         # 3. Rebind Variables (Job context is still in system/prompt template)
         self.rebind_prompt_variable(
@@ -104,18 +92,42 @@ class CvAnalyzerService(BaseAgent):
         print(raw_output)
         
         # 5. Calculate Cost & Log (Simplified)
-        # ... (Log logic remains similar) ...
+        result = parsed_output.model_dump()
+        self._log_analysis(user_id, file_path, result, content_sha256, criteria_hash, reused=False)
         
-        # ... existing logging code ...
+        return {**result, "reused": False}
+
+    async def _find_prior_analysis(self, user_id: str, content_sha256: str, criteria_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the user's latest analysis of a CV with the same content for the
+        same criteria. Analyses are never shared across users.
+        """
+        try:
+            res = await aexecute(supabase_client.table("activity_logs").select("result_json") \
+                .eq("tool_type", "cv_analyzer") \
+                .eq("user_id", user_id) \
+                .eq("result_json->>content_sha256", content_sha256) \
+                .eq("result_json->>criteria_hash", criteria_hash) \
+                .order("created_at", desc=True).limit(1))
+        except Exception as e:
+            logger.error(f"Prior analysis lookup failed: {str(e)}")
+            return None
+        if not res.data:
+            return None
+        prior = dict(res.data[0]["result_json"])
+        prior.pop("content_sha256", None)
+        prior.pop("criteria_hash", None)
+        prior.pop("reused", None)
+        return prior
+
+    def _log_analysis(self, user_id: str, file_path: str, result: Dict[str, Any], content_sha256: str, criteria_hash: str, reused: bool):
         log_data = {
             "user_id": user_id,
             "tool_type": "cv_analyzer",
             "input_files": [file_path],
             "output_files": [],
-            "result_json": parsed_output.model_dump(),
+            "result_json": {**result, "content_sha256": content_sha256, "criteria_hash": criteria_hash, "reused": reused},
             "cost_usd": 0, # Difficult to calc tokens for PDF binary without API response metadata
             "token_usage": {}
         }
-        supabase_client.table("activity_logs").insert(log_data).execute()
-        
-        return parsed_output.model_dump()
+        ActivityLogSink.log(log_data)
@@ -1,33 +1,152 @@
+import json
+import base64
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple, List, Set
 from config.supabase import supabase_client
-from app.tools.file_handler import FileHandler
+from app.utils.AsyncUtils import aexecute
+from app.tools.artifact_store import ArtifactStore
+from app.tools.storage_cleanup import StorageCleanup
+
+# List view: everything except the heavy result_json
+LIST_COLUMNS = "id, user_id, tool_type, input_files, output_files, cost_usd, token_usage, created_at, profiles(full_name, email)"
 
 class HistoryService:
     
     @staticmethod
-    async def get_logs(limit: int = 50, offset: int = 0):
-        # Supabase join syntax: select("*, profiles(*)")
-        res = supabase_client.table("activity_logs").select("*, profiles(full_name, email)").order("created_at", desc=True).range(offset, offset + limit - 1).execute()
-        return res.data
+    async def get_logs(
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        tool_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        One page of logs, newest first, without result_json (see get_log for the full row).
+        Keyset pagination on (created_at, id): pass the returned `next_cursor` back as
+        `cursor`; `offset` is only kept for older clients.
+        """
+        query = supabase_client.table("activity_logs").select(LIST_COLUMNS)
+        if tool_type:
+            query = query.eq("tool_type", tool_type)
+        if user_id:
+            query = query.eq("user_id", user_id)
+        if date_from:
+            query = query.gte("created_at", date_from.isoformat())
+        if date_to:
+            query = query.lt("created_at", date_to.isoformat())
+        if cursor:
+            created_at, log_id = HistoryService._decode_cursor(cursor)
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{log_id}")')
+
+        query = query.order("created_at", desc=True).order("id", desc=True)
+        # One extra row tells whether there is a next page
+        if cursor or not offset:
+            res = await aexecute(query.limit(limit + 1))
+        else:
+            res = await aexecute(query.range(offset, offset + limit))
+
+        rows = res.data or []
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = HistoryService._encode_cursor(rows[-1])
+        return {"data": rows, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _owned(query, owner_id: Optional[str]):
+        # Rows of other users are indistinguishable from missing ones
+        return query.eq("user_id", owner_id) if owner_id else query
+
+    @staticmethod
+    async def get_log(log_id: str, owner_id: Optional[str] = None) -> Dict[str, Any]:
+        query = supabase_client.table("activity_logs").select("*, profiles(full_name, email)").eq("id", log_id)
+        res = await aexecute(HistoryService._owned(query, owner_id).limit(1))
+        if not res.data:
+            raise ValueError("Log not found")
+        return HistoryService._link_artifacts(res.data[0])
+
+    @staticmethod
+    def _encode_cursor(log: Dict[str, Any]) -> str:
+        payload = json.dumps([log["created_at"], log["id"]], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str]:
+        try:
+            created_at, log_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return str(created_at), str(log_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _link_artifacts(log: dict) -> dict:
+        # Offloaded fields stay lightweight references; point each at its download endpoint
+        for field, reference in ArtifactStore.references(log.get("result_json")).items():
+            reference["download_path"] = f"/api/v1/history/{log.get('id')}/artifacts/{field}"
+        return log
 
     @staticmethod
-    async def delete_log(log_id: str):
-        # 1. Fetch log to get file paths
-        res = supabase_client.table("activity_logs").select("input_files, output_files").eq("id", log_id).single().execute()
+    async def get_artifact(log_id: str, field: str, owner_id: Optional[str] = None):
+        """Returns (bytes, content type) of an offloaded result_json field."""
+        query = supabase_client.table("activity_logs").select("result_json").eq("id", log_id)
+        res = await aexecute(HistoryService._owned(query, owner_id).limit(1))
         if not res.data:
             raise ValueError("Log not found")
-            
-        input_files = res.data.get("input_files") or []
-        output_files = res.data.get("output_files") or []
-        
-        # 2. Delete files
-        all_files = input_files + output_files
-        for path in all_files:
-            if path:
-                try:
-                    await FileHandler.delete_file(path)
-                except Exception:
-                    pass # Ignore if file missing
-                    
-        # 3. Delete Record
-        supabase_client.table("activity_logs").delete().eq("id", log_id).execute()
+        reference = (res.data[0].get("result_json") or {}).get(field)
+        if not ArtifactStore.is_reference(reference):
+            raise ValueError(f"No artifact '{field}' in this log")
+        return await ArtifactStore.load(reference)
+
+    @staticmethod
+    async def delete_log(log_id: str, owner_id: Optional[str] = None):
+        result = await HistoryService.delete_logs([log_id], owner_id=owner_id)
+        if not result["deleted"]:
+            raise ValueError("Log not found")
 
+    @staticmethod
+    async def delete_logs(log_ids: List[str], owner_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Deletes the rows right away; their storage files are removed in the
+        background (StorageCleanup: one batch call per log, retried, orphan ledger).
+        With `owner_id`, only that user's logs are deleted; the others are not_found.
+        """
+        log_ids = list(dict.fromkeys(log_ids))
+        # 1. Fetch logs to get file paths
+        query = supabase_client.table("activity_logs").select("id, input_files, output_files").in_("id", log_ids)
+        res = await aexecute(HistoryService._owned(query, owner_id))
+        logs = res.data or []
+        found = [log["id"] for log in logs]
+        if not logs:
+            return {"deleted": [], "not_found": log_ids}
+
+        # 2. CVs uploaded under content-addressed paths (cvs/<sha256>.pdf, before per-request
+        # paths) may still be shared by several logs; new uploads are never shared
+        paths_by_log = {
+            log["id"]: [path for path in (log.get("input_files") or []) + (log.get("output_files") or []) if path]
+            for log in logs
+        }
+        shared = await HistoryService._referenced_elsewhere(
+            {path for log in logs for path in log.get("input_files") or [] if path}, found
+        )
+        paths_by_log = {log_id: [path for path in paths if path not in shared] for log_id, paths in paths_by_log.items()}
+
+        # 3. Delete Records, then clean storage without holding the response
+        await aexecute(supabase_client.table("activity_logs").delete().in_("id", found))
+        StorageCleanup.schedule(paths_by_log)
+
+        return {"deleted": found, "not_found": [log_id for log_id in log_ids if log_id not in found]}
+
+    @staticmethod
+    async def _referenced_elsewhere(paths: Set[str], log_ids: List[str]) -> Set[str]:
+        # One query for all paths: logs outside this batch whose input_files overlap them
+        if not paths:
+            return set()
+        res = await aexecute(
+            supabase_client.table("activity_logs").select("input_files")
+            .overlaps("input_files", sorted(paths))
+            .not_.in_("id", log_ids)
+        )
+        referenced = {path for log in res.data or [] for path in log.get("input_files") or []}
+        return paths & referenced
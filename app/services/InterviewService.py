@@ -5,7 +5,10 @@ import math
 import tempfile
 from typing import Dict, Any, List
 from config.supabase import supabase_client
+from app.utils.AsyncUtils import run_blocking
 from app.tools.file_handler import FileHandler
+from app.tools.activity_log_sink import ActivityLogSink
+from app.tools.artifact_store import ArtifactStore
 from app.tools.media_converter import MediaConverter
 from app.tools.cost_calculator import CostCalculator
 from app.schemas.HrSchemas import InterviewAnalysisOutput
@@ -76,7 +79,7 @@ class InterviewService(BaseAgent):
                 # Use FileHandler or direct Supabase client. 
                 # Since FileHandler is static, let's use supabase client directly for stream download 
                 # or just use the storage.download method which returns bytes.
-                data = supabase_client.storage.from_("hr-files").download(file_path)
+                data = await run_blocking(supabase_client.storage.from_("hr-files").download, file_path)
                 with open(local_original_path, "wb") as f:
                     f.write(data)
             except Exception as e:
@@ -94,7 +97,7 @@ class InterviewService(BaseAgent):
             
             # 4. DELETE ORIGINAL from Supabase to save space
             logger.info(f"Deleting original file from Supabase: {file_path}")
-            supabase_client.storage.from_("hr-files").remove([file_path])
+            await run_blocking(supabase_client.storage.from_("hr-files").remove, [file_path])
             
             # 5. Upload Processed Audio to Supabase
             # Create a new path for the processed audio
@@ -102,7 +105,8 @@ class InterviewService(BaseAgent):
             logger.info(f"Uploading processed audio to Supabase: {processed_filename}")
             
             with open(local_audio_path, "rb") as f:
-                supabase_client.storage.from_("hr-files").upload(
+                await run_blocking(
+                    supabase_client.storage.from_("hr-files").upload,
                     path=processed_filename,
                     file=f,
                     file_options={"content-type": "audio/flac"}
@@ -129,15 +133,18 @@ class InterviewService(BaseAgent):
 
             # 8. Log Activity
             try:
+                # Long analysis text goes to storage, the log keeps a reference
+                result_json, artifact_paths = await ArtifactStore.offload(result, "interview")
                 log_data = {
                     "user_id": user_id,
                     "tool_type": "interview_analyzer",
                     "input_files": [processed_filename], # Reference the new processed file
-                    "result_json": result,
+                    "output_files": artifact_paths,
+                    "result_json": result_json,
                     "cost_usd": 0.0, # Placeholder
                     "token_usage": {"audio_size_mb": processed_size_mb}
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
 
@@ -1,18 +1,23 @@
-import os
 import uuid
+import asyncio
 import datetime
-import tempfile
-from docx import Document
 from typing import Dict, Any, List
 from config.supabase import supabase_client
+from app.utils.AsyncUtils import aexecute
 from app.tools.file_handler import FileHandler
+from app.tools.activity_log_sink import ActivityLogSink
+from app.tools.docx_template_engine import DocxTemplateEngine
 from app.tools.validators.ktp_validator import KtpValidator
 from app.tools.extractors.cv_contact_extractor import CvContactExtractor
 import logging
 
 logger = logging.getLogger(__name__)
 
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
 class OnboardingService:
+    TEMPLATE_PATH = "assets/template/Template_Onboarding_Offboarding Form.docx"
+
     def __init__(self, llm):
         self.llm = llm
         self.ktp_validator = KtpValidator(llm)
@@ -33,7 +38,7 @@ class OnboardingService:
             # 1. Fetch Job Details
             job_details = {"title": "", "department": ""}
             try:
-                job_res = supabase_client.table("job_positions").select("title, department").eq("id", job_position_id).single().execute()
+                job_res = await aexecute(supabase_client.table("job_positions").select("title, department").eq("id", job_position_id).single())
                 if job_res.data:
                     job_details = job_res.data
             except Exception as e:
@@ -43,7 +48,7 @@ class OnboardingService:
             ktp_data = {}
             if "ktp" in files:
                 try:
-                    ktp_data = await self.ktp_validator(files["ktp"]["bytes"], files["ktp"]["mime_type"])
+                    ktp_data = await self.ktp_validator(files["ktp"]["media"])
                 except Exception as e:
                     logger.error(f"KTP Extraction failed: {str(e)}")
 
@@ -51,7 +56,7 @@ class OnboardingService:
             cv_data = {}
             if "cv" in files:
                 try:
-                    cv_data = await self.cv_extractor(files["cv"]["bytes"], files["cv"]["mime_type"])
+                    cv_data = await self.cv_extractor(files["cv"]["media"])
                 except Exception as e:
                     logger.error(f"CV Extraction failed: {str(e)}")
 
@@ -78,7 +83,7 @@ class OnboardingService:
                     "cost_usd": 0.005,
                     "token_usage": {"prompt": 200, "completion": 100}
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
 
@@ -88,73 +93,113 @@ class OnboardingService:
             logger.error(f"OnboardingService Analysis Fatal Error: {str(e)}", exc_info=True)
             raise e
 
-    async def generate_document(self, user_id: str, data: Dict[str, Any]) -> str:
+    async def generate_document(self, user_id: str, data: Dict[str, Any], pdf: bool = False) -> Dict[str, Any]:
         """
         Generates the DOCX file from the reviewed data.
         """
         try:
             # Fetch HR Name from Profiles
-            hr_name = "Unknown HR"
-            try:
-                profile_res = supabase_client.table("profiles").select("full_name").eq("id", user_id).single().execute()
-                if profile_res.data:
-                    hr_name = profile_res.data.get("full_name", hr_name)
-            except Exception as e:
-                logger.error(f"Error fetching profile: {str(e)}")
+            hr_name = await self._fetch_hr_name(user_id)
             
             # Generate Date
             now = datetime.datetime.now()
-            date_now_1 = now.strftime("%d %b %Y")
-            
-            # Fix Email/Phone Construction
-            email = data.get("email", "")
-            phone = data.get("phone", "")
-            if email or phone:
-                data["email_and_phone_number_candidate"] = f"{email} / {phone}"
-            
-            # Add to data for template
-            data["hr_name"] = hr_name
-            data["date_now_1"] = date_now_1
+            data = self._prepare_data(data, hr_name, now.strftime("%d %b %Y"))
 
              # 5. Generate Document
-            docx_path = self._fill_template(data)
+            docx_bytes = await asyncio.to_thread(self._fill_template, data)
             
             # Upload
-            with open(docx_path, "rb") as f:
-                docx_bytes = f.read()
             storage_path = f"generated/onboarding/{uuid.uuid4()}.docx"
-            await FileHandler.upload_file(docx_bytes, storage_path, "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-            os.remove(docx_path)
+            upload = await FileHandler.upload_document(docx_bytes, storage_path, DOCX_CONTENT_TYPE, pdf=pdf)
             
             # 6. Log Generation
             try:
                 log_data = {
                     "user_id": user_id,
                     "tool_type": "onboarding_generate",
-                    "output_files": [storage_path],
+                    "output_files": upload["paths"],
                     "result_json": {"document_generated": True},
                     "cost_usd": 0,
                     "token_usage": {}
                 }
-                supabase_client.table("activity_logs").insert(log_data).execute()
+                ActivityLogSink.log(log_data)
             except Exception as e:
                 logger.error(f"Logging failed: {str(e)}")
 
-            return FileHandler.get_public_url(storage_path)
+            return {key: value for key, value in upload.items() if key != "paths"}
 
         except Exception as e:
             logger.error(f"OnboardingService Doc Gen Fatal Error: {str(e)}", exc_info=True)
             raise e
 
-    def _fill_template(self, data: Dict[str, Any]) -> str:
-        template_path = "assets/template/Template_Onboarding_Offboarding Form.docx"
-        if not os.path.exists(template_path):
-             doc = Document()
-             doc.add_paragraph("Template not found.")
-        else:
-             doc = Document(template_path)
+    async def generate_documents_batch(self, user_id: str, items: List[Dict[str, Any]], output: str = "zip") -> Dict[str, Any]:
+        """
+        Generates onboarding forms for a whole cohort of reviewed payloads.
+        Renders in the process pool; output "zip" uploads one archive, "urls" one DOCX per item.
+        """
+        try:
+            hr_name = await self._fetch_hr_name(user_id)
+            date_now_1 = datetime.datetime.now().strftime("%d %b %Y")
+            items = [self._prepare_data(dict(item), hr_name, date_now_1) for item in items]
+
+            documents = await DocxTemplateEngine.render_many(
+                self.TEMPLATE_PATH, [self._build_replacements(item) for item in items]
+            )
+            names = [DocxTemplateEngine.archive_name(i, item.get("candidate_name")) for i, item in enumerate(items)]
+            storage_paths = await FileHandler.upload_batch(
+                list(zip(names, documents)), "generated/onboarding", DOCX_CONTENT_TYPE, as_zip=output == "zip"
+            )
+            urls = [FileHandler.get_public_url(path) for path in storage_paths]
+            result = {"count": len(documents), "output": output}
+            if output == "zip":
+                result["document_url"] = urls[0]
+            else:
+                result["document_urls"] = urls
+
+            # Log Generation (one entry per batch)
+            try:
+                log_data = {
+                    "user_id": user_id,
+                    "tool_type": "onboarding_generate",
+                    "output_files": storage_paths,
+                    "result_json": {"document_generated": True, "batch_size": len(items), "output": output},
+                    "cost_usd": 0,
+                    "token_usage": {}
+                }
+                ActivityLogSink.log(log_data)
+            except Exception as e:
+                logger.error(f"Logging failed: {str(e)}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"OnboardingService Batch Doc Gen Fatal Error: {str(e)}", exc_info=True)
+            raise e
+
+    async def _fetch_hr_name(self, user_id: str) -> str:
+        hr_name = "Unknown HR"
+        try:
+            profile_res = await aexecute(supabase_client.table("profiles").select("full_name").eq("id", user_id).single())
+            if profile_res.data:
+                hr_name = profile_res.data.get("full_name", hr_name)
+        except Exception as e:
+            logger.error(f"Error fetching profile: {str(e)}")
+        return hr_name
+
+    def _prepare_data(self, data: Dict[str, Any], hr_name: str, date_now_1: str) -> Dict[str, Any]:
+        # Fix Email/Phone Construction
+        email = data.get("email", "")
+        phone = data.get("phone", "")
+        if email or phone:
+            data["email_and_phone_number_candidate"] = f"{email} / {phone}"
         
-        replacements = {
+        # Add to data for template
+        data["hr_name"] = hr_name
+        data["date_now_1"] = date_now_1
+        return data
+
+    def _build_replacements(self, data: Dict[str, Any]) -> Dict[str, str]:
+        return {
             "{candidate_name}": data.get("candidate_name", ""),
             "{candidate_nik}": data.get("candidate_nik", ""),
             "{candidate_address}": data.get("candidate_address", ""),
@@ -165,27 +210,7 @@ class OnboardingService:
             "{hr_name}": data.get("hr_name", ""),
             "{date_now_1}": data.get("date_now_1", "")
         }
-        
-        # Replace in Paragraphs
-        for paragraph in doc.paragraphs:
-            self._replace_text_in_paragraph(paragraph, replacements)
-            
-        # Replace in Tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_text_in_paragraph(paragraph, replacements)
-                        
-        # Save - using cross-platform temp directory
-        temp_dir = tempfile.gettempdir()
-        filename = os.path.join(temp_dir, f"{uuid.uuid4()}.docx")
-        doc.save(filename)
-        return filename
-
-    def _replace_text_in_paragraph(self, paragraph, replacements):
-        if not paragraph.text:
-            return
-        for key, value in replacements.items():
-            if key in paragraph.text:
-                paragraph.text = paragraph.text.replace(key, value)
+
+    def _fill_template(self, data: Dict[str, Any]) -> bytes:
+        # Patch only the indexed placeholder runs of the compiled template (formatting kept)
+        return DocxTemplateEngine.render(self.TEMPLATE_PATH, self._build_replacements(data), missing_text="Template not found.")
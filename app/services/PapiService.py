@@ -1,13 +1,17 @@
+import asyncio
+import hashlib
 import logging
-import base64
-import textwrap
-import io
-from typing import List, Dict, Any, Tuple
-from PIL import Image, ImageDraw, ImageFont
+from typing import List, Dict, Any, Tuple, Optional
 
 from core.BaseAgent import BaseAgent
 from app.llm.factory import get_llm
 from app.schemas.PapiSchemas import PapiSummaryOutput
+from app.tools.papi_scorer import PapiScorer
+from app.tools.papi_interpretation import PapiInterpretation
+from app.tools.papi_summary_cache import PapiSummaryCache
+from app.tools.papi_narrative import PapiNarrative
+from app.tools.papi_image_renderer import PapiImageRenderer
+from config.setting import env
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +63,16 @@ Anda adalah seorang Psikolog HR profesional yang ahli dalam interpretasi PAPI Ko
 ]
 """
 
+SOURCE_LLM = "llm"
+SOURCE_CACHE = "cache"
+SOURCE_RULE_BASED = "rule_based"
+
+PROMPT_VERSION = hashlib.sha1(PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:8]
+
 class PapiService(BaseAgent):
+    # summary cache key -> running LLM call
+    _inflight: Dict[str, asyncio.Task] = {}
+
     def __init__(self):
         super().__init__(
             llm=get_llm(),
@@ -67,498 +80,110 @@ class PapiService(BaseAgent):
             output_model=PapiSummaryOutput,
             use_structured_output=True
         )
-        
-        # Define Interpretation Rules
-        self.interpretations = {
-            'A': {
-                (0, 4): "Tidak kompetitif, mapan, puas. Tidak terdorong untuk menghasilkan prestasi.",
-                (5, 7): "Tahu akan tujuan yang ingin dicapainya dan dapat merumuskannya.",
-                (8, 9): "Sangat berambisi utk berprestasi dan menjadi yg terbaik, menyukai tantangan."
-            },
-            'N': {
-                (0, 2): "Tidak terlalu merasa perlu untuk menuntaskan sendiri tugas-tugasnya, senang.",
-                (3, 5): "Cukup memiliki komitmen untuk menuntaskan tugas, akan tetapi.",
-                (6, 7): "Komitmen tinggi, lebih suka menangani pekerjaan satu demi satu.",
-                (8, 9): "Memiliki komitmen yg sangat tinggi thd tugas, sangat ingin menyelesaikan."
-            },
-            'G': {
-                (0, 2): "Santai, kerja adalah sesuatu yang menyenangkan-bukan beban yg mem-.",
-                (3, 4): "Bekerja keras sesuai tuntutan, menyalurkan usahanya untuk hal-hal.",
-                (5, 7): "Bekerja keras, tetapi jelas tujuan yg ingin dicapainya.",
-                (8, 9): "Ingin tampil sbg pekerja keras, sangat suka bila orang lain meman-."
-            },
-            'C': {
-                (0, 2): "Lebih mementingkan fleksibilitas daripada struktur, pendekatan.",
-                (3, 4): "Fleksibel tapi masih cukup memperhatikan keteraturan atau sistematika.",
-                (5, 6): "Memperhatikan keteraturan dan sistematika kerja, tapi cukup.",
-                (7, 9): "Sistematis, bermetoda, berstruktur, rapi dan teratur, dapat menata."
-            },
-            'D': {
-                (0, 1): "Melihat pekerjaan scr makro, membedakan hal penting dari yg kurang penting.",
-                (2, 3): "Cukup peduli akan akurasi dan kelengkapan data.",
-                (4, 6): "Tertarik untuk menangani sendiri detail.",
-                (7, 9): "Sangat menyukai detail, sangat peduli akan akurasi dan keleng-."
-            },
-            'R': {
-                (0, 3): "Tipe pelaksana, praktis - pragmatis, mengandalkan pengalaman.",
-                (4, 5): "Pertimbangan mencakup aspek teoritis ( konsep atau pemikiran ).",
-                (6, 7): "Suka memikirkan suatu problem secara mendalam, merujuk pada.",
-                (8, 9): "Tipe pemikir, sangat berminat pada gagasan, konsep, teori, menca-."
-            },
-            'T': {
-                (0, 3): "Santai. Kurang peduli akan waktu, kurang memiliki rasa urgensi.",
-                (4, 6): "Cukup aktif dalam segi mental, dapat menyesuaikan tempo kerjanya.",
-                (7, 9): "Cekatan, selalu siaga, bekerja cepat, ingin segera menyelesaikan."
-            },
-            'V': {
-                (0, 2): "Cocok untuk pekerjaan ' di belakang meja '. Cenderung lamban.",
-                (3, 6): "Dapat bekerja di belakang meja dan senang jika sesekali harus.",
-                (7, 9): "Menyukai aktifitas fisik ( a.l. : olah raga), enerjik, memiliki stamina."
-            },
-            'W': {
-                (0, 3): "Hanya butuh gambaran ttg kerangka tugas scr garis besar, berpatokan pd.",
-                (4, 5): "Perlu pengarahan awal dan tolok ukur keberhasilan.",
-                (6, 7): "Membutuhkan uraian rinci mengenai tugas, dan batasan tanggung.",
-                (8, 9): "Patuh pada kebijaksanaan, peraturan dan struktur organisasi."
-            },
-            'F': {
-                (0, 3): "Otonom, dapat bekerja sendiri tanpa campur tangan orang lain.",
-                (4, 6): "Loyal pada Perusahaan.",
-                (7, 7): "Loyal pada pribadi atasan.",
-                (8, 9): "Loyal, berusaha dekat dg pribadi atasan, ingin menyenangkan."
-            },
-            'L': {
-                (0, 1): "Puas dengan peran sebagai bawahan, memberikan kesempatan.",
-                (2, 3): "Tidak percaya diri dan tidak ingin memimpin atau mengawasi.",
-                (4, 4): "Kurang percaya diri dan kurang berminat utk menjadi pemimpin.",
-                (5, 5): "Cukup percaya diri, tidak secara aktif mencari posisi kepemimpinan.",
-                (6, 7): "Percaya diri dan ingin berperan sebagai pemimpin.",
-                (8, 9): "Sangat percaya diri utk berperan sbg atasan & sangat mengharapkan."
-            },
-            'P': {
-                (0, 1): "Permisif, akan memberikan kesempatan pada orang lain untuk.",
-                (2, 3): "Enggan mengontrol org lain & tidak mau mempertanggung jawabkan.",
-                (4, 4): "Cenderung enggan melakukan fungsi pengarahan, pengendalian.",
-                (5, 5): "Bertanggung jawab, akan melakukan fungsi pengarahan, pengendalian.",
-                (6, 7): "Dominan dan bertanggung jawab, akan melakukan fungsi pengarahan.",
-                (8, 9): "Sangat dominan, sangat mempengaruhi & mengawasi org lain, bertanggung."
-            },
-            'I': {
-                (0, 1): "Sangat berhati - hati, memikirkan langkah- langkahnya secara ber-.",
-                (2, 3): "Enggan mengambil keputusan.",
-                (4, 5): "Berhati - hati dlm pengambilan keputusan.",
-                (6, 7): "Cukup percaya diri dlm pengambilan keputusan, mau mengambil.",
-                (8, 9): "Sangat yakin dl mengambil keputusan, cepat tanggap thd situasi, berani."
-            },
-            'S': {
-                (0, 2): "Dpt. bekerja sendiri, tdk membutuhkan kehadiran org lain. Menarik.",
-                (3, 4): "Kurang percaya diri & kurang aktif dlm menjalin hubungan sosial.",
-                (5, 9): "Percaya diri & sangat senang bergaul, menyukai interaksi sosial, bisa men-."
-            },
-            'B': {
-                (0, 2): "Mandiri ( dari segi emosi ) , tdk mudah dipengaruhi oleh tekanan.",
-                (3, 5): "Selektif dlm bergabung dg kelompok, hanya mau berhubungan dg.",
-                (6, 9): "Suka bergabung dlm kelompok, sadar akan sikap & kebutuhan ke-."
-            },
-            'O': {
-                (0, 2): "Menjaga jarak, lebih memperhatikan hal - hal kedinasan, tdk mudah.",
-                (3, 5): "Tidak mencari atau menghindari hubungan antar pribadi di.",
-                (6, 9): "Peka akan kebutuhan org lain, sangat memikirkan hal - hal yg dibutuhkan."
-            },
-            'X': {
-                (0, 1): "Sederhana, rendah hati, tulus, tidak sombong dan tidak suka menam-.",
-                (2, 3): "Sederhana, cenderung diam, cenderung pemalu, tidak suka menon-.",
-                (4, 5): "Mengharapkan pengakuan lingkungan dan tidak mau diabaikan.",
-                (6, 9): "Bangga akan diri dan gayanya sendiri, senang menjadi pusat perha-."
-            },
-            'E': {
-                (0, 1): "Sangat terbuka, terus terang, mudah terbaca (dari air muka, tindakan.",
-                (2, 3): "Terbuka, mudah mengungkap pendapat atau perasaannya menge-.",
-                (4, 6): "Mampu mengungkap atau menyimpan perasaan, dapat mengen-.",
-                (7, 9): "Mampu menyimpan pendapat atau perasaannya, tenang, dapat."
-            },
-            'K': {
-                (0, 1): "Sabar, tidak menyukai konflik. Mengelak atau menghindar dari konflik.",
-                (2, 3): "Lebih suka menghindari konflik, akan mencari rasionalisasi untuk.",
-                (4, 5): "Tidak mencari atau menghindari konflik, mau mendengarkan pan-.",
-                (6, 7): "Akan menghadapi konflik, mengungkapkan serta memaksakan pan-.",
-                (8, 9): "Terbuka, jujur, terus terang, asertif, agresif, reaktif, mudah tersinggung."
-            },
-            'Z': {
-                (0, 1): "Mudah beradaptasi dg pekerjaan rutin tanpa merasa bosan, tidak mem-.",
-                (2, 3): "Enggan berubah, tidak siap untuk beradaptasi, hanya mau menerima.",
-                (4, 5): "Mudah beradaptasi, cukup menyukai perubahan.",
-                (6, 7): "Antusias terhadap perubahan dan akan mencari hal-hal baru, tetapi.",
-                (8, 9): "Sangat menyukai perubahan, gagasan baru/variasi, aktif mencari per-."
-            }
-        }
 
     def calculate_scores(self, answers: List[int]) -> Dict[str, int]:
         """
         Calculates PAPI Kostick scores based on 90 answers (1 or 2).
         Excel row B4 corresponds to answers[0].
         Excel row B93 corresponds to answers[89].
+        The scoring key lives in app/tools/papi_scorer.py (compiled to a weight matrix).
         """
-        
-        # Helper to get answer at excel row B_x
-        # index = x - 4
-        def val(row_num):
-            idx = row_num - 4
-            if 0 <= idx < 90:
-                return answers[idx]
-            return 0
-
-        # Formulas from prompt
-        scores = {}
-
-        # G
-        # =COUNTIF(B92,"=2")+COUNTIF(B81,"=2")+... (step 11)
-        # B4, B15, B26, B37, B48, B59, B70, B81, B92 -> Check 2
-        g_rows = [4, 15, 26, 37, 48, 59, 70, 81, 92]
-        scores['G'] = sum(1 for r in g_rows if val(r) == 2)
-
-        # L
-        # =COUNTIF(B92,"=1")+COUNTIF(B91,"=2")+COUNTIF(B80,"=2")+...
-        # 1: B92
-        # 2: B91, B80, B69, B58, B47, B36, B25, B14
-        scores['L'] = (1 if val(92) == 1 else 0) + \
-                      sum(1 for r in [91, 80, 69, 58, 47, 36, 25, 14] if val(r) == 2)
-
-        # I
-        # =COUNTIF(B81,"=1")+COUNTIF(B91,"=1")+COUNTIF(B90,"=2")+COUNTIF(B79,"=2")+...
-        # 1: B81, B91
-        # 2: B90, B79, B68, B57, B46, B35, B24
-        scores['I'] = sum(1 for r in [81, 91] if val(r) == 1) + \
-                      sum(1 for r in [90, 79, 68, 57, 46, 35, 24] if val(r) == 2)
-
-        # T
-        # =COUNTIF(B70,"=1")+COUNTIF(B80,"=1")+COUNTIF(B90,"=1")+COUNTIF(B89,"=2")+...
-        # 1: B70, B80, B90
-        # 2: B89, B78, B67, B56, B45, B34
-        scores['T'] = sum(1 for r in [70, 80, 90] if val(r) == 1) + \
-                      sum(1 for r in [89, 78, 67, 56, 45, 34] if val(r) == 2)
-
-        # V
-        # =COUNTIF(B59,"=1")+...+COUNTIF(B89,"=1")+COUNTIF(B88,"=2")+...
-        # 1: B59, B69, B79, B89
-        # 2: B88, B77, B66, B55, B44
-        scores['V'] = sum(1 for r in [59, 69, 79, 89] if val(r) == 1) + \
-                      sum(1 for r in [88, 77, 66, 55, 44] if val(r) == 2)
-
-        # S
-        # =COUNTIF(B48,"=1")+...+COUNTIF(B88,"=1")+COUNTIF(B87,"=2")+...
-        # 1: B48, B58, B68, B78, B88
-        # 2: B87, B76, B65, B54
-        scores['S'] = sum(1 for r in [48, 58, 68, 78, 88] if val(r) == 1) + \
-                      sum(1 for r in [87, 76, 65, 54] if val(r) == 2)
-
-        # R
-        # =COUNTIF(B37,"=1")+...+COUNTIF(B87,"=1")+COUNTIF(B86,"=2")+...
-        # 1: B37, B47, B57, B67, B77, B87
-        # 2: B86, B75, B64
-        scores['R'] = sum(1 for r in [37, 47, 57, 67, 77, 87] if val(r) == 1) + \
-                      sum(1 for r in [86, 75, 64] if val(r) == 2)
-
-        # D
-        # =COUNTIF(B26,"=1")+...+COUNTIF(B86,"=1")+COUNTIF(B85,"=2")+... (Typo in prompt? Using pattern B13 for C, B12 for E...)
-        # Wait, let's follow prompt exactly for D.
-        # Prompt: =COUNTIF(B13,"=1")... NO wait, looking at the list of formulas:
-        # 1. G (B92..=2)
-        # 2. L (B92=1, B91=2...)
-        # 3. I (B81=1...)
-        # 4. T (B70=1...)
-        # 5. V (B59=1...)
-        # 6. S (B48=1...)
-        # 7. R (B37=1...)
-        # 8. D: =COUNTIF(B13,"=1")+... (This matches the next formula in the list)
-        #    Wait, D usually follows R.
-        #    Formula list order in prompt:
-        #    1. G
-        #    2. L
-        #    3. I
-        #    4. T
-        #    5. V
-        #    6. S
-        #    7. R
-        #    8. =COUNTIF(B13,"=1")... + COUNTIF(B93,"=1") -> This is 9 items. All "=1".
-        #       B13, B23, B33, B43, B53, B63, B73, B83, B93.
-        #       This looks like **D**.
-        scores['D'] = sum(1 for r in [13, 23, 33, 43, 53, 63, 73, 83, 93] if val(r) == 1)
-
-        # 9. C: =COUNTIF(B12,"=1")...+B82,"=1" + COUNTIF(B13,"=2")
-        #    1: B12, B22, B32, B42, B52, B62, B72, B82
-        #    2: B13
-        scores['C'] = sum(1 for r in [12, 22, 32, 42, 52, 62, 72, 82] if val(r) == 1) + \
-                      (1 if val(13) == 2 else 0)
-
-        # 10. E: =COUNTIF(B11,"=1")...+B71,"=1" + COUNTIF(B12,"=2")+B23,"=2"
-        #     1: B11, B21, B31, B41, B51, B61, B71
-        #     2: B12, B23
-        scores['E'] = sum(1 for r in [11, 21, 31, 41, 51, 61, 71] if val(r) == 1) + \
-                      sum(1 for r in [12, 23] if val(r) == 2)
-
-        # 11. N: =COUNTIF(B10,"=1")...+B60,"=1" + COUNTIF(B11,"=2")+...+B33,"=2"
-        #     1: B10, B20, B30, B40, B50, B60
-        #     2: B11, B22, B33
-        scores['N'] = sum(1 for r in [10, 20, 30, 40, 50, 60] if val(r) == 1) + \
-                      sum(1 for r in [11, 22, 33] if val(r) == 2)
-
-        # 12. A: =COUNTIF(B9,"=1")...+B49,"=1" + COUNTIF(B10,"=2")+...+B43,"=2"
-        #     1: B9, B19, B29, B39, B49
-        #     2: B10, B21, B32, B43
-        scores['A'] = sum(1 for r in [9, 19, 29, 39, 49] if val(r) == 1) + \
-                      sum(1 for r in [10, 21, 32, 43] if val(r) == 2)
-
-        # 13. P: =COUNTIF(B8,"=1")...+B38,"=1" + COUNTIF(B9,"=2")+...+B53,"=2"
-        #     1: B8, B18, B28, B38
-        #     2: B9, B20, B31, B42, B53
-        scores['P'] = sum(1 for r in [8, 18, 28, 38] if val(r) == 1) + \
-                      sum(1 for r in [9, 20, 31, 42, 53] if val(r) == 2)
-
-        # 14. X: =COUNTIF(B7,"=1")...+B27,"=1" + COUNTIF(B8,"=2")+...+B63,"=2"
-        #     1: B7, B17, B27
-        #     2: B8, B19, B30, B41, B52, B63
-        scores['X'] = sum(1 for r in [7, 17, 27] if val(r) == 1) + \
-                      sum(1 for r in [8, 19, 30, 41, 52, 63] if val(r) == 2)
-
-        # 15. B: =COUNTIF(B6,"=1")+B16,"=1" + COUNTIF(B7,"=2")+...+B73,"=2"
-        #     1: B6, B16
-        #     2: B7, B18, B29, B40, B51, B62, B73
-        scores['B'] = sum(1 for r in [6, 16] if val(r) == 1) + \
-                      sum(1 for r in [7, 18, 29, 40, 51, 62, 73] if val(r) == 2)
-
-        # 16. O: =COUNTIF(B5,"=1") + COUNTIF(B6,"=2")+...+B83,"=2"
-        #     1: B5
-        #     2: B6, B17, B28, B39, B50, B61, B72, 83
-        scores['O'] = (1 if val(5) == 1 else 0) + \
-                      sum(1 for r in [6, 17, 28, 39, 50, 61, 72, 83] if val(r) == 2)
-
-        # 17. Z: =COUNTIF(B5,"=2")+...+B93,"=2" (All 2)
-        #     2: B5, B16, B27, B38, B49, B60, B71, B82, B93
-        scores['Z'] = sum(1 for r in [5, 16, 27, 38, 49, 60, 71, 82, 93] if val(r) == 2)
-
-        # 18. K: =COUNTIF(B4,"=1")+...+B84,"=1" (All 1)
-        #     1: B4, B14, B24, B34, B44, B54, B64, B74, B84
-        scores['K'] = sum(1 for r in [4, 14, 24, 34, 44, 54, 64, 74, 84] if val(r) == 1)
-        
-        # 19. F: =COUNTIF(B15,"=1")... (Not explicitly in my manual list above but must be the remaining ones)
-        #     Let's verify standard PAPI rules or infer from remaining.
-        #     Missing: F, W.
-        #     W usually is last.
-        #     F usually relates to B...
-        #     Let's look at standard PAPI Kostick scoring pattern.
-        #     Pattern usually cycles.
-        
-        #     Let's deduce from typical diagonals.
-        #     F: 1s in B15, B25...B95? No.
-        #     Let's check the excel formulas list length. 17 formulas provided in prompt.
-        #     But there are 20 factors.
-        #     Missing formulas in prompt text block?
-        #     Let's count the formulas block again.
-        #     1. G
-        #     2. L
-        #     3. I
-        #     4. T
-        #     5. V
-        #     6. S
-        #     7. R
-        #     8. D (all 1s)
-        #     9. C
-        #     10. E
-        #     11. N
-        #     12. A
-        #     13. P
-        #     14. X
-        #     15. B
-        #     16. O
-        #     17. Z (all 2s)
-        
-        #     Missing: K, F, W.
-        #     Wait, K, F, W are standard.
-        #     Let's re-read prompt carefully.
-        #     "ini rumusnya :" followed by list.
-        #     It has 17 formulas.
-        #     "ini contoh nilai hasil perhitungannya :" has 20 values!
-        #     E C D R S V T I L G W F K Z O B X P A N (Order in example values)
-        #     So we are missing formulas for W, F, K.
-        #     However, standard PAPI Kostick logic is symmetric.
-        
-        #     K: usually is row B4..B84 = 1. (Like G but =1).
-        #     F: usually B15=1, B25=1... + B4=2?
-        #     W: B?
-        
-        #     Let's try to find if K, F, W were hidden or I missed them.
-        #     Ah, look at the last formula in the prompt block:
-        #     =COUNTIF(B5,"=2")+... (This is Z)
-        
-        #     I will use standard PAPI Kostick mapping for K, F, W since they are standard.
-        #     K: B4, B14... B84 (Answer 1)
-        #     F: B15, B25, B35, B45, B55, B65, B75, B85, B95? No max 93.
-        #     F: B15(1), B26(1), B37(1)... NO.
-        
-        #     Let's use the Diagonal Pattern.
-        #     Factors: G L I T V S R D C E N A P X B O Z K F W
-        
-        #     K is "Hard working" / "Aggressive"? No K is Temperament.
-        #     K Formula (Standard):
-        #     Sum(1) for indices where G checks (2).
-        #     G checks 4, 15, 26... 92 (=2).
-        #     K checks 4, 15, 26... 92 (=1)? No, diagonals intersect.
-        
-        #     Let's assume standard diagonals:
-        #     Start at B4.
-        #     G (2) <-> K (1)? (B4=2 is G, B4=1 is K?)
-        #       B4 is in G list (check 2).
-        #       B15 is in G list (check 2).
-        #       ...
-        #       If standard PAPI, K is the count of '1's in the G diagonal?
-        #       Let's assume yes. B4, B15, ... B92.
-        #       Let's check K score calculation.
-        scores['K'] = sum(1 for r in g_rows if val(r) == 1)
-
-        #     F (Authority/Loyalty)
-        #     L checks '1' at B92, '2' at others.
-        #     F is likely the inverse or similar diagonal.
-        #     Standard F: B14(1), B25(1)...B91(1) + B92(2)?
-        #     Inverse of L?
-        #     L: B92(1), B91(2)...
-        #     F formula: B14(1), B25(1), B36(1), B47(1), B58(1), B69(1), B80(1), B91(1) + B92(2)
-        #     This effectively covers the same cells as L but opposite values.
-        #     Cells involved in L: 92, 91, 80, 69...
-        #     Wait, L cells: 92, 91, 80...
-        #     F cells: same?
-        #     Let's assume F is the complement of L on those specific cells? No, answers are 1 or 2.
-        #     So if L counts specific values, F might count the OTHER values.
-        #     If L counts B92=1, F might count B92=2.
-        #     If L counts B91=2, F might count B91=1.
-        #     So F = 9 - L? (Since total 9 questions).
-        #     Let's verify.
-        scores['F'] = 9 - scores['L']
-
-        #     W (Need for Rules)
-        #     Related to Z?
-        #     Z: B5, B16... (=2)
-        #     W: B5, B16... (=1)
-        #     Let's assume W is inverse of Z.
-        scores['W'] = sum(1 for r in [5, 16, 27, 38, 49, 60, 71, 82, 93] if val(r) == 1)
-
-        return scores
+        return PapiScorer.score(answers)
 
     def get_interpretation(self, scores: Dict[str, int]) -> Dict[str, str]:
-        interprets = {}
-        for factor, score in scores.items():
-            rule = self.interpretations.get(factor)
-            if not rule:
-                interprets[factor] = "No interpretation available."
-                continue
-            
-            # Find range
-            found = False
-            for (low, high), desc in rule.items():
-                if low <= score <= high:
-                    interprets[factor] = desc
-                    found = True
-                    break
-            
-            if not found:
-                 interprets[factor] = "Score out of range."
-        return interprets
-
-    async def generate_summary(self, scores: Dict[str, int], interpretations: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """Table lookup; the rules live in app/tools/papi_interpretation.py (compiled at import)."""
+        return PapiInterpretation.lookup(scores)
+
+    @staticmethod
+    def summary_key(signature: str) -> str:
+        # Summaries written under another prompt are not reused
+        return f"{PROMPT_VERSION}:{signature}"
+
+    @staticmethod
+    def profile_text(scores: Dict[str, int], interpretations: Dict[str, str]) -> str:
+        # Band ranges instead of raw scores: the LLM input is then a function of the
+        # band signature alone, which is what the summary cache is keyed on
+        lines = []
+        for factor, text in interpretations.items():
+            band = PapiInterpretation.band_range(factor, scores[factor])
+            if band is None:
+                label = f"Score {scores[factor]}"
+            elif band[0] == band[1]:
+                label = f"Score {band[0]}"
+            else:
+                label = f"Score {band[0]}-{band[1]}"
+            lines.append(f"- Factor {factor} ({label}): {text}")
+        return "\n".join(lines)
+
+    async def generate_summary(self, scores: Dict[str, int], interpretations: Dict[str, str], mode: str = "auto") -> Tuple[List[str], List[str], str]:
         """
-        Uses LLM to generate Strengths and Weaknesses based on scores and interpretations.
+        Generates Strengths and Weaknesses; returns (strengths, weaknesses, source).
+        - "llm": waits for the LLM,
+        - "fast": rule-based narrative (PapiNarrative), no LLM call,
+        - "auto": LLM within PAPI_SUMMARY_LATENCY_BUDGET_SECONDS, otherwise the rule-based
+          narrative; the LLM call keeps running and fills the cache for the next candidate.
+        A cached summary for the same band signature is returned in every mode (source
+        "cache"), and concurrent candidates with the same signature share one LLM call.
+        The rule-based narrative is also the fallback when the LLM fails.
         """
-        
-        # Format input for LLM
-        profile_text = "\n".join([f"- Factor {k} (Score {scores[k]}): {v}" for k, v in interpretations.items()])
-        
+        signature = PapiInterpretation.signature(scores)
+        key = self.summary_key(signature) if signature else None
+        if key:
+            cached = await PapiSummaryCache.get_instance().aget(key)
+            if cached is not None:
+                logger.info(f"PAPI summary cache hit for {signature}")
+                return cached[0], cached[1], SOURCE_CACHE
+
+        if mode == "fast":
+            return (*PapiNarrative.compose(scores), SOURCE_RULE_BASED)
+
+        profile_text = self.profile_text(scores, interpretations)
+        task = PapiService._inflight.get(key) if key else None
+        if task is None:
+            task = asyncio.ensure_future(self._summarize_and_cache(key, profile_text))
+            if key:
+                PapiService._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_summary(key, done))
+
         try:
-            self.rebind_prompt_variable(profile_text=profile_text)
-            _, parsed = await self.arun_chain(input="Generate PAPI summary")
-            return parsed.strengths, parsed.weaknesses
-            
+            if mode == "auto":
+                strengths, weaknesses = await asyncio.wait_for(
+                    asyncio.shield(task), timeout=env.PAPI_SUMMARY_LATENCY_BUDGET_SECONDS
+                )
+            else:
+                strengths, weaknesses = await asyncio.shield(task)
+            return list(strengths), list(weaknesses), SOURCE_LLM
+        except asyncio.TimeoutError:
+            logger.info(f"PAPI summary over {env.PAPI_SUMMARY_LATENCY_BUDGET_SECONDS}s budget, using rule-based narrative")
         except Exception as e:
-            logger.error(f"Error generating summary: {e}")
-            return ["Error generating strengths"], ["Error generating weaknesses"]
-
-    def generate_image(self, name: str, email: str, strengths: List[str], weaknesses: List[str]) -> str:
+            logger.error(f"Error generating summary, using rule-based narrative: {e}")
+        return (*PapiNarrative.compose(scores), SOURCE_RULE_BASED)
+
+    async def _summarize(self, profile_text: str) -> Tuple[List[str], List[str]]:
+        self.rebind_prompt_variable(profile_text=profile_text)
+        _, parsed = await self.arun_chain(input="Generate PAPI summary")
+        return parsed.strengths, parsed.weaknesses
+
+    async def _summarize_and_cache(self, key: Optional[str], profile_text: str) -> Tuple[List[str], List[str]]:
+        strengths, weaknesses = await self._summarize(profile_text)
+        if key:
+            await PapiSummaryCache.get_instance().aput(key, strengths, weaknesses)
+        return strengths, weaknesses
+
+    @staticmethod
+    def _finish_summary(key: Optional[str], task: asyncio.Task):
+        if key:
+            PapiService._inflight.pop(key, None)
+        # Calls left running past the latency budget have no awaiter to report to
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"PAPI summary LLM call failed: {task.exception()}")
+
+    @staticmethod
+    def prewarm_summary_cache() -> int:
+        return PapiSummaryCache.get_instance().prewarm(PapiService.summary_key)
+
+    async def generate_image(self, name: str, email: str, strengths: List[str], weaknesses: List[str], image_format: str = "png") -> str:
         """
-        Generates a summary image and returns base64 string.
+        Generates a summary image and returns base64 string (rendered in the process pool).
         """
-        # Canvas Setup - Start with larger height, will crop later
-        width = 800
-        initial_height = 2000  # Start larger to accommodate content
-        bg_color = (255, 255, 255)
-        text_color = (0, 0, 0)
-        
-        # Create Image
-        img = Image.new('RGB', (width, initial_height), bg_color)
-        draw = ImageDraw.Draw(img)
-        
-        # Fonts (Try to load default or specific)
-        try:
-            # Linux path often has fonts here
-            font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
-            font_header = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-            font_sub = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20)
-            font_text = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
-        except IOError:
-            # Fallback
-            font_title = ImageFont.load_default()
-            font_header = ImageFont.load_default()
-            font_sub = ImageFont.load_default()
-            font_text = ImageFont.load_default()
-
-        # Layout
-        margin = 50
-        y = 50
-        
-        # Title
-        draw.text((margin, y), f"PAPI Kostick Summary", font=font_title, fill=text_color)
-        y += 60
-        draw.text((margin, y), f"Candidate: {name}", font=font_header, fill=text_color)
-        y += 40
-        draw.text((margin, y), f"Email: {email}", font=font_sub, fill=text_color)
-        y += 80
-        
-        # Strengths
-        draw.text((margin, y), "Strengths", font=font_header, fill=(0, 100, 0)) # Dark Green
-        y += 40
-        for point in strengths:
-            lines = textwrap.wrap(point, width=70) # Adjust width char count
-            for idx, line in enumerate(lines):
-                # Only add bullet point to the first line of each paragraph
-                if idx == 0:
-                    draw.text((margin + 20, y), f"• {line}", font=font_text, fill=text_color)
-                else:
-                    draw.text((margin + 20, y), line, font=font_text, fill=text_color)
-                y += 25
-            y += 10
-            
-        y += 30
-        
-        # Weaknesses
-        draw.text((margin, y), "Weaknesses", font=font_header, fill=(139, 0, 0)) # Dark Red
-        y += 40
-        for point in weaknesses:
-            lines = textwrap.wrap(point, width=70)
-            for idx, line in enumerate(lines):
-                # Only add bullet point to the first line of each paragraph
-                if idx == 0:
-                    draw.text((margin + 20, y), f"• {line}", font=font_text, fill=text_color)
-                else:
-                    draw.text((margin + 20, y), line, font=font_text, fill=text_color)
-                y += 25
-            y += 10
-
-        # IMPORTANT: Crop to exact content height + margin
-        final_height = y + margin
-        img = img.crop((0, 0, width, final_height))
-
-        # Output to Base64
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        
-        return img_str
-
+        return await PapiImageRenderer.render_async(name, email, strengths, weaknesses, image_format)
@@ -0,0 +1,196 @@
+import re
+import json
+import logging
+from difflib import SequenceMatcher
+from typing import List, Dict, Any, Tuple, Set
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ALIAS_TABLE_PATH = "assets/data/university_aliases.json"
+
+# Common abbreviations on ijazah scans and PDDIKTI records
+ABBREVIATIONS = {
+    "univ": "universitas",
+    "unv": "universitas",
+    "inst": "institut",
+    "tek": "teknologi",
+    "tekn": "teknologi",
+    "poltek": "politeknik",
+    "pol": "politeknik",
+    "neg": "negeri",
+    "n": "negeri",
+    "muh": "muhammadiyah",
+    "kat": "katolik",
+    "kr": "kristen",
+    "isl": "islam",
+}
+
+# Institution-type words (and the country) shared by most names; they carry no
+# identity, so "Universitas Kristen Indonesia" must not pass for "Universitas Indonesia"
+GENERIC_UNIVERSITY_TOKENS = {"universitas", "institut", "sekolah", "tinggi", "politeknik", "akademi", "indonesia"}
+
+class NgramVectorizer:
+    """
+    Hashed character-trigram vectors, built for a whole batch of strings at once
+    with numpy (no per-string Python loop over n-grams).
+    """
+    DIM = 1024
+
+    @staticmethod
+    def transform(texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, NgramVectorizer.DIM), dtype=np.float32)
+
+        # Word boundaries take part in the trigrams, so token starts/ends weigh in
+        encoded = [f"  {t} ".encode("utf-8") for t in texts]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+        codes = (buf[:-2] << 16) | (buf[1:-1] << 8) | buf[2:]
+        valid = rows[:-2] == rows[2:]
+        features = (codes[valid] * 2654435761) % NgramVectorizer.DIM
+        flat = rows[:-2][valid] * NgramVectorizer.DIM + features
+
+        matrix = np.bincount(flat, minlength=len(texts) * NgramVectorizer.DIM)
+        matrix = matrix.reshape(len(texts), NgramVectorizer.DIM).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+class AcademicMatcher:
+    """
+    Matches Ijazah data against PDDIKTI `search_mahasiswa` records.
+    University names are normalized and resolved against a preindexed alias table
+    (e.g. "UI", "Univ. Indonesia" -> "universitas indonesia"). Two universities only
+    match when every distinctive token (GENERIC_UNIVERSITY_TOKENS aside) of each
+    name has a counterpart in the other, typos tolerated, or on an alias hit.
+    Student-name similarity is scored for all records in one matrix product.
+    """
+    _instance = None
+
+    UNIVERSITY_WEIGHT = 0.6
+    NAME_WEIGHT = 0.4
+    # Fuzzy resolution of a university name to a canonical table entry: trigram
+    # shortlist, then the distinctive-token check
+    CANONICAL_THRESHOLD = 0.9
+    CANONICAL_CANDIDATES = 3
+    # Per-token similarity for OCR typos ("sepuloh" ~ "sepuluh")
+    TOKEN_THRESHOLD = 0.8
+    MATCH_THRESHOLD = 0.8
+    MIN_UNIVERSITY_SCORE = 0.85
+    MIN_NAME_SCORE = 0.6
+
+    def __init__(self, alias_path: str = ALIAS_TABLE_PATH):
+        self.alias_to_canonical: Dict[str, str] = {}
+        try:
+            with open(alias_path, "r", encoding="utf-8") as f:
+                table = json.load(f)
+        except Exception as e:
+            logger.error(f"Could not load university alias table: {str(e)}")
+            table = {}
+
+        for canonical, aliases in table.items():
+            canonical_norm = self.normalize(canonical)
+            self.alias_to_canonical[canonical_norm] = canonical_norm
+            for alias in aliases:
+                self.alias_to_canonical[self.normalize(alias)] = canonical_norm
+
+        self.canonical_names = sorted(set(self.alias_to_canonical.values()))
+        self.canonical_matrix = NgramVectorizer.transform(self.canonical_names)
+
+    @classmethod
+    def get_instance(cls) -> "AcademicMatcher":
+        if cls._instance is None:
+            cls._instance = AcademicMatcher()
+        return cls._instance
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        tokens = re.sub(r"[^a-z0-9\s]", " ", (text or "").lower()).split()
+        return " ".join(ABBREVIATIONS.get(token, token) for token in tokens)
+
+    def canonical_university(self, name: str) -> str:
+        normalized = self.normalize(name)
+        if normalized in self.alias_to_canonical:
+            return self.alias_to_canonical[normalized]
+        if not normalized or not len(self.canonical_names):
+            return normalized
+        scores = self.canonical_matrix @ NgramVectorizer.transform([normalized])[0]
+        for best in np.argsort(-scores)[:self.CANONICAL_CANDIDATES]:
+            if scores[best] < self.CANONICAL_THRESHOLD:
+                break
+            if self.university_score(normalized, self.canonical_names[best]) >= self.TOKEN_THRESHOLD:
+                return self.canonical_names[best]
+        return normalized
+
+    @staticmethod
+    def _distinctive_tokens(name: str) -> Set[str]:
+        return {token for token in name.split() if token not in GENERIC_UNIVERSITY_TOKENS}
+
+    @staticmethod
+    def university_score(name_a: str, name_b: str) -> float:
+        """
+        Similarity of two normalized university names: the weakest match of any
+        distinctive token against the other name's tokens, so a token missing on
+        either side (e.g. "kristen") scores 0.
+        """
+        if name_a == name_b:
+            return 1.0
+        tokens_a, tokens_b = AcademicMatcher._distinctive_tokens(name_a), AcademicMatcher._distinctive_tokens(name_b)
+        if not tokens_a or not tokens_b:
+            return 0.0
+
+        def coverage(tokens: Set[str], others: Set[str]) -> float:
+            return min(max(SequenceMatcher(None, token, other).ratio() for other in others) for token in tokens)
+
+        return min(coverage(tokens_a, tokens_b), coverage(tokens_b, tokens_a))
+
+    def rank(self, student_name: str, university: str, records: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (confidence, university_score, name_score) arrays aligned with `records`.
+        """
+        target_uni = self.canonical_university(university)
+        target_name = self.normalize(student_name)
+
+        # PDDIKTI repeats the same institution across hits: canonicalize each distinct name once
+        pt_names = [record.get("nama_pt") or "" for record in records]
+        unique_pts, pt_index = np.unique(pt_names, return_inverse=True)
+        uni_scores = np.array(
+            [self.university_score(self.canonical_university(pt), target_uni) for pt in unique_pts],
+            dtype=np.float32
+        )[pt_index]
+
+        # Exact alias hit on the PT abbreviation (e.g. "UI") counts as a full university match
+        abbreviations = [self.alias_to_canonical.get(self.normalize(record.get("sinkatan_pt") or "")) for record in records]
+        uni_scores = np.where(np.array([a == target_uni for a in abbreviations]), 1.0, uni_scores)
+
+        names = [self.normalize(record.get("nama") or "") for record in records]
+        name_scores = NgramVectorizer.transform(names) @ NgramVectorizer.transform([target_name])[0]
+
+        confidence = self.UNIVERSITY_WEIGHT * uni_scores + self.NAME_WEIGHT * name_scores
+        return confidence, uni_scores, name_scores
+
+    def best_match(self, student_name: str, university: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Returns {"record", "confidence", "university_score", "name_score", "is_match"} for the
+        best-ranked record, or record=None when there are no records.
+        """
+        if not records:
+            return {"record": None, "confidence": 0.0, "university_score": 0.0, "name_score": 0.0, "is_match": False}
+
+        confidence, uni_scores, name_scores = self.rank(student_name, university, records)
+        best = int(np.argmax(confidence))
+        result = {
+            "record": records[best],
+            "confidence": round(float(confidence[best]), 3),
+            "university_score": round(float(uni_scores[best]), 3),
+            "name_score": round(float(name_scores[best]), 3),
+        }
+        result["is_match"] = (
+            result["confidence"] >= self.MATCH_THRESHOLD
+            and result["university_score"] >= self.MIN_UNIVERSITY_SCORE
+            and result["name_score"] >= self.MIN_NAME_SCORE
+        )
+        return result
@@ -0,0 +1,222 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from postgrest.types import ReturnMethod
+from postgrest.exceptions import APIError
+from config.setting import env
+from config.supabase import supabase_client
+from app.utils.AsyncUtils import aexecute
+from app.utils.FileUtils import append_jsonl, take_jsonl
+
+logger = logging.getLogger(__name__)
+
+SPILL_FILENAME = "activity_log_spill.jsonl"
+DEAD_LETTER_FILENAME = "activity_log_dead_letter.jsonl"
+
+# PostgREST/Postgres error codes about the server rather than the rows: connection
+# (08), transaction rollback (40), resources (53), operator intervention/timeouts
+# (57), system (58), PostgREST connection (PGRST0xx) and JWT (PGRST3xx), permissions
+TRANSIENT_CODE_PREFIXES = ("08", "40", "53", "57", "58", "PGRST0", "PGRST3", "42501")
+
+# Queued by `shutdown`: flush what is left and stop
+_STOP = None
+
+class ActivityLogSink:
+    """
+    Write-behind buffer for activity_logs: `log` only queues the row, a background
+    worker inserts queued rows in batches of ACTIVITY_LOG_BATCH_SIZE, or whatever
+    arrived within ACTIVITY_LOG_FLUSH_SECONDS of the first one.
+    Batches that fail for transport reasons (unreachable, timeout, server errors) are
+    appended to a spill file (JSONL under LOCAL_DATA_DIR) and replayed on the next
+    start and every ACTIVITY_LOG_REPLAY_SECONDS after a successful insert. A batch
+    the database rejects (constraint, bad value) is retried row by row; only the
+    rejected rows go to a dead-letter file, which is kept for inspection and never
+    replayed. `shutdown` flushes the queue.
+    """
+    _queue: Optional[asyncio.Queue] = None
+    _task: Optional[asyncio.Task] = None
+    # Rows taken off the queue but not yet inserted or spilled
+    _batch: List[Dict[str, Any]] = []
+    _last_replay: float = 0.0
+
+    @staticmethod
+    def spill_path() -> str:
+        return os.path.join(env.LOCAL_DATA_DIR, SPILL_FILENAME)
+
+    @classmethod
+    def start(cls):
+        loop = asyncio.get_running_loop()
+        if cls._task is not None and not cls._task.done() and cls._task.get_loop() is loop:
+            return
+        previous = cls._queue
+        cls._queue = asyncio.Queue(maxsize=env.ACTIVITY_LOG_QUEUE_MAX)
+        # Rows left by a worker of another (closed) loop are carried over
+        while previous is not None and not previous.empty():
+            entry = previous.get_nowait()
+            if entry is not _STOP:
+                cls._queue.put_nowait(entry)
+        cls._task = loop.create_task(cls._run(cls._queue))
+
+    @classmethod
+    def log(cls, log_data: Dict[str, Any]):
+        """Queues an activity_logs row. Never waits on the database and never raises."""
+        try:
+            cls.start()
+            cls._queue.put_nowait(log_data)
+        except asyncio.QueueFull:
+            logger.warning(f"Activity log queue full ({env.ACTIVITY_LOG_QUEUE_MAX}), spilling {log_data.get('tool_type')} entry")
+            cls.spill([log_data])
+        except Exception as e:
+            logger.error(f"Activity log could not be queued: {str(e)}")
+            cls.spill([log_data])
+
+    @classmethod
+    async def _run(cls, queue: asyncio.Queue):
+        await cls.replay()
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await queue.get()
+            batch = cls._batch = []
+            if entry is _STOP:
+                stopping = True
+            else:
+                batch.append(entry)
+            deadline = loop.time() + env.ACTIVITY_LOG_FLUSH_SECONDS
+            while not stopping and len(batch) < env.ACTIVITY_LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                else:
+                    batch.append(entry)
+            if stopping:
+                while not queue.empty():
+                    entry = queue.get_nowait()
+                    if entry is not _STOP:
+                        batch.append(entry)
+
+            inserted = await cls._write(batch)
+            cls._batch = []
+            if inserted and time.monotonic() - cls._last_replay >= env.ACTIVITY_LOG_REPLAY_SECONDS:
+                await cls.replay()
+
+    @staticmethod
+    def is_rejection(error: Exception) -> bool:
+        """True when the database refused the rows themselves, so retrying them unchanged is pointless."""
+        if not isinstance(error, APIError):
+            return False
+        # Non-JSON responses (gateway errors) carry the HTTP status as an int code
+        return isinstance(error.code, str) and bool(error.code) and not error.code.startswith(TRANSIENT_CODE_PREFIXES)
+
+    @staticmethod
+    async def _insert(entries: List[Dict[str, Any]]):
+        # Missing columns take their defaults (e.g. output_files) instead of null
+        await aexecute(supabase_client.table("activity_logs").insert(
+            entries, returning=ReturnMethod.minimal, default_to_null=False
+        ))
+
+    @classmethod
+    async def _write(cls, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Inserts entries in batches. A rejected batch is retried row by row and the
+        rejected rows are dead-lettered; on a transport failure that batch and the
+        rest are spilled and False is returned.
+        """
+        size = env.ACTIVITY_LOG_BATCH_SIZE
+        for start in range(0, len(entries), size):
+            chunk = entries[start:start + size]
+            try:
+                await cls._insert(chunk)
+                continue
+            except Exception as e:
+                if not cls.is_rejection(e):
+                    logger.error(f"Activity log insert of {len(chunk)} entries failed: {str(e)}")
+                    cls.spill(entries[start:])
+                    return False
+                if len(chunk) == 1:
+                    cls.dead_letter(chunk[0], e)
+                    continue
+                logger.warning(f"Activity log batch of {len(chunk)} rejected ({e.code}), retrying row by row")
+
+            for offset, entry in enumerate(chunk):
+                try:
+                    await cls._insert([entry])
+                except Exception as e:
+                    if not cls.is_rejection(e):
+                        logger.error(f"Activity log insert failed: {str(e)}")
+                        cls.spill(entries[start + offset:])
+                        return False
+                    cls.dead_letter(entry, e)
+        return True
+
+    @classmethod
+    def spill(cls, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        try:
+            append_jsonl(cls.spill_path(), entries)
+            logger.warning(f"Spilled {len(entries)} activity log entries to {cls.spill_path()}")
+        except Exception as e:
+            logger.error(f"Could not spill {len(entries)} activity log entries: {str(e)}")
+
+    @staticmethod
+    def dead_letter_path() -> str:
+        return os.path.join(env.LOCAL_DATA_DIR, DEAD_LETTER_FILENAME)
+
+    @classmethod
+    def dead_letter(cls, entry: Dict[str, Any], error: APIError):
+        record = {"entry": entry, "error": error.json(), "recorded_at": time.time()}
+        try:
+            append_jsonl(cls.dead_letter_path(), [record])
+            logger.error(f"Activity log entry ({entry.get('tool_type')}) rejected, dead-lettered: {error.message}")
+        except Exception as e:
+            logger.error(f"Could not dead-letter activity log entry: {str(e)}")
+
+    @classmethod
+    async def replay(cls) -> int:
+        """Inserts spilled entries; entries that still fail go back to the spill file."""
+        cls._last_replay = time.monotonic()
+        try:
+            # Taken under a node-wide file lock: other workers may be spilling right now
+            entries = take_jsonl(cls.spill_path())
+        except Exception as e:
+            logger.error(f"Could not read activity log spill file: {str(e)}")
+            return 0
+        if entries and await cls._write(entries):
+            logger.info(f"Replayed {len(entries)} spilled activity log entries")
+            return len(entries)
+        return 0
+
+    @classmethod
+    async def shutdown(cls):
+        """Flushes queued entries; whatever cannot be inserted in time is spilled."""
+        task, queue = cls._task, cls._queue
+        cls._task = None
+        if task is None or task.done():
+            return
+        try:
+            queue.put_nowait(_STOP)
+        except asyncio.QueueFull:
+            # The worker drains everything once it reaches the stop marker
+            cls.spill([queue.get_nowait()])
+            queue.put_nowait(_STOP)
+        try:
+            await asyncio.wait_for(asyncio.shield(task), env.ACTIVITY_LOG_SHUTDOWN_TIMEOUT_SECONDS)
+        except Exception:
+            task.cancel()
+            left = cls._batch
+            while not queue.empty():
+                entry = queue.get_nowait()
+                if entry is not _STOP:
+                    left.append(entry)
+            cls._batch = []
+            logger.warning(f"Activity log flush timed out, spilling {len(left)} entries")
+            cls.spill(left)
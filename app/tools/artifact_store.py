@@ -0,0 +1,111 @@
+import gzip
+import json
+import uuid
+import base64
+import asyncio
+import logging
+from typing import Dict, Any, List, Tuple, Optional
+from config.setting import env
+from app.tools.file_handler import FileHandler
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_KEY = "$artifact"
+
+EXTENSIONS = {
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/jpeg": ".jpg",
+    "application/json": ".json",
+    "text/plain; charset=utf-8": ".txt",
+}
+
+class ArtifactStore:
+    """
+    Keeps activity_logs.result_json small: top-level fields larger than
+    ARTIFACT_OFFLOAD_THRESHOLD_BYTES are written to the hr-files bucket under
+    artifacts/ and replaced by a reference:
+
+        {"$artifact": "<storage path>", "content_type": ..., "encoding": "gzip" | None, "size": <bytes>}
+
+    Base64 fields (images) are stored decoded; text/JSON fields are gzipped when
+    ARTIFACT_COMPRESS is on. The storage paths belong in the log's output_files so
+    deleting the log also deletes its artifacts.
+    """
+
+    @staticmethod
+    def is_reference(value: Any) -> bool:
+        return isinstance(value, dict) and REFERENCE_KEY in value
+
+    @staticmethod
+    def references(result_json: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {field: value for field, value in (result_json or {}).items() if ArtifactStore.is_reference(value)}
+
+    @staticmethod
+    def _pack(field: str, value: Any, base64_content_type: Optional[str]) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        if base64_content_type and isinstance(value, str):
+            if len(value) < env.ARTIFACT_OFFLOAD_THRESHOLD_BYTES:
+                return None
+            data = base64.b64decode(value)
+            return data, {"content_type": base64_content_type, "encoding": None, "size": len(data)}
+
+        if isinstance(value, str):
+            data, content_type = value.encode("utf-8"), "text/plain; charset=utf-8"
+        else:
+            data, content_type = json.dumps(value, ensure_ascii=False).encode("utf-8"), "application/json"
+        if len(data) < env.ARTIFACT_OFFLOAD_THRESHOLD_BYTES:
+            return None
+        size = len(data)
+        encoding = None
+        if env.ARTIFACT_COMPRESS:
+            data, encoding = gzip.compress(data, compresslevel=6), "gzip"
+        return data, {"content_type": content_type, "encoding": encoding, "size": size}
+
+    @staticmethod
+    async def offload(result_json: Dict[str, Any], folder: str, base64_fields: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Returns (result_json with large fields replaced by references, uploaded paths).
+        `base64_fields` maps field -> content type of its decoded bytes (e.g.
+        {"summary_image": "image/png"}). If an upload fails the log keeps the inline values.
+        """
+        base64_fields = base64_fields or {}
+        light = dict(result_json)
+        uploads = []
+        artifact_id = uuid.uuid4()
+        for field, value in result_json.items():
+            packed = ArtifactStore._pack(field, value, base64_fields.get(field))
+            if packed is None:
+                continue
+            data, reference = packed
+            extension = EXTENSIONS.get(reference["content_type"], "") + (".gz" if reference["encoding"] == "gzip" else "")
+            path = f"artifacts/{folder}/{artifact_id}/{field}{extension}"
+            upload_type = "application/gzip" if reference["encoding"] == "gzip" else reference["content_type"]
+            uploads.append((data, path, upload_type))
+            light[field] = {REFERENCE_KEY: path, **reference}
+
+        if not uploads:
+            return result_json, []
+
+        results = await asyncio.gather(
+            *[FileHandler.upload_file(data, path, content_type) for data, path, content_type in uploads],
+            return_exceptions=True
+        )
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed:
+            logger.error(f"Artifact offload failed, keeping values inline: {failed[0]}")
+            uploaded = [path for (_, path, _), result in zip(uploads, results) if not isinstance(result, Exception)]
+            if uploaded:
+                try:
+                    await FileHandler.delete_files(uploaded)
+                except Exception:
+                    pass
+            return result_json, []
+        return light, [path for _, path, _ in uploads]
+
+    @staticmethod
+    async def load(reference: Dict[str, Any]) -> Tuple[bytes, str]:
+        """Downloads an artifact; returns (original bytes, content type)."""
+        data = await FileHandler.download_file(reference[REFERENCE_KEY])
+        if reference.get("encoding") == "gzip":
+            data = await asyncio.to_thread(gzip.decompress, data)
+        return data, reference.get("content_type") or "application/octet-stream"
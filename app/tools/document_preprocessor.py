@@ -0,0 +1,66 @@
+import logging
+from typing import Tuple
+from app.tools.pdf_optimizer import PdfOptimizer
+from app.tools.image_normalizer import ImageNormalizer
+from app.tools.process_pool import ProcessPool
+
+logger = logging.getLogger(__name__)
+
+class DocumentPreprocessor:
+    """
+    Shared preprocessing stage for documents (PDFs and photos) sent to the LLM.
+    Shrinks the payload per document type; never fails the caller.
+    """
+    # Pages the LLM actually needs to read per document type
+    PAGE_LIMITS = {
+        "cv": 6,
+        "ktp": 1,
+        "academic": 2,
+        "criminal": 2,
+    }
+
+    @staticmethod
+    async def prepare(file_bytes: bytes, mime_type: str, doc_type: str) -> Tuple[bytes, str, bool]:
+        """
+        Returns (file_bytes, mime_type, changed) ready to be base64-encoded into a prompt.
+        `changed` is False when the original bytes are the best payload; after the
+        process pool round trip they are an equal copy, not the same object.
+        """
+        if mime_type and mime_type.startswith("image/"):
+            return await DocumentPreprocessor._prepare_image(file_bytes, mime_type, doc_type)
+        if mime_type != "application/pdf":
+            return file_bytes, mime_type, False
+
+        try:
+            optimized, stats = await ProcessPool.run(
+                PdfOptimizer.optimize, file_bytes, DocumentPreprocessor.PAGE_LIMITS.get(doc_type)
+            )
+            logger.info(
+                f"PDF optimized ({doc_type}): {stats['original_bytes']} -> {stats['optimized_bytes']} bytes "
+                f"(saved {stats['saved_bytes']}, base64 {stats['saved_base64_bytes']}), "
+                f"pages {stats['pages_kept']}/{stats['pages_total']}, "
+                f"images downsampled {stats['images_downsampled']}, took {stats['elapsed_ms']}ms"
+            )
+            # The optimizer only returns other bytes when they are smaller
+            if stats["saved_bytes"] <= 0:
+                return file_bytes, mime_type, False
+            return optimized, mime_type, True
+        except Exception as e:
+            logger.warning(f"PDF optimization skipped ({doc_type}): {str(e)}")
+            return file_bytes, mime_type, False
+
+    @staticmethod
+    async def _prepare_image(file_bytes: bytes, mime_type: str, doc_type: str) -> Tuple[bytes, str, bool]:
+        try:
+            normalized, new_mime_type, stats = await ProcessPool.run(ImageNormalizer.normalize, file_bytes, doc_type)
+            logger.info(
+                f"Image normalized ({doc_type}): {stats['original_bytes']} -> {stats['normalized_bytes']} bytes "
+                f"(saved {stats['saved_bytes']}), {stats['original_size']} -> {stats['normalized_size']}, "
+                f"cropped {stats['cropped']}, took {stats['elapsed_ms']}ms"
+            )
+            if new_mime_type is None:
+                return file_bytes, mime_type, False
+            return normalized, new_mime_type, True
+        except Exception as e:
+            logger.warning(f"Image normalization skipped ({doc_type}): {str(e)}")
+            return file_bytes, mime_type, False
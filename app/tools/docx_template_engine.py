@@ -0,0 +1,193 @@
+import io
+import os
+import re
+import copy
+import time
+import zipfile
+import logging
+import asyncio
+import threading
+from typing import Dict, List, Tuple, Optional
+from lxml import etree
+from docx import Document
+from app.tools.process_pool import ProcessPool
+from config.setting import env
+
+logger = logging.getLogger(__name__)
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_P = f"{{{W_NS}}}p"
+W_R = f"{{{W_NS}}}r"
+W_T = f"{{{W_NS}}}t"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+DOCUMENT_PART = "word/document.xml"
+
+PLACEHOLDER_PATTERN = re.compile(r"\{[A-Za-z0-9_]+\}")
+
+class CompiledTemplate:
+    """
+    A DOCX template parsed once:
+    - placeholders split across runs by Word ("{cand" + "idate_name}") are merged
+      into the run holding their first character, keeping that run's formatting,
+    - every run text containing a placeholder is indexed by its element path,
+    - all package parts except word/document.xml are kept as one prebuilt zip.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        with open(path, "rb") as f:
+            source = f.read()
+
+        with zipfile.ZipFile(io.BytesIO(source)) as package:
+            self.document_date_time = package.getinfo(DOCUMENT_PART).date_time
+            self.root = etree.fromstring(package.read(DOCUMENT_PART))
+
+            # Untouched parts, compressed once; renders only append document.xml
+            base = io.BytesIO()
+            with zipfile.ZipFile(base, "w", zipfile.ZIP_DEFLATED) as out:
+                for info in package.infolist():
+                    if info.filename != DOCUMENT_PART:
+                        out.writestr(info, package.read(info.filename))
+            self.base_package = base.getvalue()
+
+        for paragraph in self.root.iter(W_P):
+            self._merge_split_placeholders(paragraph)
+
+        # (path of the <w:t> element from the root, its text with placeholders)
+        self.slots: List[Tuple[Tuple[int, ...], str]] = []
+        for run in self.root.iter(W_R):
+            for text in run.iter(W_T):
+                if text.text and PLACEHOLDER_PATTERN.search(text.text):
+                    self.slots.append((self._element_path(text), text.text))
+
+    @property
+    def placeholders(self) -> List[str]:
+        return sorted({key for _, text in self.slots for key in PLACEHOLDER_PATTERN.findall(text)})
+
+    def render(self, replacements: Dict[str, str]) -> bytes:
+        root = copy.deepcopy(self.root)
+        for path, template in self.slots:
+            element = root
+            for index in path:
+                element = element[index]
+            element.text = PLACEHOLDER_PATTERN.sub(lambda match: self._value(replacements, match.group(0)), template)
+            element.set(XML_SPACE, "preserve")
+
+        info = zipfile.ZipInfo(DOCUMENT_PART, date_time=self.document_date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        output = io.BytesIO(self.base_package)
+        with zipfile.ZipFile(output, "a") as out:
+            out.writestr(info, etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True))
+        return output.getvalue()
+
+    @staticmethod
+    def _value(replacements: Dict[str, str], key: str) -> str:
+        # Missing keys keep the placeholder; a None value (field not extracted) renders empty
+        value = replacements.get(key, key)
+        return "" if value is None else str(value)
+
+    @staticmethod
+    def _element_path(element) -> Tuple[int, ...]:
+        path = []
+        parent = element.getparent()
+        while parent is not None:
+            path.append(parent.index(element))
+            element, parent = parent, parent.getparent()
+        return tuple(reversed(path))
+
+    @staticmethod
+    def _merge_split_placeholders(paragraph):
+        # Text nodes of this paragraph only (nested paragraphs, e.g. text boxes, are visited on their own)
+        texts = [t for t in paragraph.iter(W_T) if next(t.iterancestors(W_P)) is paragraph]
+        full_text = "".join(t.text or "" for t in texts)
+        if "{" not in full_text:
+            return
+
+        # Right to left: moving text between nodes never shifts the offsets of earlier matches
+        for match in reversed(list(PLACEHOLDER_PATTERN.finditer(full_text))):
+            offsets, position = [], 0
+            for t in texts:
+                offsets.append(position)
+                position += len(t.text or "")
+            first = max(i for i, offset in enumerate(offsets) if offset <= match.start())
+            last = max(i for i, offset in enumerate(offsets) if offset < match.end())
+            if first == last:
+                continue
+
+            head = (texts[first].text or "")[:match.start() - offsets[first]]
+            tail = (texts[last].text or "")[match.end() - offsets[last]:]
+            texts[first].text = head + match.group(0)
+            texts[first].set(XML_SPACE, "preserve")
+            for t in texts[first + 1:last]:
+                t.text = ""
+            texts[last].text = tail
+            texts[last].set(XML_SPACE, "preserve")
+
+class DocxTemplateEngine:
+    """
+    Shared DOCX renderer for the generate endpoints. Templates are compiled once
+    per process (see CompiledTemplate) and recompiled when the file's mtime changes.
+    """
+    _templates: Dict[str, CompiledTemplate] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_template(cls, path: str) -> Optional[CompiledTemplate]:
+        if not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        template = cls._templates.get(path)
+        if template is None or template.mtime != mtime:
+            with cls._lock:
+                template = cls._templates.get(path)
+                if template is None or template.mtime != mtime:
+                    started = time.perf_counter()
+                    template = CompiledTemplate(path)
+                    cls._templates[path] = template
+                    logger.info(
+                        f"Compiled template {os.path.basename(path)}: {len(template.slots)} slots, "
+                        f"{len(template.placeholders)} placeholders, took {int((time.perf_counter() - started) * 1000)}ms"
+                    )
+        return template
+
+    @classmethod
+    def render(cls, path: str, replacements: Dict[str, str], missing_text: str = "Template not found.") -> bytes:
+        """
+        Renders the template at `path` with `{placeholder}` -> value replacements
+        and returns the DOCX bytes. Unknown placeholders are left as they are.
+        """
+        template = cls.get_template(path)
+        if template is None:
+            logger.warning(f"Template not found: {path}")
+            doc = Document()
+            doc.add_paragraph(missing_text)
+            output = io.BytesIO()
+            doc.save(output)
+            return output.getvalue()
+        return template.render(replacements)
+
+    @classmethod
+    def render_batch(cls, path: str, replacements_list: List[Dict[str, str]], missing_text: str = "Template not found.") -> List[bytes]:
+        """Renders one template for many payloads (one pool task per chunk)."""
+        return [cls.render(path, replacements, missing_text) for replacements in replacements_list]
+
+    @classmethod
+    async def render_many(cls, path: str, replacements_list: List[Dict[str, str]], missing_text: str = "Template not found.") -> List[bytes]:
+        """
+        Renders a batch in the process pool, split into one chunk per worker; every
+        worker compiles the template once and reuses it for its whole chunk.
+        """
+        if not replacements_list:
+            return []
+        size = -(-len(replacements_list) // env.PROCESS_POOL_WORKERS)
+        chunks = [replacements_list[i:i + size] for i in range(0, len(replacements_list), size)]
+        results = await asyncio.gather(*[
+            ProcessPool.run(cls.render_batch, path, chunk, missing_text) for chunk in chunks
+        ])
+        return [document for chunk in results for document in chunk]
+
+    @staticmethod
+    def archive_name(index: int, label: str, extension: str = "docx") -> str:
+        safe = re.sub(r"[^A-Za-z0-9]+", "_", label or "").strip("_") or "document"
+        return f"{index + 1:03d}_{safe}.{extension}"
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Dict, Any
+from core.BaseAgent import BaseAgent
+from app.tools.media_payload import MediaPayload
+from app.tools.validators.ktp_validator import KtpValidationOutput
+from app.tools.validators.academic_validator import AcademicExtractionOutput
+from app.tools.validators.criminal_validator import CriminalExtractionOutput
+from pydantic import BaseModel, Field
+
+class BgCheckExtractionOutput(BaseModel):
+    ktp: KtpValidationOutput = Field(..., description="Result for Document 1 (KTP).")
+    academic: AcademicExtractionOutput = Field(..., description="Result for Document 2 (Ijazah).")
+    criminal: CriminalExtractionOutput = Field(..., description="Result for Document 3 (SKCK).")
+
+class BgCheckDocumentExtractor(BaseAgent):
+    """
+    Extracts KTP, Ijazah and SKCK of one candidate in a single structured-output
+    call (one system prompt, one round trip) and splits the result back into the
+    per-validator shapes.
+    """
+    def __init__(self, llm, **kwargs):
+        prompt_template = """
+        You are a Background Screening Expert. You receive three documents of the same candidate, in this order:
+        Document 1: KTP (Kartu Tanda Penduduk)
+        Document 2: Ijazah (Academic Certificate)
+        Document 3: SKCK (Criminal Record Certificate)
+
+        Fill exactly one schema section per document.
+
+        ktp:
+        1. Check if the image is a valid Indonesian KTP.
+        2. Ensure NIK, Name, Address, Gender, and Birth Date are clearly visible.
+        3. Extract NIK, Full Name, Address, Gender (Laki-Laki / Perempuan), Birth Place and Birth Date (DD-MM-YYYY).
+
+        academic:
+        1. Extract Full Name, University Name and Nomor Ijazah.
+
+        criminal:
+        1. Extract the Name and Criminal Status.
+        2. Check if the document is signed (look for signature/stamp).
+        3. Verify if the Name matches the Full Name on the KTP (Document 1).
+
+        Output valid JSON matching the schema.
+        """
+        super().__init__(
+            llm=llm,
+            prompt_template=prompt_template,
+            output_model=BgCheckExtractionOutput,
+            use_structured_output=True,
+            **kwargs
+        )
+
+    async def __call__(self, ktp: MediaPayload, academic: MediaPayload, criminal: MediaPayload) -> Dict[str, Dict[str, Any]]:
+        ktp, academic, criminal = await asyncio.gather(
+            ktp.prepared("ktp"),
+            academic.prepared("academic"),
+            criminal.prepared("criminal"),
+        )
+        message_content = (
+            self.build_media_message("Document 1: KTP.", ktp)
+            + self.build_media_message("Document 2: Ijazah.", academic)
+            + self.build_media_message("Document 3: SKCK.", criminal)
+        )
+
+        raw, parsed = await self.arun_chain(input=message_content)
+        return {
+            "ktp": parsed.ktp.model_dump(),
+            "academic": parsed.academic.model_dump(),
+            "criminal": parsed.criminal.model_dump(),
+        }
@@ -1,6 +1,6 @@
-import base64
 from typing import Dict, Any
 from core.BaseAgent import BaseAgent
+from app.tools.media_payload import MediaPayload
 from pydantic import BaseModel, Field
 
 class CvContactOutput(BaseModel):
@@ -26,16 +26,10 @@ class CvContactExtractor(BaseAgent):
             **kwargs
         )
 
-    async def __call__(self, file_bytes: bytes, mime_type: str = "application/pdf") -> Dict[str, Any]:
-        base64_data = base64.b64encode(file_bytes).decode('utf-8')
+    async def __call__(self, media: MediaPayload) -> Dict[str, Any]:
+        media = await media.prepared("cv")
         
-        message_content = [
-            {"type": "text", "text": "Extract contact info from this CV."},
-            {
-                "type": "image_url",
-                "image_url": {"url": f"data:{mime_type};base64,{base64_data}"}
-            }
-        ]
+        message_content = self.build_media_message("Extract contact info from this CV.", media)
         
         raw, parsed = await self.arun_chain(input=message_content)
         return parsed.model_dump()
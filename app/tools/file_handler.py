@@ -1,5 +1,12 @@
+import io
+import uuid
+import asyncio
+import zipfile
 import logging
+from typing import List, Tuple, Dict, Any
 from config.supabase import supabase_client
+from app.utils.AsyncUtils import run_blocking
+from app.tools.office_converter_pool import OfficeConverterPool
 import os
 
 logger = logging.getLogger(__name__)
@@ -13,7 +20,8 @@ class FileHandler:
         Uploads a file to Supabase Storage and returns the public URL or path.
         """
         try:
-            res = supabase_client.storage.from_(FileHandler.BUCKET_NAME).upload(
+            res = await run_blocking(
+                supabase_client.storage.from_(FileHandler.BUCKET_NAME).upload,
                 path=destination_path,
                 file=file_bytes,
                 file_options={"content-type": content_type, "upsert": "false"}
@@ -25,13 +33,73 @@ class FileHandler:
             logger.error(f"Upload failed: {str(e)}")
             raise
 
+    @staticmethod
+    async def upload_document(file_bytes: bytes, destination_path: str, content_type: str, pdf: bool = False) -> Dict[str, Any]:
+        """
+        Uploads a generated document and, if requested, its PDF rendition; the PDF
+        conversion runs concurrently with the original upload. A failed conversion
+        does not fail the request (pdf_url is None).
+        Returns {"paths": [...], "document_url": ..., "pdf_url": ... (only if pdf)}.
+        """
+        pdf_path = f"{os.path.splitext(destination_path)[0]}.pdf"
+
+        async def publish_pdf() -> bool:
+            try:
+                pdf_bytes = await OfficeConverterPool.convert_to_pdf(file_bytes)
+                await FileHandler.upload_file(pdf_bytes, pdf_path, "application/pdf")
+                return True
+            except Exception as e:
+                logger.error(f"PDF output failed: {str(e)}")
+                return False
+
+        if not pdf:
+            await FileHandler.upload_file(file_bytes, destination_path, content_type)
+            return {"paths": [destination_path], "document_url": FileHandler.get_public_url(destination_path)}
+
+        _, pdf_ok = await asyncio.gather(
+            FileHandler.upload_file(file_bytes, destination_path, content_type),
+            publish_pdf()
+        )
+        return {
+            "paths": [destination_path, pdf_path] if pdf_ok else [destination_path],
+            "document_url": FileHandler.get_public_url(destination_path),
+            "pdf_url": FileHandler.get_public_url(pdf_path) if pdf_ok else None,
+        }
+
+    @staticmethod
+    async def upload_batch(files: List[Tuple[str, bytes]], folder: str, content_type: str, as_zip: bool = True) -> List[str]:
+        """
+        Uploads generated files either as one ZIP archive (single upload) or one
+        object per file. Returns the storage paths.
+        """
+        if as_zip:
+            archive = await asyncio.to_thread(FileHandler.pack_zip, files)
+            path = f"{folder}/batch/{uuid.uuid4()}.zip"
+            await FileHandler.upload_file(archive, path, "application/zip")
+            return [path]
+
+        paths = [f"{folder}/{uuid.uuid4()}{os.path.splitext(name)[1]}" for name, _ in files]
+        await asyncio.gather(*[
+            FileHandler.upload_file(data, path, content_type) for (_, data), path in zip(files, paths)
+        ])
+        return paths
+
+    @staticmethod
+    def pack_zip(files: List[Tuple[str, bytes]]) -> bytes:
+        # Office files are already deflated; store entries as-is
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as archive:
+            for name, data in files:
+                archive.writestr(name, data)
+        return output.getvalue()
+
     @staticmethod
     async def download_file(source_path: str) -> bytes:
         """
         Downloads a file from Supabase Storage.
         """
         try:
-            res = supabase_client.storage.from_(FileHandler.BUCKET_NAME).download(source_path)
+            res = await run_blocking(supabase_client.storage.from_(FileHandler.BUCKET_NAME).download, source_path)
             return res
         except Exception as e:
             logger.error(f"Download failed: {str(e)}")
@@ -43,11 +111,22 @@ class FileHandler:
         Deletes a file from Supabase Storage.
         """
         try:
-            supabase_client.storage.from_(FileHandler.BUCKET_NAME).remove([path])
+            await run_blocking(supabase_client.storage.from_(FileHandler.BUCKET_NAME).remove, [path])
         except Exception as e:
             logger.error(f"Delete failed: {str(e)}")
             raise
-            
+
+    @staticmethod
+    async def delete_files(paths: List[str]):
+        """
+        Deletes several files from Supabase Storage in one call.
+        """
+        try:
+            await run_blocking(supabase_client.storage.from_(FileHandler.BUCKET_NAME).remove, paths)
+        except Exception as e:
+            logger.error(f"Batch delete failed: {str(e)}")
+            raise
+
     @staticmethod
     def get_public_url(path: str) -> str:
         return supabase_client.storage.from_(FileHandler.BUCKET_NAME).get_public_url(path)
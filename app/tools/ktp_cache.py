@@ -0,0 +1,61 @@
+import copy
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+from config.setting import env
+
+logger = logging.getLogger(__name__)
+
+class KtpCache:
+    """
+    In-memory store of KTP extraction results shared by BgCheck, Onboarding and
+    CriminalLetter, so one candidate's KTP is read by the LLM once.
+
+    Entries are keyed by the upload's sha256 only: a hit needs the byte-identical
+    file, so nobody gets back data they did not upload themselves. (Perceptually
+    similar photos are not shared; two different cards can be that close.)
+    The data is personal (NIK, address): it is never persisted, expires after
+    KTP_CACHE_TTL_SECONDS and is bounded to KTP_CACHE_MAX_ENTRIES (LRU).
+    """
+    _instance = None
+
+    def __init__(self):
+        # sha256 -> (expires_at, result)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @classmethod
+    def get_instance(cls) -> "KtpCache":
+        if cls._instance is None:
+            cls._instance = KtpCache()
+        return cls._instance
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        if not env.KTP_CACHE_ENABLED:
+            return None
+        self._evict_expired()
+
+        entry = self._entries.get(sha256)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(sha256)
+        # Callers enrich their copy (name checks, age, ...); never hand out the stored dict
+        return copy.deepcopy(entry[1])
+
+    def put(self, sha256: str, result: Dict[str, Any]):
+        if not env.KTP_CACHE_ENABLED:
+            return
+        self._entries[sha256] = (time.monotonic() + env.KTP_CACHE_TTL_SECONDS, copy.deepcopy(result))
+        self._entries.move_to_end(sha256)
+        while len(self._entries) > env.KTP_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry[0] <= now]
+        for key in expired:
+            del self._entries[key]
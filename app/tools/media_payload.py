@@ -0,0 +1,103 @@
+import base64
+import hashlib
+import logging
+from typing import Dict, Any, Optional, Iterable
+from fastapi import UploadFile
+from app.tools.document_preprocessor import DocumentPreprocessor
+
+logger = logging.getLogger(__name__)
+
+class MediaPayload:
+    """
+    One uploaded document shared by every consumer of a request (storage upload,
+    hashing, validators). The content is held once behind a memoryview; the hash,
+    the base64 data URL and the LLM-ready (preprocessed) variants are computed
+    lazily, at most once, and reused by all consumers.
+    """
+
+    def __init__(self, data: bytes, mime_type: str, filename: Optional[str] = None):
+        self._data = data
+        self._view = memoryview(data)
+        self.mime_type = mime_type or "application/octet-stream"
+        self.filename = filename
+        self._sha256 = None
+        self._data_url = None
+        self._prepared: Dict[str, "MediaPayload"] = {}
+        self._data_url_requests = 0
+
+    @classmethod
+    async def from_upload(cls, file: UploadFile) -> "MediaPayload":
+        # UploadFile is already backed by a SpooledTemporaryFile; read it exactly once
+        await file.seek(0)
+        data = await file.read()
+        return cls(data, file.content_type, file.filename)
+
+    @property
+    def size(self) -> int:
+        return self._view.nbytes
+
+    @property
+    def bytes(self) -> bytes:
+        """The underlying bytes object (no copy)."""
+        return self._data
+
+    @property
+    def view(self) -> memoryview:
+        return self._view
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self._view).hexdigest()
+        return self._sha256
+
+    @property
+    def data_url(self) -> str:
+        """base64 data URL, encoded once and shared by every consumer."""
+        self._data_url_requests += 1
+        if self._data_url is None:
+            prefix = f"data:{self.mime_type};base64,".encode("ascii")
+            self._data_url = (prefix + base64.b64encode(self._view)).decode("ascii")
+        return self._data_url
+
+    async def prepared(self, doc_type: str) -> "MediaPayload":
+        """
+        Returns the LLM-ready variant of this payload (see DocumentPreprocessor),
+        computed once per document type.
+        """
+        if doc_type not in self._prepared:
+            data, mime_type, changed = await DocumentPreprocessor.prepare(self._data, self.mime_type, doc_type)
+            self._prepared[doc_type] = MediaPayload(data, mime_type, self.filename) if changed else self
+        return self._prepared[doc_type]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Memory accounting for this payload and its prepared variants. The legacy
+        path held, per consumer, the base64 bytes, their decoded str and the
+        f-string data URL (3 copies); now one data URL is built (one transient
+        bytes buffer plus the str) and shared.
+        """
+        payloads = [self] + [p for p in self._prepared.values() if p is not self]
+        encoded = sum(len(p._data_url) for p in payloads if p._data_url is not None)
+        consumers = sum(p._data_url_requests for p in payloads)
+        legacy = sum(3 * len(p._data_url) * p._data_url_requests for p in payloads if p._data_url is not None)
+        return {
+            "size": self.size,
+            "llm_bytes": sum(p.size for p in payloads[1:]) or self.size,
+            "encoded_bytes": encoded,
+            "consumers": consumers,
+            "estimated_saved_bytes": max(0, legacy - 2 * encoded),
+        }
+
+    @staticmethod
+    def log_request_savings(label: str, payloads: Iterable["MediaPayload"]):
+        totals = {"size": 0, "llm_bytes": 0, "encoded_bytes": 0, "consumers": 0, "estimated_saved_bytes": 0}
+        for payload in payloads:
+            for key, value in payload.stats().items():
+                totals[key] += value
+        logger.info(
+            f"[{label}] media payloads: {totals['size']} bytes uploaded, {totals['llm_bytes']} bytes sent to LLM, "
+            f"{totals['encoded_bytes']} bytes encoded for {totals['consumers']} consumers, "
+            f"~{totals['estimated_saved_bytes']} bytes of copies avoided"
+        )
+        return totals
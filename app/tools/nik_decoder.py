@@ -0,0 +1,160 @@
+import re
+import json
+import datetime
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+REGION_TABLE_PATH = "assets/data/nik_regions.json"
+
+GENDER_MALE = "Laki-Laki"
+GENDER_FEMALE = "Perempuan"
+
+class NikDecoder:
+    """
+    Decodes the 16-digit Indonesian NIK locally:
+    PP RR DD | dd mm yy | ssss
+    province, regency, district | birth date (day + 40 for women) | serial.
+
+    Used to validate the NIK the LLM read from a KTP and to fill a missing birth date,
+    gender and region without another LLM call.
+    """
+    # KTP-el is issued from 17; decides the century of the 2-digit birth year
+    MIN_KTP_AGE = 17
+
+    _regions = None
+
+    @classmethod
+    def regions(cls) -> Dict[str, Dict[str, str]]:
+        if cls._regions is None:
+            try:
+                with open(REGION_TABLE_PATH, "r", encoding="utf-8") as f:
+                    cls._regions = json.load(f)
+            except Exception as e:
+                logger.error(f"Could not load NIK region table: {str(e)}")
+                cls._regions = {}
+        return cls._regions
+
+    @staticmethod
+    def decode(nik: str, today: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """
+        Returns the decoded NIK; `errors` is empty when the NIK is structurally valid.
+        """
+        today = today or datetime.date.today()
+        digits = re.sub(r"\D", "", nik or "")
+        result = {
+            "nik": digits,
+            "is_valid": False,
+            "province_code": None,
+            "province": None,
+            "regency_code": None,
+            "regency": None,
+            "district_code": None,
+            "district": None,
+            "birth_date": None,
+            "gender": None,
+            "errors": [],
+        }
+        if len(digits) != 16:
+            result["errors"].append(f"NIK must have 16 digits, got {len(digits)}")
+            return result
+
+        regions = NikDecoder.regions()
+        result["province_code"] = digits[:2]
+        result["regency_code"] = digits[:4]
+        result["district_code"] = digits[:6]
+        result["province"] = regions.get("provinces", {}).get(digits[:2])
+        result["regency"] = regions.get("regencies", {}).get(digits[:4])
+        result["district"] = regions.get("districts", {}).get(digits[:6])
+        if regions.get("provinces") and result["province"] is None:
+            result["errors"].append(f"Unknown province code {digits[:2]}")
+
+        day, month, year = int(digits[6:8]), int(digits[8:10]), int(digits[10:12])
+        result["gender"] = GENDER_FEMALE if day > 40 else GENDER_MALE
+        if day > 40:
+            day -= 40
+        year += 2000 if 2000 + year <= today.year - NikDecoder.MIN_KTP_AGE else 1900
+        try:
+            result["birth_date"] = datetime.date(year, month, day)
+        except ValueError:
+            result["errors"].append(f"Invalid birth date in NIK ({digits[6:12]})")
+
+        if digits[12:] == "0000":
+            result["errors"].append("Invalid NIK serial number 0000")
+
+        result["is_valid"] = not result["errors"]
+        return result
+
+    @staticmethod
+    def parse_date(value: str) -> Optional[datetime.date]:
+        """Parses DD-MM-YYYY (also with / or . separators)."""
+        match = re.match(r"^\s*(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})\s*$", value or "")
+        if not match:
+            return None
+        try:
+            return datetime.date(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def normalize_gender(value: str) -> Optional[str]:
+        value = (value or "").lower()
+        if any(word in value for word in ("perempuan", "wanita", "female")):
+            return GENDER_FEMALE
+        if any(word in value for word in ("laki", "pria", "male")):
+            return GENDER_MALE
+        return None
+
+    @staticmethod
+    def age(birth_date: datetime.date, today: Optional[datetime.date] = None) -> int:
+        today = today or datetime.date.today()
+        return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+    @staticmethod
+    def reconcile(ktp_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cross-checks an extracted KTP against its NIK. When the NIK is valid, a birth
+        date / gender missing from the card is filled from it (`corrected_fields`).
+        A card value that disagrees with the NIK is kept as read: a structurally valid
+        NIK can still be misread or belong to someone else, so the disagreement is
+        reported (`mismatched_fields`, `issues`) for a human to resolve.
+        """
+        decoded = NikDecoder.decode(ktp_result.get("nik", ""))
+        issues = list(decoded["errors"])
+        corrected = []
+        mismatched = []
+        card_birth_date = ktp_result.get("birth_date") or None
+
+        if decoded["is_valid"]:
+            nik_birth_date = decoded["birth_date"].strftime("%d-%m-%Y")
+            if not ktp_result.get("birth_date"):
+                ktp_result["birth_date"] = nik_birth_date
+                corrected.append("birth_date")
+            elif NikDecoder.parse_date(ktp_result["birth_date"]) != decoded["birth_date"]:
+                issues.append(f"Birth date {ktp_result['birth_date']} does not match NIK ({nik_birth_date})")
+                mismatched.append("birth_date")
+
+            if not ktp_result.get("gender"):
+                ktp_result["gender"] = decoded["gender"]
+                corrected.append("gender")
+            elif NikDecoder.normalize_gender(ktp_result["gender"]) != decoded["gender"]:
+                issues.append(f"Gender {ktp_result['gender']} does not match NIK ({decoded['gender']})")
+                mismatched.append("gender")
+
+        ktp_result["nik_check"] = {
+            "valid": decoded["is_valid"],
+            "province": decoded["province"],
+            "regency": decoded["regency"],
+            "district_code": decoded["district_code"],
+            "birth_date": decoded["birth_date"].strftime("%d-%m-%Y") if decoded["birth_date"] else None,
+            # As read from the card, before a missing date is filled from the NIK
+            "extracted_birth_date": card_birth_date,
+            "gender": decoded["gender"],
+            "corrected_fields": corrected,
+            "mismatched_fields": mismatched,
+            "issues": issues,
+        }
+        if issues:
+            logger.warning(f"NIK cross-check issues: {issues}")
+        return ktp_result
@@ -0,0 +1,219 @@
+import os
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+import subprocess
+from typing import Optional, List
+from config.setting import env
+
+logger = logging.getLogger(__name__)
+
+PDF_FILTER = "writer_pdf_Export"
+
+class OfficeWorker:
+    """
+    One long-lived headless LibreOffice process, driven over a local UNO pipe
+    (a unix socket). Documents go in and out as `private:stream`, nothing touches disk
+    apart from the worker's private profile.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pipe_name = f"hrth_office_{os.getpid()}_{index}"
+        self.profile_dir = os.path.join(tempfile.gettempdir(), self.pipe_name)
+        self.process: Optional[subprocess.Popen] = None
+        self.desktop = None
+        self.context = None
+        self.jobs = 0
+
+    @property
+    def needs_recycle(self) -> bool:
+        return (
+            self.process is None
+            or self.process.poll() is not None
+            or self.jobs >= env.OFFICE_CONVERTER_MAX_JOBS_PER_WORKER
+        )
+
+    def start(self):
+        import uno
+
+        self.process = subprocess.Popen(
+            [
+                env.OFFICE_CONVERTER_BINARY,
+                "--headless", "--invisible", "--nologo", "--norestore", "--nodefault", "--nolockcheck",
+                f"-env:UserInstallation=file://{self.profile_dir}",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + env.OFFICE_CONVERTER_STARTUP_SECONDS
+        while True:
+            try:
+                self.context = resolver.resolve(
+                    f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception:
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    self.stop()
+                    raise RuntimeError(f"Office worker {self.index} did not start")
+                time.sleep(0.25)
+
+        self.desktop = self.context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", self.context
+        )
+        self.jobs = 0
+        logger.info(f"Office worker {self.index} started (pid {self.process.pid})")
+
+    def stop(self):
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+        self.process = None
+        self.desktop = None
+        self.context = None
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def convert(self, file_bytes: bytes, filter_name: str = PDF_FILTER) -> bytes:
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def props(**values):
+            result = []
+            for name, value in values.items():
+                prop = PropertyValue()
+                prop.Name, prop.Value = name, value
+                result.append(prop)
+            return tuple(result)
+
+        self.jobs += 1
+        input_stream = self.context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.io.SequenceInputStream", self.context
+        )
+        input_stream.initialize((uno.ByteSequence(file_bytes),))
+        output_stream = _make_output_stream()
+
+        document = self.desktop.loadComponentFromURL(
+            "private:stream", "_blank", 0, props(InputStream=input_stream, Hidden=True, ReadOnly=True)
+        )
+        if document is None:
+            raise RuntimeError("Office worker could not load the document")
+        try:
+            document.storeToURL("private:stream", props(FilterName=filter_name, OutputStream=output_stream))
+        finally:
+            document.close(True)
+        return bytes(output_stream.data)
+
+def _make_output_stream():
+    # Defined lazily: the UNO base classes only exist where LibreOffice's python bridge is installed
+    import unohelper
+    from com.sun.star.io import XOutputStream
+
+    class _OutputStream(unohelper.Base, XOutputStream):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writeBytes(self, seq):
+            self.data.extend(seq.value)
+
+        def flush(self):
+            pass
+
+        def closeOutput(self):
+            pass
+
+    return _OutputStream()
+
+class OfficeConverterPool:
+    """
+    Pool of warm headless LibreOffice workers for DOCX -> PDF conversion, so a
+    request pays the conversion only, not the multi-second cold start.
+    Jobs time out after OFFICE_CONVERTER_TIMEOUT_SECONDS; a worker that timed out,
+    failed or served OFFICE_CONVERTER_MAX_JOBS_PER_WORKER jobs is recycled.
+    Disabled unless OFFICE_CONVERTER_ENABLED (needs LibreOffice and its python UNO bridge).
+    """
+    _workers: List[OfficeWorker] = []
+    _idle: Optional[asyncio.Queue] = None
+    _start_lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return env.OFFICE_CONVERTER_ENABLED
+
+    @classmethod
+    async def start(cls):
+        if not cls.is_enabled():
+            return
+        if cls._start_lock is None:
+            cls._start_lock = asyncio.Lock()
+        async with cls._start_lock:
+            if cls._idle is not None:
+                return
+            logger.info(f"Starting {env.OFFICE_CONVERTER_WORKERS} office converter workers...")
+            workers = [OfficeWorker(i) for i in range(env.OFFICE_CONVERTER_WORKERS)]
+            results = await asyncio.gather(
+                *[asyncio.to_thread(worker.start) for worker in workers], return_exceptions=True
+            )
+            failures = [result for result in results if isinstance(result, BaseException)]
+            if failures:
+                # Workers that did start would otherwise be left running with no pool to reach them
+                await asyncio.gather(*[asyncio.to_thread(worker.stop) for worker in workers])
+                logger.error(f"{len(failures)} of {len(workers)} office converter workers failed to start")
+                raise failures[0]
+            cls._workers = workers
+            cls._idle = asyncio.Queue()
+            for worker in workers:
+                cls._idle.put_nowait(worker)
+
+    @classmethod
+    async def convert_to_pdf(cls, file_bytes: bytes) -> bytes:
+        if not cls.is_enabled():
+            raise RuntimeError("PDF conversion is not enabled")
+        await cls.start()
+
+        worker = await cls._idle.get()
+        try:
+            if worker.needs_recycle:
+                await asyncio.to_thread(worker.restart)
+            started = time.perf_counter()
+            pdf_bytes = await asyncio.wait_for(
+                asyncio.to_thread(worker.convert, file_bytes),
+                timeout=env.OFFICE_CONVERTER_TIMEOUT_SECONDS
+            )
+            logger.info(f"Converted document to PDF on worker {worker.index} in {int((time.perf_counter() - started) * 1000)}ms")
+            return pdf_bytes
+        except Exception as e:
+            reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.error(f"PDF conversion failed on worker {worker.index} ({reason}), recycling worker")
+            # Killing the process also unblocks a conversion thread stuck on it
+            await asyncio.to_thread(worker.stop)
+            raise
+        finally:
+            cls._idle.put_nowait(worker)
+
+    @classmethod
+    def shutdown(cls):
+        for worker in cls._workers:
+            worker.stop()
+        cls._workers = []
+        cls._idle = None
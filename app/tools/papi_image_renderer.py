@@ -0,0 +1,182 @@
+import io
+import base64
+import logging
+from typing import List, Dict, Tuple
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from app.tools.process_pool import ProcessPool
+
+logger = logging.getLogger(__name__)
+
+FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+# name -> (path, size)
+FONT_SPECS = {
+    "title": (FONT_BOLD, 36),
+    "header": (FONT_BOLD, 24),
+    "sub": (FONT_REGULAR, 20),
+    "text": (FONT_REGULAR, 18),
+}
+
+WIDTH = 800
+MARGIN = 50
+INDENT = 20
+LINE_HEIGHT = 25
+PARAGRAPH_GAP = 10
+SECTION_GAP = 30
+
+TEXT_COLOR = (0, 0, 0)
+BG_COLOR = (255, 255, 255)
+STRENGTH_COLOR = (0, 100, 0)
+WEAKNESS_COLOR = (139, 0, 0)
+
+# Palette: COVERAGE_LEVELS anti-aliasing steps from the background to each color
+PALETTE_COLORS = [TEXT_COLOR, STRENGTH_COLOR, WEAKNESS_COLOR]
+COVERAGE_LEVELS = 16
+COVERAGE_SHIFT = 4  # 256 coverage values -> 16 levels
+PALETTE = [
+    round(bg + (fg - bg) * level / (COVERAGE_LEVELS - 1))
+    for color in PALETTE_COLORS
+    for level in range(COVERAGE_LEVELS)
+    for bg, fg in zip(BG_COLOR, color)
+]
+
+MAX_CACHED_WIDTHS = 50000
+
+# format -> (PIL format, mime type, save options)
+FORMATS = {
+    "png": ("PNG", "image/png", {"compress_level": 6}),
+    # Lossless: text on a flat background compresses far better than lossy WebP
+    "webp": ("WEBP", "image/webp", {"lossless": True, "method": 2}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 90, "subsampling": 0}),
+}
+
+class PapiImageRenderer:
+    """
+    PAPI summary image: fonts are loaded once per process, text is wrapped by
+    pixel width (word widths cached) and laid out first, so the canvas is allocated
+    at its exact height.
+    CPU-bound; `render_async` runs it in the shared process pool.
+    """
+    _fonts: Dict[str, ImageFont.FreeTypeFont] = {}
+    _widths: Dict[tuple, float] = {}
+
+    @classmethod
+    def fonts(cls) -> Dict[str, ImageFont.FreeTypeFont]:
+        if not cls._fonts:
+            for name, (path, size) in FONT_SPECS.items():
+                try:
+                    cls._fonts[name] = ImageFont.truetype(path, size)
+                except IOError:
+                    logger.warning(f"Font {path} not found, using Pillow's default font")
+                    cls._fonts[name] = ImageFont.load_default(size)
+        return cls._fonts
+
+    @classmethod
+    def text_width(cls, text: str, font) -> float:
+        # Words repeat heavily across summaries; measure each once per process
+        key = (id(font), text)
+        width = cls._widths.get(key)
+        if width is None:
+            if len(cls._widths) > MAX_CACHED_WIDTHS:
+                cls._widths.clear()
+            width = cls._widths[key] = font.getlength(text)
+        return width
+
+    @classmethod
+    def wrap(cls, text: str, font, max_width: float, prefix: str = "") -> List[str]:
+        """Greedy word wrap by rendered width; `prefix` (the bullet) is part of the first line."""
+        space = cls.text_width(" ", font)
+        lines, words = [], []
+        width = cls.text_width(prefix, font) if prefix else 0.0
+        for word in text.split():
+            word_width = cls.text_width(word, font)
+            if words and width + space + word_width > max_width:
+                lines.append(" ".join(words))
+                words, width = [], 0.0
+            # A single word wider than the line is split by characters
+            while not words and width + word_width > max_width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and width + font.getlength(word[:cut]) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word, width = word[cut:], 0.0
+                word_width = cls.text_width(word, font)
+            width += (space if words else 0.0) + word_width
+            words.append(word)
+        if words:
+            lines.append(" ".join(words))
+        if prefix and lines:
+            lines[0] = prefix + lines[0]
+        return lines
+
+    @classmethod
+    def layout(cls, name: str, email: str, strengths: List[str], weaknesses: List[str]) -> Tuple[List[tuple], int]:
+        """Returns the draw operations ((x, y), text, font name, color) and the canvas height."""
+        fonts = cls.fonts()
+        max_width = WIDTH - MARGIN - INDENT - MARGIN
+        ops = []
+        y = MARGIN
+        ops.append(((MARGIN, y), "PAPI Kostick Summary", "title", TEXT_COLOR))
+        y += 60
+        ops.append(((MARGIN, y), f"Candidate: {name}", "header", TEXT_COLOR))
+        y += 40
+        ops.append(((MARGIN, y), f"Email: {email}", "sub", TEXT_COLOR))
+        y += 80
+
+        for index, (title, color, points) in enumerate((
+            ("Strengths", STRENGTH_COLOR, strengths),
+            ("Weaknesses", WEAKNESS_COLOR, weaknesses),
+        )):
+            if index:
+                y += SECTION_GAP
+            ops.append(((MARGIN, y), title, "header", color))
+            y += 40
+            for point in points:
+                for line in cls.wrap(point, fonts["text"], max_width, prefix="• "):
+                    ops.append(((MARGIN + INDENT, y), line, "text", TEXT_COLOR))
+                    y += LINE_HEIGHT
+                y += PARAGRAPH_GAP
+        return ops, y + MARGIN
+
+    @classmethod
+    def render(cls, name: str, email: str, strengths: List[str], weaknesses: List[str], image_format: str = "png") -> bytes:
+        pil_format, _, options = FORMATS[image_format]
+        fonts = cls.fonts()
+        ops, height = cls.layout(name, email, strengths, weaknesses)
+
+        # Text is rasterized once as grayscale coverage; a second tiny map says which
+        # color each line uses. Together they index a fixed palette, which PNG encodes
+        # much faster and smaller than the equivalent RGB image.
+        coverage = Image.new("L", (WIDTH, height), 0)
+        draw = ImageDraw.Draw(coverage)
+        color_map = Image.new("L", (WIDTH, height), 0)
+        color_draw = ImageDraw.Draw(color_map)
+        for position, text, font, color in ops:
+            draw.text(position, text, font=fonts[font], fill=255)
+            if color != TEXT_COLOR:
+                color_draw.rectangle(draw.textbbox(position, text, font=fonts[font]), fill=PALETTE_COLORS.index(color))
+
+        indices = np.asarray(color_map) * COVERAGE_LEVELS + (np.asarray(coverage) >> COVERAGE_SHIFT)
+        img = Image.fromarray(indices.astype(np.uint8), "P")
+        img.putpalette(PALETTE)
+        if pil_format != "PNG":
+            img = img.convert("RGB")
+
+        output = io.BytesIO()
+        img.save(output, format=pil_format, **options)
+        return output.getvalue()
+
+    @classmethod
+    def render_base64(cls, name: str, email: str, strengths: List[str], weaknesses: List[str], image_format: str = "png") -> str:
+        return base64.b64encode(cls.render(name, email, strengths, weaknesses, image_format)).decode()
+
+    @classmethod
+    async def render_async(cls, name: str, email: str, strengths: List[str], weaknesses: List[str], image_format: str = "png") -> str:
+        """Base64 image rendered in the process pool."""
+        return await ProcessPool.run(cls.render_base64, name, email, strengths, weaknesses, image_format)
+
+    @staticmethod
+    def mime_type(image_format: str) -> str:
+        return FORMATS[image_format][1]
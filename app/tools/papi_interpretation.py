@@ -0,0 +1,215 @@
+import sys
+import logging
+from typing import Dict, List, Tuple, Union, Optional
+import numpy as np
+from app.tools.papi_scorer import FACTORS
+
+logger = logging.getLogger(__name__)
+
+MAX_SCORE = 9
+NO_INTERPRETATION = "No interpretation available."
+OUT_OF_RANGE = "Score out of range."
+
+# factor -> {(low, high) score band: interpretation}
+INTERPRETATION_RULES: Dict[str, Dict[tuple, str]] = {
+    'A': {
+        (0, 4): "Tidak kompetitif, mapan, puas. Tidak terdorong untuk menghasilkan prestasi.",
+        (5, 7): "Tahu akan tujuan yang ingin dicapainya dan dapat merumuskannya.",
+        (8, 9): "Sangat berambisi utk berprestasi dan menjadi yg terbaik, menyukai tantangan."
+    },
+    'N': {
+        (0, 2): "Tidak terlalu merasa perlu untuk menuntaskan sendiri tugas-tugasnya, senang.",
+        (3, 5): "Cukup memiliki komitmen untuk menuntaskan tugas, akan tetapi.",
+        (6, 7): "Komitmen tinggi, lebih suka menangani pekerjaan satu demi satu.",
+        (8, 9): "Memiliki komitmen yg sangat tinggi thd tugas, sangat ingin menyelesaikan."
+    },
+    'G': {
+        (0, 2): "Santai, kerja adalah sesuatu yang menyenangkan-bukan beban yg mem-.",
+        (3, 4): "Bekerja keras sesuai tuntutan, menyalurkan usahanya untuk hal-hal.",
+        (5, 7): "Bekerja keras, tetapi jelas tujuan yg ingin dicapainya.",
+        (8, 9): "Ingin tampil sbg pekerja keras, sangat suka bila orang lain meman-."
+    },
+    'C': {
+        (0, 2): "Lebih mementingkan fleksibilitas daripada struktur, pendekatan.",
+        (3, 4): "Fleksibel tapi masih cukup memperhatikan keteraturan atau sistematika.",
+        (5, 6): "Memperhatikan keteraturan dan sistematika kerja, tapi cukup.",
+        (7, 9): "Sistematis, bermetoda, berstruktur, rapi dan teratur, dapat menata."
+    },
+    'D': {
+        (0, 1): "Melihat pekerjaan scr makro, membedakan hal penting dari yg kurang penting.",
+        (2, 3): "Cukup peduli akan akurasi dan kelengkapan data.",
+        (4, 6): "Tertarik untuk menangani sendiri detail.",
+        (7, 9): "Sangat menyukai detail, sangat peduli akan akurasi dan keleng-."
+    },
+    'R': {
+        (0, 3): "Tipe pelaksana, praktis - pragmatis, mengandalkan pengalaman.",
+        (4, 5): "Pertimbangan mencakup aspek teoritis ( konsep atau pemikiran ).",
+        (6, 7): "Suka memikirkan suatu problem secara mendalam, merujuk pada.",
+        (8, 9): "Tipe pemikir, sangat berminat pada gagasan, konsep, teori, menca-."
+    },
+    'T': {
+        (0, 3): "Santai. Kurang peduli akan waktu, kurang memiliki rasa urgensi.",
+        (4, 6): "Cukup aktif dalam segi mental, dapat menyesuaikan tempo kerjanya.",
+        (7, 9): "Cekatan, selalu siaga, bekerja cepat, ingin segera menyelesaikan."
+    },
+    'V': {
+        (0, 2): "Cocok untuk pekerjaan ' di belakang meja '. Cenderung lamban.",
+        (3, 6): "Dapat bekerja di belakang meja dan senang jika sesekali harus.",
+        (7, 9): "Menyukai aktifitas fisik ( a.l. : olah raga), enerjik, memiliki stamina."
+    },
+    'W': {
+        (0, 3): "Hanya butuh gambaran ttg kerangka tugas scr garis besar, berpatokan pd.",
+        (4, 5): "Perlu pengarahan awal dan tolok ukur keberhasilan.",
+        (6, 7): "Membutuhkan uraian rinci mengenai tugas, dan batasan tanggung.",
+        (8, 9): "Patuh pada kebijaksanaan, peraturan dan struktur organisasi."
+    },
+    'F': {
+        (0, 3): "Otonom, dapat bekerja sendiri tanpa campur tangan orang lain.",
+        (4, 6): "Loyal pada Perusahaan.",
+        (7, 7): "Loyal pada pribadi atasan.",
+        (8, 9): "Loyal, berusaha dekat dg pribadi atasan, ingin menyenangkan."
+    },
+    'L': {
+        (0, 1): "Puas dengan peran sebagai bawahan, memberikan kesempatan.",
+        (2, 3): "Tidak percaya diri dan tidak ingin memimpin atau mengawasi.",
+        (4, 4): "Kurang percaya diri dan kurang berminat utk menjadi pemimpin.",
+        (5, 5): "Cukup percaya diri, tidak secara aktif mencari posisi kepemimpinan.",
+        (6, 7): "Percaya diri dan ingin berperan sebagai pemimpin.",
+        (8, 9): "Sangat percaya diri utk berperan sbg atasan & sangat mengharapkan."
+    },
+    'P': {
+        (0, 1): "Permisif, akan memberikan kesempatan pada orang lain untuk.",
+        (2, 3): "Enggan mengontrol org lain & tidak mau mempertanggung jawabkan.",
+        (4, 4): "Cenderung enggan melakukan fungsi pengarahan, pengendalian.",
+        (5, 5): "Bertanggung jawab, akan melakukan fungsi pengarahan, pengendalian.",
+        (6, 7): "Dominan dan bertanggung jawab, akan melakukan fungsi pengarahan.",
+        (8, 9): "Sangat dominan, sangat mempengaruhi & mengawasi org lain, bertanggung."
+    },
+    'I': {
+        (0, 1): "Sangat berhati - hati, memikirkan langkah- langkahnya secara ber-.",
+        (2, 3): "Enggan mengambil keputusan.",
+        (4, 5): "Berhati - hati dlm pengambilan keputusan.",
+        (6, 7): "Cukup percaya diri dlm pengambilan keputusan, mau mengambil.",
+        (8, 9): "Sangat yakin dl mengambil keputusan, cepat tanggap thd situasi, berani."
+    },
+    'S': {
+        (0, 2): "Dpt. bekerja sendiri, tdk membutuhkan kehadiran org lain. Menarik.",
+        (3, 4): "Kurang percaya diri & kurang aktif dlm menjalin hubungan sosial.",
+        (5, 9): "Percaya diri & sangat senang bergaul, menyukai interaksi sosial, bisa men-."
+    },
+    'B': {
+        (0, 2): "Mandiri ( dari segi emosi ) , tdk mudah dipengaruhi oleh tekanan.",
+        (3, 5): "Selektif dlm bergabung dg kelompok, hanya mau berhubungan dg.",
+        (6, 9): "Suka bergabung dlm kelompok, sadar akan sikap & kebutuhan ke-."
+    },
+    'O': {
+        (0, 2): "Menjaga jarak, lebih memperhatikan hal - hal kedinasan, tdk mudah.",
+        (3, 5): "Tidak mencari atau menghindari hubungan antar pribadi di.",
+        (6, 9): "Peka akan kebutuhan org lain, sangat memikirkan hal - hal yg dibutuhkan."
+    },
+    'X': {
+        (0, 1): "Sederhana, rendah hati, tulus, tidak sombong dan tidak suka menam-.",
+        (2, 3): "Sederhana, cenderung diam, cenderung pemalu, tidak suka menon-.",
+        (4, 5): "Mengharapkan pengakuan lingkungan dan tidak mau diabaikan.",
+        (6, 9): "Bangga akan diri dan gayanya sendiri, senang menjadi pusat perha-."
+    },
+    'E': {
+        (0, 1): "Sangat terbuka, terus terang, mudah terbaca (dari air muka, tindakan.",
+        (2, 3): "Terbuka, mudah mengungkap pendapat atau perasaannya menge-.",
+        (4, 6): "Mampu mengungkap atau menyimpan perasaan, dapat mengen-.",
+        (7, 9): "Mampu menyimpan pendapat atau perasaannya, tenang, dapat."
+    },
+    'K': {
+        (0, 1): "Sabar, tidak menyukai konflik. Mengelak atau menghindar dari konflik.",
+        (2, 3): "Lebih suka menghindari konflik, akan mencari rasionalisasi untuk.",
+        (4, 5): "Tidak mencari atau menghindari konflik, mau mendengarkan pan-.",
+        (6, 7): "Akan menghadapi konflik, mengungkapkan serta memaksakan pan-.",
+        (8, 9): "Terbuka, jujur, terus terang, asertif, agresif, reaktif, mudah tersinggung."
+    },
+    'Z': {
+        (0, 1): "Mudah beradaptasi dg pekerjaan rutin tanpa merasa bosan, tidak mem-.",
+        (2, 3): "Enggan berubah, tidak siap untuk beradaptasi, hanya mau menerima.",
+        (4, 5): "Mudah beradaptasi, cukup menyukai perubahan.",
+        (6, 7): "Antusias terhadap perubahan dan akan mencari hal-hal baru, tetapi.",
+        (8, 9): "Sangat menyukai perubahan, gagasan baru/variasi, aktif mencari per-."
+    }
+}
+
+def _compile_tables() -> Tuple[np.ndarray, np.ndarray, List[List[tuple]]]:
+    # Dense FACTORS x (0..MAX_SCORE) tables of interpretation text and band index;
+    # fails at import if a band is missing or overlaps
+    table = np.empty((len(FACTORS), MAX_SCORE + 1), dtype=object)
+    bands = np.full((len(FACTORS), MAX_SCORE + 1), -1, dtype=np.int8)
+    ranges = []
+    for row, factor in enumerate(FACTORS):
+        rule = INTERPRETATION_RULES.get(factor)
+        if rule is None:
+            raise ValueError(f"PAPI interpretation rules missing factor {factor}")
+        ranges.append(sorted(rule))
+        for band, (low, high) in enumerate(ranges[-1]):
+            for score in range(low, high + 1):
+                if table[row, score] is not None:
+                    raise ValueError(f"PAPI interpretation bands overlap for {factor} at score {score}")
+                table[row, score] = sys.intern(rule[(low, high)])
+                bands[row, score] = band
+        missing = [score for score in range(MAX_SCORE + 1) if table[row, score] is None]
+        if missing:
+            raise ValueError(f"PAPI interpretation rules for {factor} do not cover scores {missing}")
+    return table, bands, ranges
+
+class PapiInterpretation:
+    """
+    PAPI interpretation rules compiled once at import into a dense factor x score
+    lookup table (rows in FACTORS order), so a lookup is one index per factor and a
+    whole batch of score rows is one fancy-indexing call.
+
+    BANDS holds the band index of every (factor, score); the 20 band indices of a
+    candidate form its `signature`, which fully determines the interpretations.
+    """
+    TABLE, BANDS, BAND_RANGES = _compile_tables()
+    FACTOR_INDEX = {factor: row for row, factor in enumerate(FACTORS)}
+
+    @staticmethod
+    def lookup(scores: Dict[str, int]) -> Dict[str, str]:
+        interprets = {}
+        for factor, score in scores.items():
+            row = PapiInterpretation.FACTOR_INDEX.get(factor)
+            if row is None:
+                interprets[factor] = NO_INTERPRETATION
+            elif 0 <= score <= MAX_SCORE:
+                interprets[factor] = PapiInterpretation.TABLE[row, score]
+            else:
+                interprets[factor] = OUT_OF_RANGE
+        return interprets
+
+    @staticmethod
+    def lookup_matrix(scores: Union[np.ndarray, list]) -> np.ndarray:
+        """N x 20 scores (FACTORS order, as from PapiScorer.score_matrix) -> N x 20 interpretations."""
+        scores = np.asarray(scores, dtype=np.int64)
+        in_range = (scores >= 0) & (scores <= MAX_SCORE)
+        columns = np.arange(len(FACTORS))
+        texts = PapiInterpretation.TABLE[columns, np.clip(scores, 0, MAX_SCORE)]
+        texts[~in_range] = OUT_OF_RANGE
+        return texts
+
+    @staticmethod
+    def to_dicts(texts: np.ndarray) -> list:
+        return [dict(zip(FACTORS, row)) for row in texts.tolist()]
+
+    @staticmethod
+    def signature(scores: Dict[str, int]) -> Optional[str]:
+        """20 band digits in FACTORS order, e.g. "21302..."; None if a factor is missing or out of range."""
+        digits = []
+        for row, factor in enumerate(FACTORS):
+            score = scores.get(factor)
+            if score is None or not 0 <= score <= MAX_SCORE:
+                return None
+            digits.append(str(PapiInterpretation.BANDS[row, score]))
+        return "".join(digits)
+
+    @staticmethod
+    def band_range(factor: str, score: int) -> Optional[tuple]:
+        row = PapiInterpretation.FACTOR_INDEX.get(factor)
+        if row is None or not 0 <= score <= MAX_SCORE:
+            return None
+        return PapiInterpretation.BAND_RANGES[row][PapiInterpretation.BANDS[row, score]]
@@ -0,0 +1,223 @@
+import re
+import logging
+from typing import Dict, List, Tuple
+from app.tools.papi_scorer import FACTORS
+from app.tools.papi_interpretation import PapiInterpretation, INTERPRETATION_RULES, MAX_SCORE
+
+logger = logging.getLogger(__name__)
+
+# The five themed paragraphs of the summary prompt, in order
+THEMES = [
+    ("Work Style & Achievement", ["N", "A", "G", "C", "D"]),
+    ("Thinking & Work Method", ["R", "T", "V", "W", "F"]),
+    ("Leadership & Decision", ["L", "P", "I"]),
+    ("Social Relations", ["S", "B", "O", "X"]),
+    ("Emotional & Adaptability", ["E", "K", "Z"]),
+]
+
+STRENGTH, WEAKNESS = 1, -1
+S, W = STRENGTH, WEAKNESS
+
+# factor -> polarity of each interpretation band (bands in ascending score order)
+BAND_POLARITY: Dict[str, List[int]] = {
+    "A": [W, S, S],
+    "N": [W, S, S, S],
+    "G": [W, S, S, S],
+    "C": [W, S, S, S],
+    "D": [S, S, S, W],
+    "R": [S, S, S, W],
+    "T": [W, S, S],
+    "V": [W, S, S],
+    "W": [S, S, W, W],
+    "F": [W, S, S, S],
+    "L": [W, W, W, S, S, S],
+    "P": [W, W, W, S, S, S],
+    "I": [W, W, S, S, S],
+    "S": [W, W, S],
+    "B": [S, W, S],
+    "O": [W, S, S],
+    "X": [S, W, S, W],
+    "E": [W, S, S, S],
+    "K": [W, W, S, S, W],
+    "Z": [S, W, S, S, W],
+}
+
+# factor -> one complete sentence per interpretation band (bands in ascending score
+# order). The interpretation texts are clipped mid-clause ("..., akan tetapi.",
+# "... keleng-."), so the narrative uses these completed versions instead.
+BAND_SENTENCES: Dict[str, List[str]] = {
+    "A": [
+        "Tidak kompetitif, mapan, puas. Tidak terdorong untuk menghasilkan prestasi.",
+        "Tahu akan tujuan yang ingin dicapainya dan dapat merumuskannya.",
+        "Sangat berambisi untuk berprestasi dan menjadi yang terbaik, menyukai tantangan.",
+    ],
+    "N": [
+        "Tidak terlalu merasa perlu untuk menuntaskan sendiri tugas-tugasnya, senang menangani beberapa pekerjaan sekaligus.",
+        "Cukup memiliki komitmen untuk menuntaskan tugas, akan tetapi jika memungkinkan akan mendelegasikan sebagian tugasnya kepada orang lain.",
+        "Komitmen tinggi, lebih suka menangani pekerjaan satu demi satu.",
+        "Memiliki komitmen yang sangat tinggi terhadap tugas, sangat ingin menyelesaikan tugas dengan tuntas.",
+    ],
+    "G": [
+        "Santai, kerja adalah sesuatu yang menyenangkan, bukan beban yang membutuhkan usaha besar.",
+        "Bekerja keras sesuai tuntutan, menyalurkan usahanya untuk hal-hal yang bermanfaat.",
+        "Bekerja keras, tetapi jelas tujuan yang ingin dicapainya.",
+        "Ingin tampil sebagai pekerja keras, sangat suka bila orang lain memandangnya sebagai pekerja keras.",
+    ],
+    "C": [
+        "Lebih mementingkan fleksibilitas daripada struktur, pendekatan kerjanya spontan.",
+        "Fleksibel tapi masih cukup memperhatikan keteraturan atau sistematika kerja.",
+        "Memperhatikan keteraturan dan sistematika kerja, tapi cukup fleksibel.",
+        "Sistematis, bermetoda, berstruktur, rapi dan teratur, dapat menata tugas dengan baik.",
+    ],
+    "D": [
+        "Melihat pekerjaan secara makro, membedakan hal penting dari yang kurang penting.",
+        "Cukup peduli akan akurasi dan kelengkapan data.",
+        "Tertarik untuk menangani sendiri detail.",
+        "Sangat menyukai detail, sangat peduli akan akurasi dan kelengkapan data.",
+    ],
+    "R": [
+        "Tipe pelaksana, praktis dan pragmatis, mengandalkan pengalaman.",
+        "Pertimbangan mencakup aspek teoritis (konsep atau pemikiran).",
+        "Suka memikirkan suatu problem secara mendalam, merujuk pada teori dan konsep.",
+        "Tipe pemikir, sangat berminat pada gagasan, konsep dan teori, mencari alternatif baru.",
+    ],
+    "T": [
+        "Santai. Kurang peduli akan waktu, kurang memiliki rasa urgensi.",
+        "Cukup aktif dalam segi mental, dapat menyesuaikan tempo kerjanya.",
+        "Cekatan, selalu siaga, bekerja cepat, ingin segera menyelesaikan tugas.",
+    ],
+    "V": [
+        "Cocok untuk pekerjaan di belakang meja. Cenderung lamban.",
+        "Dapat bekerja di belakang meja dan senang jika sesekali harus terjun ke lapangan.",
+        "Menyukai aktivitas fisik (antara lain olahraga), enerjik, memiliki stamina yang tinggi.",
+    ],
+    "W": [
+        "Hanya butuh gambaran tentang kerangka tugas secara garis besar, berpatokan pada tujuan yang ingin dicapai.",
+        "Perlu pengarahan awal dan tolok ukur keberhasilan.",
+        "Membutuhkan uraian rinci mengenai tugas dan batasan tanggung jawab.",
+        "Patuh pada kebijaksanaan, peraturan dan struktur organisasi.",
+    ],
+    "F": [
+        "Otonom, dapat bekerja sendiri tanpa campur tangan orang lain.",
+        "Loyal pada perusahaan.",
+        "Loyal pada pribadi atasan.",
+        "Loyal, berusaha dekat dengan pribadi atasan, ingin menyenangkan atasan.",
+    ],
+    "L": [
+        "Puas dengan peran sebagai bawahan, memberikan kesempatan pada orang lain untuk memimpin.",
+        "Tidak percaya diri dan tidak ingin memimpin atau mengawasi orang lain.",
+        "Kurang percaya diri dan kurang berminat untuk menjadi pemimpin.",
+        "Cukup percaya diri, tidak secara aktif mencari posisi kepemimpinan.",
+        "Percaya diri dan ingin berperan sebagai pemimpin.",
+        "Sangat percaya diri untuk berperan sebagai atasan dan sangat mengharapkan posisi kepemimpinan.",
+    ],
+    "P": [
+        "Permisif, akan memberikan kesempatan pada orang lain untuk memimpin.",
+        "Enggan mengontrol orang lain dan tidak mau mempertanggungjawabkan hasil kerja bawahan.",
+        "Cenderung enggan melakukan fungsi pengarahan dan pengendalian.",
+        "Bertanggung jawab, akan melakukan fungsi pengarahan dan pengendalian.",
+        "Dominan dan bertanggung jawab, akan melakukan fungsi pengarahan.",
+        "Sangat dominan, sangat mempengaruhi dan mengawasi orang lain, bertanggung jawab atas hasil kerja bawahan.",
+    ],
+    "I": [
+        "Sangat berhati-hati, memikirkan langkah-langkahnya secara bersungguh-sungguh.",
+        "Enggan mengambil keputusan.",
+        "Berhati-hati dalam pengambilan keputusan.",
+        "Cukup percaya diri dalam pengambilan keputusan, mau mengambil risiko.",
+        "Sangat yakin dalam mengambil keputusan, cepat tanggap terhadap situasi, berani mengambil risiko.",
+    ],
+    "S": [
+        "Dapat bekerja sendiri, tidak membutuhkan kehadiran orang lain. Cenderung menarik diri dari pergaulan.",
+        "Kurang percaya diri dan kurang aktif dalam menjalin hubungan sosial.",
+        "Percaya diri dan sangat senang bergaul, menyukai interaksi sosial, bisa menciptakan suasana yang menyenangkan.",
+    ],
+    "B": [
+        "Mandiri (dari segi emosi), tidak mudah dipengaruhi oleh tekanan kelompok.",
+        "Selektif dalam bergabung dengan kelompok, hanya mau berhubungan dengan orang-orang tertentu.",
+        "Suka bergabung dalam kelompok, sadar akan sikap dan kebutuhan kelompok.",
+    ],
+    "O": [
+        "Menjaga jarak, lebih memperhatikan hal-hal kedinasan, tidak mudah menjalin hubungan pribadi.",
+        "Tidak mencari atau menghindari hubungan antarpribadi di lingkungan kerja.",
+        "Peka akan kebutuhan orang lain, sangat memikirkan hal-hal yang dibutuhkan orang lain.",
+    ],
+    "X": [
+        "Sederhana, rendah hati, tulus, tidak sombong dan tidak suka menampilkan diri.",
+        "Sederhana, cenderung diam, cenderung pemalu, tidak suka menonjolkan diri.",
+        "Mengharapkan pengakuan lingkungan dan tidak mau diabaikan.",
+        "Bangga akan diri dan gayanya sendiri, senang menjadi pusat perhatian.",
+    ],
+    "E": [
+        "Sangat terbuka, terus terang, mudah terbaca dari air muka, tindakan dan perkataannya.",
+        "Terbuka, mudah mengungkapkan pendapat atau perasaannya mengenai suatu hal.",
+        "Mampu mengungkapkan atau menyimpan perasaan, dapat mengendalikan emosi.",
+        "Mampu menyimpan pendapat atau perasaannya, tenang, dapat mengendalikan emosi.",
+    ],
+    "K": [
+        "Sabar, tidak menyukai konflik. Mengelak atau menghindar dari konflik.",
+        "Lebih suka menghindari konflik, akan mencari rasionalisasi untuk dapat menerima situasi.",
+        "Tidak mencari atau menghindari konflik, mau mendengarkan pandangan orang lain.",
+        "Akan menghadapi konflik, mengungkapkan serta memaksakan pandangannya.",
+        "Terbuka, jujur, terus terang, asertif, agresif, reaktif, mudah tersinggung.",
+    ],
+    "Z": [
+        "Mudah beradaptasi dengan pekerjaan rutin tanpa merasa bosan, tidak membutuhkan variasi.",
+        "Enggan berubah, tidak siap untuk beradaptasi, hanya mau menerima perubahan yang sudah jelas.",
+        "Mudah beradaptasi, cukup menyukai perubahan.",
+        "Antusias terhadap perubahan dan akan mencari hal-hal baru, tetapi tetap selektif.",
+        "Sangat menyukai perubahan, gagasan baru atau variasi, aktif mencari perubahan.",
+    ],
+}
+
+# A sentence must not end on a connective, preposition, comma or clipped word
+DANGLING_ENDING = re.compile(
+    r"(,|-|\b(akan tetapi|tetapi|tapi|namun|dan|serta|atau|yang|yg|untuk|utk|pada|pd|dengan|dg|di|dapat|karena|sehingga|bila|jika))\.$",
+    re.IGNORECASE
+)
+
+NO_STRENGTHS = "Tidak ada kekuatan yang menonjol dari profil PAPI kandidat."
+NO_WEAKNESSES = "Tidak ada kelemahan yang menonjol dari profil PAPI kandidat."
+
+def _compile_sentences() -> List[List[Tuple[int, str]]]:
+    # FACTORS x (0..MAX_SCORE) -> (polarity, sentence); fails at import on a band
+    # count mismatch or an incomplete sentence
+    table = []
+    for factor in FACTORS:
+        polarity, sentences = BAND_POLARITY[factor], BAND_SENTENCES[factor]
+        bands = len(INTERPRETATION_RULES[factor])
+        if len(polarity) != bands or len(sentences) != bands:
+            raise ValueError(f"PAPI narrative polarity/sentences for {factor} do not match its {bands} bands")
+        for sentence in sentences:
+            if not sentence.endswith(".") or DANGLING_ENDING.search(sentence):
+                raise ValueError(f"PAPI narrative sentence for {factor} is incomplete: {sentence!r}")
+        row = PapiInterpretation.FACTOR_INDEX[factor]
+        table.append([
+            (polarity[PapiInterpretation.BANDS[row, score]], sentences[PapiInterpretation.BANDS[row, score]])
+            for score in range(MAX_SCORE + 1)
+        ])
+    return table
+
+class PapiNarrative:
+    """
+    Deterministic strengths/weaknesses composer, no LLM: every factor's band
+    sentence is sorted into strengths or weaknesses (BAND_POLARITY) and grouped
+    into the five themed paragraphs the summary prompt asks the LLM for.
+    """
+    SENTENCES = _compile_sentences()
+
+    @staticmethod
+    def compose(scores: Dict[str, int]) -> Tuple[List[str], List[str]]:
+        strengths, weaknesses = [], []
+        for _, factors in THEMES:
+            parts = {STRENGTH: [], WEAKNESS: []}
+            for factor in factors:
+                score = scores.get(factor)
+                if score is None or not 0 <= score <= MAX_SCORE:
+                    continue
+                polarity, sentence = PapiNarrative.SENTENCES[PapiInterpretation.FACTOR_INDEX[factor]][score]
+                parts[polarity].append(sentence)
+            if parts[STRENGTH]:
+                strengths.append(" ".join(parts[STRENGTH]))
+            if parts[WEAKNESS]:
+                weaknesses.append(" ".join(parts[WEAKNESS]))
+        return strengths or [NO_STRENGTHS], weaknesses or [NO_WEAKNESSES]
@@ -0,0 +1,90 @@
+import logging
+from typing import List, Dict, Union, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Factor order of the scoring sheet (and of every scores dict we return)
+FACTORS = ["G", "L", "I", "T", "V", "S", "R", "D", "C", "E", "N", "A", "P", "X", "B", "O", "Z", "K", "F", "W"]
+
+N_QUESTIONS = 90
+FIRST_ROW = 4  # Excel row B4 holds answers[0]
+
+def _rows(*rows: int, answer: int) -> List[tuple]:
+    return [(row, answer) for row in rows]
+
+# Scoring key: factor -> (excel row, answer that counts) cells, from the scoring sheet formulas
+G_ROWS = (4, 15, 26, 37, 48, 59, 70, 81, 92)
+L_CELLS = _rows(92, answer=1) + _rows(91, 80, 69, 58, 47, 36, 25, 14, answer=2)
+Z_ROWS = (5, 16, 27, 38, 49, 60, 71, 82, 93)
+
+SCORING_KEY: Dict[str, List[tuple]] = {
+    "G": _rows(*G_ROWS, answer=2),
+    "L": L_CELLS,
+    "I": _rows(81, 91, answer=1) + _rows(90, 79, 68, 57, 46, 35, 24, answer=2),
+    "T": _rows(70, 80, 90, answer=1) + _rows(89, 78, 67, 56, 45, 34, answer=2),
+    "V": _rows(59, 69, 79, 89, answer=1) + _rows(88, 77, 66, 55, 44, answer=2),
+    "S": _rows(48, 58, 68, 78, 88, answer=1) + _rows(87, 76, 65, 54, answer=2),
+    "R": _rows(37, 47, 57, 67, 77, 87, answer=1) + _rows(86, 75, 64, answer=2),
+    "D": _rows(13, 23, 33, 43, 53, 63, 73, 83, 93, answer=1),
+    "C": _rows(12, 22, 32, 42, 52, 62, 72, 82, answer=1) + _rows(13, answer=2),
+    "E": _rows(11, 21, 31, 41, 51, 61, 71, answer=1) + _rows(12, 23, answer=2),
+    "N": _rows(10, 20, 30, 40, 50, 60, answer=1) + _rows(11, 22, 33, answer=2),
+    "A": _rows(9, 19, 29, 39, 49, answer=1) + _rows(10, 21, 32, 43, answer=2),
+    "P": _rows(8, 18, 28, 38, answer=1) + _rows(9, 20, 31, 42, 53, answer=2),
+    "X": _rows(7, 17, 27, answer=1) + _rows(8, 19, 30, 41, 52, 63, answer=2),
+    "B": _rows(6, 16, answer=1) + _rows(7, 18, 29, 40, 51, 62, 73, answer=2),
+    "O": _rows(5, answer=1) + _rows(6, 17, 28, 39, 50, 61, 72, 83, answer=2),
+    "Z": _rows(*Z_ROWS, answer=2),
+    # Opposite answers on the G diagonal
+    "K": _rows(*G_ROWS, answer=1),
+    # Opposite answers on the L cells (F = 9 - L for 1/2 answers)
+    "F": [(row, 3 - answer) for row, answer in L_CELLS],
+    # Opposite answers on the Z diagonal
+    "W": _rows(*Z_ROWS, answer=1),
+}
+
+def _compile_weights() -> np.ndarray:
+    # (question, answer 1|2) one-hot position -> factor
+    weights = np.zeros((N_QUESTIONS * 2, len(FACTORS)), dtype=np.float32)
+    for column, factor in enumerate(FACTORS):
+        for row, answer in SCORING_KEY[factor]:
+            weights[(row - FIRST_ROW) * 2 + (answer - 1), column] = 1
+    return weights
+
+class PapiScorer:
+    """
+    PAPI Kostick scoring as one matrix product: answers are one-hot encoded into
+    N x 180 (question x answer) and multiplied by the 180 x 20 weight matrix compiled
+    once from SCORING_KEY. Accepts a single 90-answer vector or an N x 90 batch.
+    """
+    WEIGHTS = _compile_weights()
+
+    @staticmethod
+    def validate(answers: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+        matrix = np.asarray(answers)
+        if matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        if matrix.ndim != 2 or matrix.shape[1] != N_QUESTIONS:
+            raise ValueError(f"Expected {N_QUESTIONS} answers per candidate, got shape {matrix.shape}")
+        if not np.isin(matrix, (1, 2)).all():
+            raise ValueError("All answers must be either 1 or 2")
+        return matrix
+
+    @staticmethod
+    def score_matrix(answers: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+        """Returns an N x 20 int array of scores (columns in FACTORS order)."""
+        matrix = PapiScorer.validate(answers)
+        one_hot = np.empty((matrix.shape[0], N_QUESTIONS, 2), dtype=np.float32)
+        one_hot[:, :, 0] = matrix == 1
+        one_hot[:, :, 1] = matrix == 2
+        return (one_hot.reshape(matrix.shape[0], -1) @ PapiScorer.WEIGHTS).astype(np.int64)
+
+    @staticmethod
+    def to_dicts(scores: np.ndarray) -> List[Dict[str, int]]:
+        return [dict(zip(FACTORS, row)) for row in scores.tolist()]
+
+    @staticmethod
+    def score(answers: Sequence[int]) -> Dict[str, int]:
+        """Scores one candidate; keys in FACTORS order."""
+        return PapiScorer.to_dicts(PapiScorer.score_matrix(answers))[0]
@@ -0,0 +1,121 @@
+import io
+import re
+import logging
+from typing import List, Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter, EmailStr, ValidationError
+from app.tools.papi_scorer import FACTORS, N_QUESTIONS
+
+logger = logging.getLogger(__name__)
+
+NAME_COLUMNS = ("candidate_name", "name", "nama", "nama kandidat")
+EMAIL_COLUMNS = ("email", "e-mail")
+ANSWERS_COLUMN = "answers"
+
+_email_adapter = TypeAdapter(EmailStr)
+
+class PapiSheet:
+    """
+    Reads PAPI answer sheets (CSV/XLSX) for bulk scoring and writes the results sheet.
+
+    Expected columns: candidate name (candidate_name / name / nama), email, and the
+    90 answers either as numbered columns ("1".."90", "Q1".."Q90", "answer_1", ...)
+    or as one "answers" column ("1,2,2,1,...").
+    """
+
+    @staticmethod
+    def read(file_bytes: bytes, filename: str) -> pd.DataFrame:
+        filename = (filename or "").lower()
+        # pandas needs xlrd for the legacy binary format, which is not a dependency
+        if filename.endswith(".xls"):
+            raise ValueError("Legacy .xls sheets are not supported, save the sheet as .xlsx or .csv")
+        if filename.endswith(".xlsx"):
+            df = pd.read_excel(io.BytesIO(file_bytes), dtype=object, engine="openpyxl")
+        else:
+            df = pd.read_csv(io.BytesIO(file_bytes), dtype=object, sep=None, engine="python")
+        df.columns = [str(column).strip().lower() for column in df.columns]
+        return df.dropna(how="all")
+
+    @staticmethod
+    def parse(file_bytes: bytes, filename: str) -> Tuple[List[Dict[str, Any]], np.ndarray, List[Dict[str, Any]]]:
+        """
+        Returns (candidates, answers, errors): `answers` is the N x 90 int matrix of
+        the valid rows, aligned with `candidates` ({"row", "candidate_name", "email"});
+        invalid rows are reported in `errors` ({"row", "error"}).
+        Raises ValueError when the sheet layout itself is unusable.
+        """
+        df = PapiSheet.read(file_bytes, filename)
+        name_column = next((c for c in NAME_COLUMNS if c in df.columns), None)
+        email_column = next((c for c in EMAIL_COLUMNS if c in df.columns), None)
+        if name_column is None or email_column is None:
+            raise ValueError("Sheet must have a candidate name column and an email column")
+
+        matrix = PapiSheet._answer_matrix(df)
+
+        # Vectorized answer validation for the whole sheet
+        answers_ok = np.isin(matrix, (1, 2)).all(axis=1)
+        names = df[name_column].fillna("").astype(str).str.strip().tolist()
+        emails = df[email_column].fillna("").astype(str).str.strip().tolist()
+
+        candidates, valid_rows, errors = [], [], []
+        # Spreadsheet row numbers: header is row 1
+        for position, (name, email, ok) in enumerate(zip(names, emails, answers_ok)):
+            row = int(df.index[position]) + 2
+            if not name:
+                errors.append({"row": row, "error": "Missing candidate name"})
+                continue
+            try:
+                email = _email_adapter.validate_python(email)
+            except ValidationError:
+                errors.append({"row": row, "candidate_name": name, "error": f"Invalid email: {email}"})
+                continue
+            if not ok:
+                errors.append({"row": row, "candidate_name": name, "error": f"All {N_QUESTIONS} answers must be either 1 or 2"})
+                continue
+            candidates.append({"row": row, "candidate_name": name, "email": email})
+            valid_rows.append(position)
+
+        return candidates, matrix[valid_rows].astype(np.int64), errors
+
+    @staticmethod
+    def _answer_matrix(df: pd.DataFrame) -> np.ndarray:
+        numbered = {}
+        for column in df.columns:
+            match = re.fullmatch(r"[a-z_ .#-]*?0*(\d+)", column)
+            if match and 1 <= int(match.group(1)) <= N_QUESTIONS:
+                numbered[int(match.group(1))] = column
+
+        if len(numbered) == N_QUESTIONS:
+            columns = [numbered[i] for i in range(1, N_QUESTIONS + 1)]
+            return df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+        if ANSWERS_COLUMN in df.columns:
+            matrix = np.zeros((len(df), N_QUESTIONS), dtype=float)
+            for position, value in enumerate(df[ANSWERS_COLUMN].fillna("").astype(str)):
+                digits = [int(d) for d in re.findall(r"\d+", value)]
+                if len(digits) == N_QUESTIONS:
+                    matrix[position] = digits
+            return matrix
+
+        raise ValueError(f"Sheet must have {N_QUESTIONS} numbered answer columns or an '{ANSWERS_COLUMN}' column")
+
+    @staticmethod
+    def write_results(results: List[Dict[str, Any]]) -> bytes:
+        """Results sheet (XLSX): one row per candidate, factor scores, summary and errors."""
+        rows = []
+        for result in sorted(results, key=lambda r: r["row"]):
+            scores = result.get("scores") or {}
+            rows.append({
+                "row": result["row"],
+                "candidate_name": result.get("candidate_name", ""),
+                "email": result.get("email", ""),
+                **{factor: scores.get(factor) for factor in FACTORS},
+                "strengths": "\n".join(result.get("strengths") or []),
+                "weaknesses": "\n".join(result.get("weaknesses") or []),
+                "summary_source": result.get("summary_source", ""),
+                "error": result.get("error", ""),
+            })
+        output = io.BytesIO()
+        pd.DataFrame(rows).to_excel(output, index=False, sheet_name="PAPI Results")
+        return output.getvalue()
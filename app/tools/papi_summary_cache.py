@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, List
+from config.setting import env
+from config.supabase import supabase_client
+from app.tools.papi_interpretation import PapiInterpretation
+from app.utils.AsyncUtils import run_blocking
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "papi_summary_cache.sqlite3"
+
+class PapiSummaryCache:
+    """
+    PAPI strengths/weaknesses keyed by the candidate's band signature (see
+    PapiInterpretation.signature): the LLM input depends only on the band of each
+    factor, and candidate pools repeat band combinations heavily.
+
+    Two tiers: an in-memory LRU (PAPI_SUMMARY_CACHE_MAX_ENTRIES) in front of a
+    sqlite file under LOCAL_DATA_DIR that survives restarts and is bounded to
+    PAPI_SUMMARY_CACHE_MAX_DISK_ENTRIES (least recently used rows are dropped).
+    The summaries are derived from bands only, no candidate data is stored.
+
+    Request handlers use `aget`/`aput`: memory hits are served inline, sqlite reads
+    and writes run on the blocking executor. `get`/`put` are for worker threads.
+    """
+    _instance = None
+
+    def __init__(self):
+        # key -> (strengths, weaknesses)
+        self._memory: "OrderedDict[str, Tuple[List[str], List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        try:
+            os.makedirs(env.LOCAL_DATA_DIR, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(env.LOCAL_DATA_DIR, DB_FILENAME), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, strengths TEXT NOT NULL, weaknesses TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)")
+            self._db.commit()
+        except Exception as e:
+            logger.error(f"PAPI summary cache is memory-only, sqlite unavailable: {str(e)}")
+            self._db = None
+
+    @classmethod
+    def get_instance(cls) -> "PapiSummaryCache":
+        if cls._instance is None:
+            cls._instance = PapiSummaryCache()
+        return cls._instance
+
+    def get(self, key: str) -> Optional[Tuple[List[str], List[str]]]:
+        if not env.PAPI_SUMMARY_CACHE_ENABLED:
+            return None
+        return self._memory_get(key) or self._load(key, self._disk_get(key))
+
+    async def aget(self, key: str) -> Optional[Tuple[List[str], List[str]]]:
+        if not env.PAPI_SUMMARY_CACHE_ENABLED:
+            return None
+        return self._memory_get(key) or self._load(key, await run_blocking(self._disk_get, key))
+
+    def put(self, key: str, strengths: List[str], weaknesses: List[str]):
+        if not env.PAPI_SUMMARY_CACHE_ENABLED:
+            return
+        summary = (list(strengths), list(weaknesses))
+        self._remember(key, summary)
+        self._disk_put(key, summary)
+
+    async def aput(self, key: str, strengths: List[str], weaknesses: List[str]):
+        if not env.PAPI_SUMMARY_CACHE_ENABLED:
+            return
+        summary = (list(strengths), list(weaknesses))
+        self._remember(key, summary)
+        await run_blocking(self._disk_put, key, summary)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+        if self._db is None:
+            return False
+        with self._db_lock:
+            try:
+                return self._db.execute("SELECT 1 FROM summaries WHERE key = ?", (key,)).fetchone() is not None
+            except Exception:
+                return False
+
+    def _memory_get(self, key: str) -> Optional[Tuple[List[str], List[str]]]:
+        with self._lock:
+            summary = self._memory.get(key)
+            if summary is None:
+                return None
+            self._memory.move_to_end(key)
+            return list(summary[0]), list(summary[1])
+
+    def _load(self, key: str, summary: Optional[Tuple[List[str], List[str]]]) -> Optional[Tuple[List[str], List[str]]]:
+        if summary is None:
+            return None
+        self._remember(key, summary)
+        return list(summary[0]), list(summary[1])
+
+    def _disk_get(self, key: str) -> Optional[Tuple[List[str], List[str]]]:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            try:
+                row = self._db.execute("SELECT strengths, weaknesses FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._db.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"PAPI summary cache read failed: {str(e)}")
+                return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def _disk_put(self, key: str, summary: Tuple[List[str], List[str]]):
+        if self._db is None:
+            return
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, strengths, weaknesses, last_used) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(summary[0], ensure_ascii=False), json.dumps(summary[1], ensure_ascii=False), time.time())
+                )
+                self._db.execute(
+                    "DELETE FROM summaries WHERE key IN ("
+                    "SELECT key FROM summaries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (env.PAPI_SUMMARY_CACHE_MAX_DISK_ENTRIES,)
+                )
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"PAPI summary cache write failed: {str(e)}")
+
+    def _remember(self, key: str, summary: Tuple[List[str], List[str]]):
+        with self._lock:
+            self._memory[key] = summary
+            self._memory.move_to_end(key)
+            while len(self._memory) > env.PAPI_SUMMARY_CACHE_MAX_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def prewarm(self, key_for_signature, limit: Optional[int] = None) -> int:
+        """
+        Seeds the cache from past single-candidate `papi_scoring` activity logs
+        (newest first). `key_for_signature` maps a band signature to the cache key
+        (PapiService adds its prompt version). Returns the number of summaries added.
+        """
+        limit = limit or env.PAPI_SUMMARY_CACHE_PREWARM_LIMIT
+        response = supabase_client.table("activity_logs") \
+            .select("result_json") \
+            .eq("tool_type", "papi_scoring") \
+            .order("created_at", desc=True) \
+            .limit(limit) \
+            .execute()
+
+        added = 0
+        for log in response.data or []:
+            result = log.get("result_json") or {}
+            strengths, weaknesses = result.get("strengths"), result.get("weaknesses")
+            signature = PapiInterpretation.signature(result.get("scores") or {})
+            if not signature or not isinstance(strengths, list) or not isinstance(weaknesses, list) or not strengths or not weaknesses:
+                continue
+            # Only LLM-written summaries are worth serving from the cache
+            if result.get("summary_source", "llm") != "llm":
+                continue
+            if any(item.startswith("Error generating") for item in strengths + weaknesses):
+                continue
+            key = key_for_signature(signature)
+            if key in self:
+                continue
+            self.put(key, strengths, weaknesses)
+            added += 1
+        logger.info(f"PAPI summary cache prewarmed with {added} signatures from {len(response.data or [])} logs")
+        return added
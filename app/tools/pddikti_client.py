@@ -0,0 +1,151 @@
+import re
+import time
+import queue
+import asyncio
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any
+from pddiktipy import api as pddikti_api
+from pddiktipy.exceptions import PDDIKTIError, APIConnectionError, APITimeoutError, APIRateLimitError, APIResponseError
+from config.setting import env
+
+logger = logging.getLogger(__name__)
+
+class PddiktiClient:
+    """
+    Long-lived PDDIKTI access shared by all requests:
+    - a pool of keep-alive `pddiktipy.api` clients (one HTTP session each),
+    - a TTL cache of `search_mahasiswa` results keyed by the normalized name,
+    - a dedicated thread pool of PDDIKTI_POOL_SIZE threads and a per-call timeout
+      (a timed-out call keeps its thread until it returns, so threads stay bounded),
+    - a circuit breaker so callers get "unavailable" fast while PDDIKTI is down/slow;
+      only transport failures (timeouts, connection errors, 429, 5xx) count.
+
+    `search_mahasiswa` returns None when PDDIKTI is unavailable (caller should fall
+    back to a manual check) and a list (possibly empty) otherwise.
+    """
+    _instance = None
+
+    def __init__(self):
+        self._idle = queue.LifoQueue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._failures = 0
+        self._open_until = 0.0
+
+    @classmethod
+    def get_instance(cls) -> "PddiktiClient":
+        if cls._instance is None:
+            cls._instance = PddiktiClient()
+        return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        if cls._instance is not None:
+            if cls._instance._executor is not None:
+                cls._instance._executor.shutdown(wait=False, cancel_futures=True)
+            cls._instance._close_all()
+            cls._instance = None
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        return re.sub(r"\s+", " ", re.sub(r"[^a-z\s]", " ", (name or "").lower())).strip()
+
+    @staticmethod
+    def is_transport_failure(error: Exception) -> bool:
+        """True when PDDIKTI itself is unreachable or overloaded, as opposed to a lookup it answered."""
+        if isinstance(error, (asyncio.TimeoutError, APITimeoutError, APIConnectionError, APIRateLimitError)):
+            return True
+        # No status: the request itself failed (requests.RequestException)
+        return isinstance(error, APIResponseError) and (error.status_code is None or error.status_code >= 500)
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    async def search_mahasiswa(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        key = self.normalize_name(name)
+        if not key:
+            return []
+
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        if self.is_open:
+            logger.warning("PDDIKTI circuit open, skipping lookup")
+            return None
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=env.PDDIKTI_POOL_SIZE, thread_name_prefix="pddikti")
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._search_blocking, key),
+                timeout=env.PDDIKTI_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                logger.warning(f"PDDIKTI lookup timed out after {env.PDDIKTI_TIMEOUT_SECONDS}s")
+            else:
+                logger.error(f"PDDIKTI lookup failed: {str(e)}")
+            if self.is_transport_failure(e):
+                self._record_failure()
+            return None
+
+        self._failures = 0
+        self._cache[key] = (time.monotonic() + env.PDDIKTI_CACHE_TTL_SECONDS, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > env.PDDIKTI_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+        return result
+
+    def _search_blocking(self, key: str) -> Optional[list]:
+        client = self._acquire()
+        healthy = False
+        try:
+            # Undecorated call: pddiktipy's handle_errors turns every error into None,
+            # including the 404 PDDIKTI answers for a name without hits
+            try:
+                result = pddikti_api.search_mahasiswa.__wrapped__(client, key)
+            except PDDIKTIError as e:
+                if self.is_transport_failure(e):
+                    raise
+                healthy = True
+                if e.status_code == 404:
+                    return []
+                raise
+            healthy = True
+            return result if result is not None else []
+        finally:
+            self._release(client, healthy)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return pddikti_api(base_url=env.PDDIKTI_API_URL)
+
+    def _release(self, client, healthy: bool):
+        # Broken sessions are dropped, the next call creates a fresh one
+        if healthy and self._idle.qsize() < env.PDDIKTI_POOL_SIZE:
+            self._idle.put(client)
+        else:
+            client.close()
+
+    def _record_failure(self):
+        self._failures += 1
+        if self._failures >= env.PDDIKTI_CIRCUIT_FAILURES:
+            self._open_until = time.monotonic() + env.PDDIKTI_CIRCUIT_RESET_SECONDS
+            self._failures = 0
+            logger.warning(f"PDDIKTI circuit opened for {env.PDDIKTI_CIRCUIT_RESET_SECONDS}s")
+
+    def _close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
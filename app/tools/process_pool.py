@@ -0,0 +1,37 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from config.setting import env
+
+logger = logging.getLogger(__name__)
+
+class ProcessPool:
+    """
+    Shared process pool for CPU-bound work (image/document processing),
+    so it never blocks the event loop nor competes for the GIL.
+    """
+    _executor = None
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            logger.info(f"Starting process pool with {env.PROCESS_POOL_WORKERS} workers...")
+            # spawn: forking a process that already runs threads (uvicorn, supabase) is unsafe
+            cls._executor = ProcessPoolExecutor(
+                max_workers=env.PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return cls._executor
+
+    @classmethod
+    async def run(cls, func, *args):
+        """Runs a picklable module-level callable in the pool and awaits its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_executor(), func, *args)
+
+    @classmethod
+    def shutdown(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -0,0 +1,89 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, List, Set, Optional
+from config.setting import env
+from app.tools.file_handler import FileHandler
+from app.utils.FileUtils import append_jsonl, take_jsonl
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FILENAME = "storage_orphans.jsonl"
+
+class StorageCleanup:
+    """
+    Background removal of a deleted log's storage files: one batch `remove` call
+    per log, retried with exponential backoff. Paths that still fail, or whose
+    cleanup is pending at shutdown, are appended to an orphan ledger (JSONL under
+    LOCAL_DATA_DIR) and retried by `retry_orphans` on the next start.
+    """
+    # log id -> paths still to remove
+    _pending: Dict[str, List[str]] = {}
+    _tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def ledger_path() -> str:
+        return os.path.join(env.LOCAL_DATA_DIR, LEDGER_FILENAME)
+
+    @classmethod
+    def schedule(cls, paths_by_log: Dict[str, List[str]]):
+        for log_id, paths in paths_by_log.items():
+            if not paths:
+                continue
+            cls._pending[log_id] = paths
+            task = asyncio.create_task(cls._remove(log_id, paths))
+            cls._tasks.add(task)
+            task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def _remove(cls, log_id: str, paths: List[str]):
+        error = None
+        for attempt in range(env.STORAGE_CLEANUP_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(env.STORAGE_CLEANUP_RETRY_SECONDS * 2 ** (attempt - 1))
+            try:
+                await FileHandler.delete_files(paths)
+                cls._pending.pop(log_id, None)
+                logger.info(f"Removed {len(paths)} files of log {log_id}")
+                return
+            except Exception as e:
+                error = str(e)
+                logger.warning(f"Storage cleanup of log {log_id} failed (attempt {attempt + 1}): {error}")
+        cls._pending.pop(log_id, None)
+        cls.record_orphans(log_id, paths, error)
+
+    @classmethod
+    def record_orphans(cls, log_id: str, paths: List[str], error: Optional[str] = None):
+        entry = {"log_id": log_id, "paths": paths, "error": error, "recorded_at": time.time()}
+        try:
+            append_jsonl(cls.ledger_path(), [entry])
+            logger.error(f"Recorded {len(paths)} orphaned files of log {log_id} in {cls.ledger_path()}")
+        except Exception as e:
+            logger.error(f"Could not record orphaned files {paths}: {str(e)}")
+
+    @classmethod
+    async def retry_orphans(cls) -> int:
+        """Retries every ledger entry once; entries that still fail stay in the ledger."""
+        # Taken under a node-wide file lock: other workers may be recording orphans right now
+        entries = take_jsonl(cls.ledger_path())
+
+        removed = 0
+        for entry in entries:
+            try:
+                await FileHandler.delete_files(entry["paths"])
+                removed += 1
+            except Exception as e:
+                cls.record_orphans(entry["log_id"], entry["paths"], str(e))
+        if entries:
+            logger.info(f"Orphan ledger: cleaned {removed} of {len(entries)} entries")
+        return removed
+
+    @classmethod
+    def shutdown(cls):
+        # Cleanups that did not finish are not lost, the next start retries them
+        for task in list(cls._tasks):
+            task.cancel()
+        for log_id, paths in list(cls._pending.items()):
+            cls.record_orphans(log_id, paths, "pending at shutdown")
+        cls._pending.clear()
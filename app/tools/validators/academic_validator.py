@@ -1,11 +1,13 @@
-import base64
-import asyncio
 from typing import Dict, Any
 
-from pddiktipy import api as pddikti_api
+from app.tools.pddikti_client import PddiktiClient
+from app.tools.academic_matcher import AcademicMatcher
 from core.BaseAgent import BaseAgent
+from app.tools.media_payload import MediaPayload
 from pydantic import BaseModel, Field
 
+PDDIKTI_WEB_URL = "https://pddikti.kemdiktisaintek.go.id/"
+
 class AcademicExtractionOutput(BaseModel):
     full_name: str = Field(..., description="Name extracted from the certificate.")
     university: str = Field(..., description="University name extracted.")
@@ -31,43 +33,40 @@ class AcademicValidator(BaseAgent):
             **kwargs
         )
 
-    async def __call__(self, file_bytes: bytes, mime_type: str = "application/pdf") -> Dict[str, Any]:
+    async def __call__(self, media: MediaPayload) -> Dict[str, Any]:
         # 1. Extract Data from Ijazah
-        base64_data = base64.b64encode(file_bytes).decode('utf-8')
-        message_content = [
-            {"type": "text", "text": "Extract details from this academic certificate."},
-            {
-                "type": "image_url", # Gemini via LangChain handles PDF as image_url often or media
-                "image_url": {"url": f"data:{mime_type};base64,{base64_data}"}
-            }
-        ]
+        media = await media.prepared("academic")
+        message_content = self.build_media_message("Extract details from this academic certificate.", media)
         
         raw, parsed = await self.arun_chain(input=message_content)
-        extracted = parsed.model_dump()
-        
-        # 2. Call PDDIKTI API
-        api_data = await self._search_pddikti(extracted["full_name"])
+        return await self.verify(parsed.model_dump())
+
+    async def verify(self, extracted: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Verifies extracted Ijazah data against PDDIKTI. Shared by the single-document
+        path above and the combined BgCheck extractor.
+        """
+        # 2. Call PDDIKTI API (cached, fails fast while PDDIKTI is down)
+        api_data = await PddiktiClient.get_instance().search_mahasiswa(extracted["full_name"])
+        if api_data is None:
+            return self._manual_check_result(extracted)
         
-        # 3. Compare (Simple logic for now, could use LLM for fuzzy match)
+        # 3. Rank all PDDIKTI hits by university + student name similarity
         is_valid = False
         reasoning = "PDDIKTI Data not found"
+        pddikti_status = "not_found"
         matched_record = None
+        match = AcademicMatcher.get_instance().best_match(extracted["full_name"], extracted["university"], api_data)
         
         if api_data:
-            # Check if university matches vaguely
-            uni_lower = extracted["university"].lower()
-            
-            # Find best match in api_data list
-            for record in api_data:
-                if record["nama_pt"].lower() in uni_lower or uni_lower in record["nama_pt"].lower():
-                    matched_record = record
-                    break
-            
-            if matched_record:
+            if match["is_match"]:
+                matched_record = match["record"]
                 is_valid = True
-                reasoning = f"Verified against PDDIKTI. NIM: {matched_record.get('nim')}, PT: {matched_record.get('nama_pt')}"
+                pddikti_status = "verified"
+                reasoning = f"Verified against PDDIKTI. NIM: {matched_record.get('nim')}, PT: {matched_record.get('nama_pt')} (confidence {match['confidence']})"
             else:
-                reasoning = f"Name found in PDDIKTI but University mismatch. Ijazah: {extracted['university']}"
+                pddikti_status = "mismatch"
+                reasoning = f"Name found in PDDIKTI but University mismatch. Ijazah: {extracted['university']}, closest: {match['record'].get('nama_pt')} (confidence {match['confidence']})"
         
         # 4. Transform response to match frontend schema format
         # Map PDDIKTI API fields (nama_pt, nama, nim, etc.) to frontend expected format
@@ -78,19 +77,26 @@ class AcademicValidator(BaseAgent):
             "graduation_year": "",  # Extract from Ijazah if needed, or leave empty
             "gpa": 0.0,  # Extract from Ijazah if needed, or leave as default
             "reasoning": reasoning,
+            "pddikti_status": pddikti_status,
             # Keep raw data for debugging/reference if needed
             "extracted": extracted,
             "pddikti_data": api_data,
-            "matched_record": matched_record  # Include matched record for reference
+            "matched_record": matched_record,  # Include matched record for reference
+            "match_confidence": match["confidence"]
         }
 
-    async def _search_pddikti(self, name: str) -> list:
-        def _fetch() -> list:
-            try:
-                with pddikti_api() as client:
-                    return client.search_mahasiswa(name)
-            except Exception:
-                return []
-
-        return await asyncio.to_thread(_fetch)
-
+    def _manual_check_result(self, extracted: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "is_valid": False,
+            "university_name": extracted["university"],
+            "student_name": extracted["full_name"],
+            "graduation_year": "",
+            "gpa": 0.0,
+            "reasoning": f"Unverified - PDDIKTI unavailable, Manual Check Required: {PDDIKTI_WEB_URL}",
+            "pddikti_status": "manual_check",
+            "pddikti_url": PDDIKTI_WEB_URL,
+            "extracted": extracted,
+            "pddikti_data": [],
+            "matched_record": None,
+            "match_confidence": 0.0
+        }
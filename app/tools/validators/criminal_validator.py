@@ -1,6 +1,6 @@
-import base64
 from typing import Dict, Any
 from core.BaseAgent import BaseAgent
+from app.tools.media_payload import MediaPayload
 from pydantic import BaseModel, Field
 
 class CriminalExtractionOutput(BaseModel):
@@ -19,6 +19,7 @@ class CriminalValidator(BaseAgent):
         1. Extract the Name and Criminal Status.
         2. Check if the document is signed (look for signature/stamp).
         3. Verify if the Name matches the candidate's name: {candidate_name}
+           (If the candidate's name is "Unknown", skip this check; the name is cross-checked against the KTP afterwards.)
         
         Output valid JSON.
         """
@@ -30,18 +31,12 @@ class CriminalValidator(BaseAgent):
             **kwargs
         )
 
-    async def __call__(self, file_bytes: bytes, candidate_name: str, mime_type: str = "application/pdf") -> Dict[str, Any]:
-        base64_data = base64.b64encode(file_bytes).decode('utf-8')
+    async def __call__(self, media: MediaPayload, candidate_name: str) -> Dict[str, Any]:
+        media = await media.prepared("criminal")
         
         self.rebind_prompt_variable(candidate_name=candidate_name)
         
-        message_content = [
-            {"type": "text", "text": "Analyze this criminal record document."},
-            {
-                "type": "image_url",
-                "image_url": {"url": f"data:{mime_type};base64,{base64_data}"}
-            }
-        ]
+        message_content = self.build_media_message("Analyze this criminal record document.", media)
         
         raw, parsed = await self.arun_chain(input=message_content)
         return parsed.model_dump()
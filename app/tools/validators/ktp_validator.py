@@ -1,8 +1,13 @@
-import base64
+import logging
 from typing import Dict, Any, Union
 from core.BaseAgent import BaseAgent
+from app.tools.media_payload import MediaPayload
+from app.tools.ktp_cache import KtpCache
+from app.tools.nik_decoder import NikDecoder
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 class KtpValidationOutput(BaseModel):
     is_valid: bool = Field(..., description="True if KTP is valid, clearly visible, and contains necessary fields.")
     nik: str = Field(..., description="Extracted NIK number.")
@@ -39,19 +44,25 @@ class KtpValidator(BaseAgent):
             **kwargs
         )
 
-    async def __call__(self, file_bytes: bytes, mime_type: str = "image/jpeg") -> Dict[str, Any]:
-        # Encode bytes to base64
-        base64_data = base64.b64encode(file_bytes).decode('utf-8')
+    async def __call__(self, media: MediaPayload) -> Dict[str, Any]:
+        # Same KTP file already read by another service (BgCheck / Onboarding / CriminalLetter)
+        # Keyed on the upload as received; the prepared payload below has another hash
+        cache = KtpCache.get_instance()
+        sha256 = media.sha256
+        cached = cache.get(sha256)
+        if cached is not None:
+            logger.info("KTP cache hit, skipping extraction")
+            return cached
+
+        # Shrink payload before encoding (cached on the payload)
+        media = await media.prepared("ktp")
         
         # Prepare Multimodal Input
-        message_content = [
-            {"type": "text", "text": "Analyze this KTP document."},
-            {
-                "type": "image_url",
-                "image_url": {"url": f"data:{mime_type};base64,{base64_data}"}
-            }
-        ]
+        message_content = self.build_media_message("Analyze this KTP document.", media)
         
         # Run Chain
         raw, parsed = await self.arun_chain(input=message_content)
-        return parsed.model_dump()
+        # Validate the NIK, fill a missing birth date / gender from it and flag disagreements
+        result = NikDecoder.reconcile(parsed.model_dump())
+        cache.put(sha256, result)
+        return result
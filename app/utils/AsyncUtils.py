@@ -0,0 +1,67 @@
+import time
+import asyncio
+import logging
+import functools
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from config.setting import env
+
+logger = logging.getLogger(__name__)
+
+# Bounded pool for the blocking supabase client (PostgREST queries, storage calls):
+# at most DATA_ACCESS_WORKERS calls in flight, none of them on the event loop
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=env.DATA_ACCESS_WORKERS, thread_name_prefix="data-access")
+    return _executor
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Runs a blocking call in the data-access pool and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+async def aexecute(query) -> Any:
+    """Awaitable `query.execute()` for supabase/PostgREST query builders."""
+    return await run_blocking(query.execute)
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+class LoopLagWatchdog:
+    """
+    Sleeps LOOP_LAG_CHECK_SECONDS in a loop and measures how late it wakes up:
+    anything above LOOP_LAG_WARN_MS means a coroutine blocked the event loop.
+    """
+    _task: Optional[asyncio.Task] = None
+    max_lag_ms: float = 0.0
+
+    @classmethod
+    def start(cls, interval: Optional[float] = None, threshold_ms: Optional[float] = None):
+        if cls._task is None or cls._task.done():
+            cls.max_lag_ms = 0.0
+            cls._task = asyncio.create_task(cls._watch(
+                interval or env.LOOP_LAG_CHECK_SECONDS,
+                threshold_ms if threshold_ms is not None else env.LOOP_LAG_WARN_MS
+            ))
+
+    @classmethod
+    async def _watch(cls, interval: float, threshold_ms: float):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag_ms = (time.perf_counter() - started - interval) * 1000
+            cls.max_lag_ms = max(cls.max_lag_ms, lag_ms)
+            if lag_ms > threshold_ms:
+                logger.warning(f"Event loop blocked for {lag_ms:.0f}ms (threshold {threshold_ms:.0f}ms)")
+
+    @classmethod
+    def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
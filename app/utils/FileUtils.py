@@ -0,0 +1,46 @@
+import os
+import json
+import fcntl
+import logging
+import contextlib
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+@contextlib.contextmanager
+def locked(path: str) -> Iterator[None]:
+    """
+    Exclusive lock on `path` for every thread and process of this node (gunicorn
+    workers share LOCAL_DATA_DIR). Held on a sidecar `<path>.lock` file that is
+    never moved or removed, so the data file itself can be.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def append_jsonl(path: str, entries: List[Dict[str, Any]]):
+    with locked(path):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, default=str) + "\n" for entry in entries))
+
+def take_jsonl(path: str) -> List[Dict[str, Any]]:
+    """Reads and removes a JSONL file in one locked step; appends from other workers are never lost."""
+    with locked(path):
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        os.remove(path)
+
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # A torn line (worker killed mid-write) must not block the rest of the file
+            logger.error(f"Dropped unreadable line of {path}: {line[:200]!r}")
+    return entries
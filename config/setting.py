@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -24,6 +25,76 @@ class Settings(BaseSettings):
     JWT_HS_SECRET: str
     JWT_ROLES_INDEX: str
 
+    # Processing Config
+    PROCESS_POOL_WORKERS: int = 2
+
+    # Data Access Config (blocking supabase calls run in a bounded thread pool)
+    DATA_ACCESS_WORKERS: int = 16
+    LOOP_LAG_WARN_MS: float = 100.0
+    LOOP_LAG_CHECK_SECONDS: float = 0.5
+
+    # Background Check Config
+    # "concurrent": one LLM call per document, run in parallel
+    # "combined": all documents of a candidate in one structured-output call
+    BG_CHECK_EXTRACTION_MODE: str = "concurrent"
+
+    # PDDIKTI Config
+    PDDIKTI_API_URL: Optional[str] = None
+    PDDIKTI_POOL_SIZE: int = 4
+    PDDIKTI_TIMEOUT_SECONDS: float = 8.0
+    PDDIKTI_CACHE_TTL_SECONDS: int = 3600
+    PDDIKTI_CACHE_MAX_ENTRIES: int = 2048
+    PDDIKTI_CIRCUIT_FAILURES: int = 3
+    PDDIKTI_CIRCUIT_RESET_SECONDS: int = 60
+
+    # KTP Cache Config
+    # In-memory only; KTP data is personal, keep retention short
+    KTP_CACHE_ENABLED: bool = True
+    KTP_CACHE_TTL_SECONDS: int = 1800
+    KTP_CACHE_MAX_ENTRIES: int = 256
+
+    # Office Converter Config (DOCX -> PDF, needs LibreOffice + its python UNO bridge)
+    OFFICE_CONVERTER_ENABLED: bool = False
+    OFFICE_CONVERTER_BINARY: str = "soffice"
+    OFFICE_CONVERTER_WORKERS: int = 2
+    OFFICE_CONVERTER_STARTUP_SECONDS: float = 30.0
+    OFFICE_CONVERTER_TIMEOUT_SECONDS: float = 30.0
+    OFFICE_CONVERTER_MAX_JOBS_PER_WORKER: int = 200
+
+    # Local Data Config (node-local files: caches, ledgers)
+    LOCAL_DATA_DIR: str = "storage"
+
+    # Artifact Store Config (large result_json fields -> hr-files bucket)
+    ARTIFACT_OFFLOAD_THRESHOLD_BYTES: int = 16384
+    ARTIFACT_COMPRESS: bool = True
+
+    # Storage Cleanup Config (files of deleted logs)
+    STORAGE_CLEANUP_RETRIES: int = 3
+    STORAGE_CLEANUP_RETRY_SECONDS: float = 2.0
+
+    # Activity Log Config (write-behind inserts, spilled to LOCAL_DATA_DIR when the DB is down,
+    # rows the DB rejects are dead-lettered there instead)
+    ACTIVITY_LOG_BATCH_SIZE: int = 50
+    ACTIVITY_LOG_FLUSH_SECONDS: float = 1.0
+    ACTIVITY_LOG_QUEUE_MAX: int = 10000
+    ACTIVITY_LOG_REPLAY_SECONDS: float = 60.0
+    ACTIVITY_LOG_SHUTDOWN_TIMEOUT_SECONDS: float = 5.0
+
+    # PAPI Summary Cache Config
+    PAPI_SUMMARY_CACHE_ENABLED: bool = True
+    PAPI_SUMMARY_CACHE_MAX_ENTRIES: int = 1024
+    PAPI_SUMMARY_CACHE_MAX_DISK_ENTRIES: int = 50000
+    PAPI_SUMMARY_CACHE_PREWARM: bool = False
+    PAPI_SUMMARY_CACHE_PREWARM_LIMIT: int = 1000
+    # "auto" mode: wait this long for the LLM, then answer with the rule-based narrative.
+    # A normal Gemini summary takes a few seconds; this only cuts off a slow or hung call
+    # (requests that must answer in milliseconds use "fast")
+    PAPI_SUMMARY_LATENCY_BUDGET_SECONDS: float = 8.0
+
+    # PAPI Bulk Scoring Config
+    PAPI_BULK_MAX_ROWS: int = 500
+    PAPI_BULK_LLM_CONCURRENCY: int = 4
+
     # Docker Config
     DOCKER_CONTAINER_NAME: str
     DOCKER_PORTS: str
@@ -176,6 +176,20 @@ class BaseAgent:
         self.tools = [t for t in self.tools if t.name in tool_names]
         self._rebuild_chains()
     
+    def build_media_message(self, text: str, media: Any) -> List[dict]:
+        """
+        Builds multimodal message content from a media payload (anything exposing
+        a `data_url`, e.g. app.tools.media_payload.MediaPayload). The payload's
+        single base64 encoding is shared instead of re-encoded per agent.
+        """
+        return [
+            {"type": "text", "text": text},
+            {
+                "type": "image_url", # Gemini via LangChain handles PDF/images as image_url data URLs
+                "image_url": {"url": media.data_url}
+            }
+        ]
+
     def run_chain(self, input: str = "", **kwargs: Any):
         """Invokes the chain synchronously and returns a single response."""
         invoke_kwargs = self._prepare_inputs(input, **kwargs)
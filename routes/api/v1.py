@@ -1,7 +1,8 @@
 import app.schemas as schemas
-from fastapi import APIRouter, UploadFile, File, Form, Body, Depends
-from typing import List, Dict, Any
-from app.schemas.HrSchemas import InterviewAnalysisRequest
+from datetime import datetime
+from fastapi import APIRouter, UploadFile, File, Form, Body, Depends, Query
+from typing import List, Dict, Any, Literal, Optional
+from app.schemas.HrSchemas import InterviewAnalysisRequest, BatchGenerateRequest
 from app.schemas.PapiSchemas import PapiScoringRequest
 
 from app.controllers.SampleController import sampleController
@@ -61,10 +62,11 @@ async def bg_check_analyze(
 @router.post("/bg-check/generate", tags=["Background Check"])
 async def bg_check_generate(
     data: Dict[str, Any] = Body(...),
+    pdf: bool = False,
     token_payload: dict = Depends(jwt)
 ):
     user_id = token_payload.get("sub") or token_payload.get("id")
-    return await bg_controller.generate_doc(data, user_id)
+    return await bg_controller.generate_doc(data, user_id, pdf)
 
 # --- Onboarding ---
 @router.post("/onboarding/analyze", tags=["Onboarding"])
@@ -81,10 +83,19 @@ async def onboarding_analyze(
 @router.post("/onboarding/generate", tags=["Onboarding"])
 async def onboarding_generate(
     data: Dict[str, Any] = Body(...),
+    pdf: bool = False,
     token_payload: dict = Depends(jwt)
 ):
     user_id = token_payload.get("sub") or token_payload.get("id")
-    return await onboarding_controller.generate_doc(data, user_id)
+    return await onboarding_controller.generate_doc(data, user_id, pdf)
+
+@router.post("/onboarding/generate-batch", tags=["Onboarding"])
+async def onboarding_generate_batch(
+    request: BatchGenerateRequest = Body(...),
+    token_payload: dict = Depends(jwt)
+):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await onboarding_controller.generate_batch(request, user_id)
 
 # --- Criminal Letter ---
 @router.post("/criminal-letter/analyze", tags=["Criminal Letter"])
@@ -99,10 +110,19 @@ async def criminal_letter_analyze(
 @router.post("/criminal-letter/generate", tags=["Criminal Letter"])
 async def criminal_letter_generate(
     data: Dict[str, Any] = Body(...),
+    pdf: bool = False,
     token_payload: dict = Depends(jwt)
 ):
     user_id = token_payload.get("sub") or token_payload.get("id")
-    return await criminal_letter_controller.generate_doc(data, user_id)
+    return await criminal_letter_controller.generate_doc(data, user_id, pdf)
+
+@router.post("/criminal-letter/generate-batch", tags=["Criminal Letter"])
+async def criminal_letter_generate_batch(
+    request: BatchGenerateRequest = Body(...),
+    token_payload: dict = Depends(jwt)
+):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await criminal_letter_controller.generate_batch(request, user_id)
 
 # --- Interview Analyzer ---
 @router.post("/interview-analyze", tags=["Interview Analyzer"])
@@ -115,12 +135,40 @@ async def analyze_interview(
 
 # --- History ---
 @router.get("/history", tags=["History"])
-async def get_history(limit: int = 50, offset: int = 0):
-    return await history_controller.get_history(limit, offset)
+async def get_history(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    tool_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    token_payload: dict = Depends(jwt)
+):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await history_controller.get_history(limit, user_id, offset, cursor, tool_type, date_from, date_to)
+
+@router.post("/history/bulk-delete", tags=["History"])
+async def delete_history_bulk(
+    log_ids: List[str] = Body(..., embed=True, min_length=1, max_length=500),
+    token_payload: dict = Depends(jwt)
+):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await history_controller.delete_history_bulk(log_ids, user_id)
+
+@router.get("/history/{log_id}", tags=["History"])
+async def get_history_detail(log_id: str, token_payload: dict = Depends(jwt)):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await history_controller.get_history_detail(log_id, user_id)
+
+@router.get("/history/{log_id}/artifacts/{field}", tags=["History"])
+async def get_history_artifact(log_id: str, field: str, token_payload: dict = Depends(jwt)):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await history_controller.get_artifact(log_id, field, user_id)
 
 @router.delete("/history/{log_id}", tags=["History"])
-async def delete_history(log_id: str):
-    return await history_controller.delete_history(log_id)
+async def delete_history(log_id: str, token_payload: dict = Depends(jwt)):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await history_controller.delete_history(log_id, user_id)
 
 # --- PAPI Kostick ---
 @router.post("/tools/papi-scoring", tags=["HR Tools"])
@@ -130,3 +178,12 @@ async def papi_scoring(
 ):
     user_id = token_payload.get("sub") or token_payload.get("id")
     return await papi_controller.score_candidate(request, user_id)
+
+@router.post("/tools/papi-scoring/bulk", tags=["HR Tools"])
+async def papi_scoring_bulk(
+    file: UploadFile = File(...),
+    mode: Literal["auto", "llm", "fast"] = "auto",
+    token_payload: dict = Depends(jwt)
+):
+    user_id = token_payload.get("sub") or token_payload.get("id")
+    return await papi_controller.score_bulk(file, user_id, mode)
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+# config.setting reads these at import time; tests never reach the real services
+os.environ.setdefault("APP_NAME", "hr-ai-test")
+os.environ.setdefault("APP_ENV", "testing")
+os.environ.setdefault("APP_VERSION", "0")
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault(
+    "SUPABASE_SERVICE_ROLE_KEY",
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.test"
+)
+os.environ.setdefault("ALLOWED_ORIGINS", "*")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("VERTEX_API_KEY", "test")
+os.environ.setdefault("GCP_PROJECT_ID", "test")
+os.environ.setdefault("JWT_HS_SECRET", "test")
+os.environ.setdefault("JWT_ROLES_INDEX", "roles")
+os.environ.setdefault("DOCKER_CONTAINER_NAME", "test")
+os.environ.setdefault("DOCKER_PORTS", "8000")
+os.environ.setdefault("DOCKER_WORKER_COUNT", "1")
+os.environ.setdefault("LOCAL_DATA_DIR", tempfile.mkdtemp(prefix="hr-ai-test-"))
+
+import asyncio
+import pytest
+from langchain_core.runnables import RunnableLambda
+from config.setting import env
+
+@pytest.fixture
+def local_data_dir(tmp_path, monkeypatch):
+    """Node-local files (spill, ledgers, caches) go to a fresh directory per test."""
+    monkeypatch.setattr(env, "LOCAL_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+@pytest.fixture(scope="session")
+def process_pool():
+    """The shared spawn pool, started once for the session (spawning workers is slow)."""
+    from app.tools.process_pool import ProcessPool
+    yield ProcessPool
+    ProcessPool.shutdown()
+
+class FakeVisionLLM:
+    """
+    Stands in for the Gemini chat model behind BaseAgent: structured-output calls
+    return the canned response of their schema (by class name) and are recorded
+    as (schema name, number of documents in the prompt).
+    """
+    def __init__(self, responses, latency: float = 0.0):
+        self.responses = responses
+        self.latency = latency
+        self.calls = []
+
+    def __call__(self, prompt_value):
+        # BaseAgent also pipes the bare model into its plain-text chain; only structured output is faked
+        raise NotImplementedError("FakeVisionLLM only answers structured-output calls")
+
+    def with_structured_output(self, schema):
+        async def respond(prompt_value):
+            documents = sum(
+                1 for message in prompt_value.to_messages() if isinstance(message.content, list)
+                for part in message.content if part.get("type") == "image_url"
+            )
+            self.calls.append((schema.__name__, documents))
+            await asyncio.sleep(self.latency)
+            return schema.model_validate(self.responses[schema.__name__])
+
+        return RunnableLambda(lambda prompt_value: None, afunc=respond)
+
+@pytest.fixture
+def ktp_cache():
+    from app.tools.ktp_cache import KtpCache
+    cache = KtpCache.get_instance()
+    cache.clear()
+    yield cache
+    cache.clear()
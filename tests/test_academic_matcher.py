@@ -0,0 +1,54 @@
+import time
+import pytest
+from app.tools.academic_matcher import AcademicMatcher
+
+@pytest.fixture(scope="module")
+def matcher():
+    return AcademicMatcher.get_instance()
+
+@pytest.mark.parametrize("name, expected", [
+    ("Universitas Kristen Indonesia", "universitas kristen indonesia"),
+    ("Universitas Pendidikan Indonesia", "universitas pendidikan indonesia"),
+    ("Univ. Indonesia", "universitas indonesia"),
+    ("UGM", "universitas gadjah mada"),
+    ("Institut Teknologi Sepuloh Nopember", "institut teknologi sepuluh nopember"),
+])
+def test_canonical_university(matcher, name, expected):
+    assert matcher.canonical_university(name) == expected
+
+@pytest.mark.parametrize("university, nama_pt, sinkatan_pt, expected", [
+    # Look-alike universities must stay apart
+    ("Universitas Indonesia", "UNIVERSITAS KRISTEN INDONESIA", "UKI", False),
+    ("Universitas Indonesia", "UNIVERSITAS PENDIDIKAN INDONESIA", "UPI", False),
+    ("Universitas Kristen Indonesia", "UNIVERSITAS INDONESIA", "UI", False),
+    ("Universitas Negeri Jakarta", "UNIVERSITAS JAKARTA", "", False),
+    ("Universitas Islam Indonesia", "UNIVERSITAS ISLAM BANDUNG", "UNISBA", False),
+    # Aliases and OCR typos must still match
+    ("Universitas Indonesia", "UNIVERSITAS INDONESIA", "UI", True),
+    ("UI", "UNIVERSITAS INDONESIA", "UI", True),
+    ("Univ. Gajah Mada", "UNIVERSITAS GADJAH MADA", "UGM", True),
+    ("Universitas Kristen Indonesia", "UNIVERSITAS KRISTEN INDONESIA", "UKI", True),
+    ("Institut Teknologi Sepuloh Nopember", "INSTITUT TEKNOLOGI SEPULUH NOPEMBER", "ITS", True),
+])
+def test_university_match(matcher, university, nama_pt, sinkatan_pt, expected):
+    record = {"nama": "Budi Santoso", "nama_pt": nama_pt, "sinkatan_pt": sinkatan_pt}
+    assert matcher.best_match("Budi Santoso", university, [record])["is_match"] is expected
+
+def test_student_name_must_match(matcher):
+    record = {"nama": "Siti Aminah", "nama_pt": "UNIVERSITAS INDONESIA", "sinkatan_pt": "UI"}
+    assert not matcher.best_match("Budi Santoso", "Universitas Indonesia", [record])["is_match"]
+
+def test_best_match_among_hundreds_of_hits(matcher):
+    records = [
+        {"nama": f"BUDI SANTOSO {i}", "nama_pt": f"UNIVERSITAS SWASTA {i}", "sinkatan_pt": ""} for i in range(500)
+    ] + [{"nama": "BUDI SANTOSO", "nim": "1206000001", "nama_pt": "UNIVERSITAS INDONESIA", "sinkatan_pt": "UI"}]
+
+    started = time.perf_counter()
+    match = matcher.best_match("Budi Santoso", "Universitas Indonesia", records)
+    assert time.perf_counter() - started < 1.0
+    assert match["is_match"] and match["record"]["nim"] == "1206000001"
+
+def test_no_records(matcher):
+    assert matcher.best_match("Budi Santoso", "Universitas Indonesia", []) == {
+        "record": None, "confidence": 0.0, "university_score": 0.0, "name_score": 0.0, "is_match": False
+    }
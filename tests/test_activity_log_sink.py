@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import pytest
+from postgrest.exceptions import APIError
+from config.setting import env
+from app.tools import activity_log_sink
+from app.tools.activity_log_sink import ActivityLogSink
+from app.utils.AsyncUtils import shutdown_executor
+
+INSERT_SECONDS = 0.2
+ENTRIES = 20
+
+class FakeDatabase:
+    """activity_logs table double: slow inserts, outages and an FK-violating user."""
+    def __init__(self):
+        self.down = False
+        self.sleep = 0.0
+        self.rows = []
+        self.calls = 0
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows, **kwargs):
+        return FakeInsert(self, rows if isinstance(rows, list) else [rows])
+
+class FakeInsert:
+    def __init__(self, database, rows):
+        self.database = database
+        self.rows = rows
+
+    def execute(self):
+        time.sleep(self.database.sleep)
+        self.database.calls += 1
+        if self.database.down:
+            raise ConnectionError("database unreachable")
+        if any(row.get("user_id") == "missing-user" for row in self.rows):
+            # FK violation: the whole statement is rolled back
+            raise APIError({"code": "23503", "message": "insert or update on table \"activity_logs\" violates foreign key constraint"})
+        self.database.rows.extend(self.rows)
+
+@pytest.fixture
+def database(local_data_dir, monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(activity_log_sink, "supabase_client", database)
+    monkeypatch.setattr(env, "ACTIVITY_LOG_FLUSH_SECONDS", 0.05)
+    yield database
+    shutdown_executor()
+
+@pytest.fixture
+def entries():
+    return [{"user_id": "u", "tool_type": "check", "result_json": {"n": i}} for i in range(ENTRIES)]
+
+def read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+async def test_log_stays_off_the_request_path(database, entries):
+    database.sleep = INSERT_SECONDS
+    started = time.perf_counter()
+    for entry in entries:
+        ActivityLogSink.log(entry)
+    assert time.perf_counter() - started < INSERT_SECONDS
+
+    await ActivityLogSink.shutdown()
+    assert database.rows == entries
+    assert database.calls == 1
+
+async def test_outage_is_spilled_and_replayed(database, entries):
+    database.down = True
+    for entry in entries:
+        ActivityLogSink.log(entry)
+    await ActivityLogSink.shutdown()
+    assert read_jsonl(ActivityLogSink.spill_path()) == entries
+
+    database.down = False
+    assert await ActivityLogSink.replay() == ENTRIES
+    assert database.rows == entries
+    assert not os.path.exists(ActivityLogSink.spill_path())
+
+async def test_rejected_row_is_dead_lettered_alone(database, entries):
+    batch = entries[:5]
+    poisoned = {**batch[2], "user_id": "missing-user"}
+    for entry in batch[:2] + [poisoned] + batch[3:]:
+        ActivityLogSink.log(entry)
+    await ActivityLogSink.shutdown()
+
+    assert database.rows == batch[:2] + batch[3:]
+    dead = read_jsonl(ActivityLogSink.dead_letter_path())
+    assert [record["entry"] for record in dead] == [poisoned]
+    assert dead[0]["error"]["code"] == "23503"
+    assert not os.path.exists(ActivityLogSink.spill_path())
+
+@pytest.mark.parametrize("error, rejected", [
+    (APIError({"code": "23503", "message": "fk"}), True),
+    (APIError({"code": "22P02", "message": "invalid input syntax"}), True),
+    (APIError({"code": "57014", "message": "statement timeout"}), False),
+    (APIError({"code": "PGRST000", "message": "could not connect"}), False),
+    (APIError({"code": 502, "message": "Bad Gateway"}), False),
+    (ConnectionError("database unreachable"), False),
+])
+def test_is_rejection(error, rejected):
+    assert ActivityLogSink.is_rejection(error) is rejected
+
+def spill_from_worker(local_data_dir: str, worker: int, count: int):
+    env.LOCAL_DATA_DIR = local_data_dir
+    for n in range(count):
+        ActivityLogSink.spill([{"user_id": "u", "tool_type": "check", "result_json": {"worker": worker, "n": n}}])
+
+async def test_replay_never_loses_rows_spilled_by_other_workers(database, local_data_dir):
+    import multiprocessing
+    workers, count = 4, 200
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=spill_from_worker, args=(str(local_data_dir), w, count)) for w in range(workers)]
+    for process in processes:
+        process.start()
+    while any(process.is_alive() for process in processes):
+        await ActivityLogSink.replay()
+    for process in processes:
+        process.join()
+    await ActivityLogSink.replay()
+
+    replayed = sorted((row["result_json"]["worker"], row["result_json"]["n"]) for row in database.rows)
+    assert replayed == [(w, n) for w in range(workers) for n in range(count)]
@@ -0,0 +1,56 @@
+import time
+import asyncio
+import pytest
+from config.setting import env
+from app.tools import file_handler
+from app.tools.file_handler import FileHandler
+from app.utils.AsyncUtils import LoopLagWatchdog, aexecute, shutdown_executor
+
+QUERY_SECONDS = 0.3
+THRESHOLD_MS = 50
+
+class SlowQuery:
+    def execute(self):
+        time.sleep(QUERY_SECONDS)  # a slow PostgREST round trip
+        return "ok"
+
+class SlowBucket:
+    def download(self, path):
+        time.sleep(QUERY_SECONDS)
+        return b"%PDF-1.4"
+
+class SlowStorage:
+    def from_(self, bucket):
+        return SlowBucket()
+
+class SlowClient:
+    storage = SlowStorage()
+
+@pytest.fixture
+async def loop_lag():
+    """Yields a callable returning the worst event loop lag (ms) seen so far in the test."""
+    LoopLagWatchdog.start(interval=0.01, threshold_ms=THRESHOLD_MS)
+    await asyncio.sleep(0.05)
+
+    async def max_lag_ms() -> float:
+        await asyncio.sleep(0.05)
+        return LoopLagWatchdog.max_lag_ms
+
+    yield max_lag_ms
+    LoopLagWatchdog.stop()
+    shutdown_executor()
+
+async def test_watchdog_detects_a_blocked_loop(loop_lag):
+    SlowQuery().execute()
+    assert await loop_lag() > THRESHOLD_MS
+
+async def test_concurrent_queries_do_not_block_the_loop(loop_lag):
+    results = await asyncio.gather(*[aexecute(SlowQuery()) for _ in range(env.DATA_ACCESS_WORKERS)])
+    assert results == ["ok"] * env.DATA_ACCESS_WORKERS
+    assert await loop_lag() < THRESHOLD_MS
+
+async def test_storage_downloads_do_not_block_the_loop(loop_lag, monkeypatch):
+    monkeypatch.setattr(file_handler, "supabase_client", SlowClient())
+    results = await asyncio.gather(*[FileHandler.download_file(f"cvs/{i}.pdf") for i in range(4)])
+    assert results == [b"%PDF-1.4"] * 4
+    assert await loop_lag() < THRESHOLD_MS
@@ -0,0 +1,75 @@
+import pytest
+from conftest import FakeVisionLLM
+from app.tools.media_payload import MediaPayload
+from app.tools.pddikti_client import PddiktiClient
+from app.services.BgCheckService import BgCheckService, UNKNOWN_NAME
+from app.tools.extractors.bg_check_document_extractor import BgCheckDocumentExtractor
+
+KTP = {
+    "is_valid": True, "nik": "3171011508900001", "full_name": "BUDI SANTOSO", "address": "Jl. Melati 1, Jakarta",
+    "gender": "Laki-Laki", "birth_place": "Jakarta", "birth_date": "15-08-1990", "reasoning": "Clear KTP.",
+}
+ACADEMIC = {"full_name": "Budi Santoso", "university": "Universitas Indonesia", "nomor_ijazah": "UI/2012/001"}
+CRIMINAL = {"is_valid": True, "full_name": "Budi Santoso", "status": "CLEAN", "has_signature": True, "reasoning": "Signed."}
+RESPONSES = {
+    "KtpValidationOutput": KTP,
+    "AcademicExtractionOutput": ACADEMIC,
+    "CriminalExtractionOutput": CRIMINAL,
+    "BgCheckExtractionOutput": {"ktp": KTP, "academic": ACADEMIC, "criminal": CRIMINAL},
+}
+PDDIKTI_HITS = [{"nama": "BUDI SANTOSO", "nim": "1206000001", "nama_pt": "UNIVERSITAS INDONESIA", "sinkatan_pt": "UI"}]
+
+def documents():
+    # Not an image nor a PDF: the preprocessor passes these through untouched
+    return {
+        key: {"media": MediaPayload(f"{key} scan".encode(), "application/octet-stream"), "path": f"bg/{key}"}
+        for key in ("ktp", "academic", "criminal")
+    }
+
+@pytest.fixture
+def pddikti(monkeypatch):
+    async def search_mahasiswa(self, name):
+        return PDDIKTI_HITS
+    monkeypatch.setattr(PddiktiClient, "search_mahasiswa", search_mahasiswa)
+
+async def test_extractor_reads_all_documents_in_one_call():
+    llm = FakeVisionLLM(RESPONSES)
+    files = documents()
+    sections = await BgCheckDocumentExtractor(llm)(*(files[key]["media"] for key in ("ktp", "academic", "criminal")))
+
+    assert llm.calls == [("BgCheckExtractionOutput", 3)]
+    assert sections == {"ktp": KTP, "academic": ACADEMIC, "criminal": CRIMINAL}
+
+async def test_combined_mode_matches_concurrent_mode(pddikti, ktp_cache):
+    concurrent_llm, combined_llm = FakeVisionLLM(RESPONSES), FakeVisionLLM(RESPONSES)
+    concurrent = await BgCheckService(concurrent_llm, extraction_mode="concurrent").extract_documents(documents(), UNKNOWN_NAME)
+    ktp_cache.clear()
+    combined = await BgCheckService(combined_llm, extraction_mode="combined").extract_documents(documents(), UNKNOWN_NAME)
+
+    assert combined == concurrent
+    assert sorted(concurrent_llm.calls) == [
+        ("AcademicExtractionOutput", 1), ("CriminalExtractionOutput", 1), ("KtpValidationOutput", 1)
+    ]
+    assert combined_llm.calls == [("BgCheckExtractionOutput", 3)]
+
+    ktp, academic, _ = combined
+    assert ktp["nik_check"]["valid"] and not ktp["nik_check"]["issues"]
+    assert academic["pddikti_status"] == "verified"
+
+async def test_combined_mode_falls_back_to_concurrent_validators(pddikti, ktp_cache):
+    responses = {**RESPONSES, "BgCheckExtractionOutput": {"ktp": KTP}}  # malformed: sections missing
+    llm = FakeVisionLLM(responses)
+    ktp, academic, criminal = await BgCheckService(llm, extraction_mode="combined").extract_documents(documents(), UNKNOWN_NAME)
+
+    assert llm.calls[0] == ("BgCheckExtractionOutput", 3)
+    assert len(llm.calls) == 4
+    assert ktp["full_name"] == KTP["full_name"] and criminal["status"] == "CLEAN"
+
+async def test_combined_mode_needs_all_three_documents(pddikti, ktp_cache):
+    llm = FakeVisionLLM(RESPONSES)
+    files = documents()
+    del files["criminal"]
+    _, _, criminal = await BgCheckService(llm, extraction_mode="combined").extract_documents(files, UNKNOWN_NAME)
+
+    assert criminal["reasoning"] == "No Criminal file"
+    assert sorted(llm.calls) == [("AcademicExtractionOutput", 1), ("KtpValidationOutput", 1)]
@@ -0,0 +1,112 @@
+import io
+import hashlib
+import pytest
+from pypdf import PdfWriter
+from starlette.datastructures import Headers, UploadFile
+from conftest import FakeVisionLLM
+from app.controllers import CvController as cv_controller_module
+from app.controllers.CvController import CvController
+from app.services import CvAnalyzerService as cv_service_module
+from app.tools.file_handler import FileHandler
+from app.tools.activity_log_sink import ActivityLogSink
+
+ANALYSIS = {"score": 80, "match_analysis": True, "strengths": ["Python"], "weaknesses": ["Go"], "summary": "Cocok."}
+JOB = {"title": "Backend Engineer", "criteria_text": "Python, PostgreSQL"}
+
+def cv_pdf(pages: int = 10) -> bytes:
+    # More pages than the CV page cap, so the prepared payload differs from the upload
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+class FakeQuery:
+    def __init__(self, database, table):
+        self.database = database
+        self.table = table
+        self.filters = []
+
+    def __getattr__(self, name):
+        # select / eq / order / limit / single ... are recorded and chained
+        def chain(*args, **kwargs):
+            self.filters.append((name, *args))
+            return self
+        return chain
+
+    def execute(self):
+        self.database.queries.append((self.table, self.filters))
+        return type("Response", (), {"data": self.database.data(self.table, self.filters)})()
+
+class FakeDatabase:
+    def __init__(self):
+        self.queries = []
+        self.logs = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def data(self, table, filters):
+        if table == "job_positions":
+            return JOB
+        # activity_logs prior-analysis lookup over the logs recorded so far
+        wanted = {args[0]: args[1] for name, *args in filters if name == "eq"}
+        return [
+            {"result_json": log["result_json"]} for log in reversed(self.logs)
+            if log["user_id"] == wanted["user_id"]
+            and log["result_json"]["content_sha256"] == wanted["result_json->>content_sha256"]
+            and log["result_json"]["criteria_hash"] == wanted["result_json->>criteria_hash"]
+        ]
+
+@pytest.fixture
+def backend(monkeypatch, process_pool):
+    database, uploads, llm = FakeDatabase(), [], FakeVisionLLM({"CvAnalysisOutput": ANALYSIS})
+
+    async def upload_file(file_bytes, destination_path, content_type="application/pdf"):
+        uploads.append(destination_path)
+        return destination_path
+
+    monkeypatch.setattr(cv_service_module, "supabase_client", database)
+    monkeypatch.setattr(FileHandler, "upload_file", upload_file)
+    monkeypatch.setattr(ActivityLogSink, "log", database.logs.append)
+    monkeypatch.setattr(cv_controller_module, "get_llm", lambda: llm)
+    return database, uploads, llm
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="cv.pdf", headers=Headers({"content-type": "application/pdf"}))
+
+async def test_every_upload_gets_its_own_storage_object(backend):
+    database, uploads, llm = backend
+    data = cv_pdf()
+    await CvController().analyze(upload(data), 1, "user-1")
+    await CvController().analyze(upload(data), 1, "user-2")
+
+    # Same file, two users: nothing is shared, so deleting one history entry cannot touch the other's CV
+    assert len(set(uploads)) == 2
+    assert [log["input_files"] for log in database.logs] == [[path] for path in uploads]
+    assert len(llm.calls) == 2
+
+async def test_prior_analysis_is_reused_by_upload_hash(backend):
+    database, uploads, llm = backend
+    data = cv_pdf()
+    first = (await CvController().analyze(upload(data), 1, "user-1"))["data"]
+    second = (await CvController().analyze(upload(data), 1, "user-1"))["data"]
+
+    assert (first["reused"], second["reused"]) == (False, True)
+    assert {key: second[key] for key in ANALYSIS} == ANALYSIS
+    assert len(llm.calls) == 1
+    # Keyed on the upload as received, not on the page-capped payload sent to the model
+    assert {log["result_json"]["content_sha256"] for log in database.logs} == {hashlib.sha256(data).hexdigest()}
+    # The reused analysis is logged against its own upload
+    assert database.logs[1]["input_files"] == [uploads[1]] != [uploads[0]]
+
+async def test_changed_criteria_are_analyzed_again(backend, monkeypatch):
+    database, _, llm = backend
+    data = cv_pdf()
+    await CvController().analyze(upload(data), 1, "user-1")
+    monkeypatch.setitem(JOB, "criteria_text", "Python, PostgreSQL, Kubernetes")
+    result = (await CvController().analyze(upload(data), 1, "user-1"))["data"]
+
+    assert result["reused"] is False
+    assert len(llm.calls) == 2
@@ -0,0 +1,59 @@
+import io
+import glob
+import zipfile
+import pytest
+from docx import Document
+from app.tools.file_handler import FileHandler
+from app.tools.docx_template_engine import DocxTemplateEngine
+
+TEMPLATES = sorted(glob.glob("assets/template/*.docx"))
+BATCH = 20
+
+def document_text(document: bytes) -> str:
+    doc = Document(io.BytesIO(document))
+    paragraphs = [p.text for p in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            paragraphs.extend(cell.text for cell in row.cells)
+    return "\n".join(paragraphs)
+
+def replacements_for(template, index: int):
+    return {key: f"Candidate {index} {key[1:-1]}" for key in template.placeholders}
+
+@pytest.mark.parametrize("path", TEMPLATES)
+async def test_render_many_matches_sequential_renders(path, process_pool):
+    template = DocxTemplateEngine.get_template(path)
+    replacements_list = [replacements_for(template, i) for i in range(BATCH)]
+
+    documents = await DocxTemplateEngine.render_many(path, replacements_list)
+    assert documents == [DocxTemplateEngine.render(path, replacements) for replacements in replacements_list]
+
+    text = document_text(documents[-1])
+    assert all(value in text for value in replacements_list[-1].values())
+
+def test_batch_archive_names():
+    archive = FileHandler.pack_zip([
+        (DocxTemplateEngine.archive_name(i, label, "docx"), b"doc")
+        for i, label in enumerate(["Budi Santoso", "", "Siti/Aminah"])
+    ])
+    with zipfile.ZipFile(io.BytesIO(archive)) as package:
+        assert package.namelist() == ["001_Budi_Santoso.docx", "002_document.docx", "003_Siti_Aminah.docx"]
+
+async def test_render_many_of_nothing():
+    assert await DocxTemplateEngine.render_many(TEMPLATES[0], []) == []
+
+def test_none_values_render_empty():
+    path = TEMPLATES[0]
+    template = DocxTemplateEngine.get_template(path)
+    first, *rest = template.placeholders
+    replacements = {first: None, **{key: f"value {key[1:-1]}" for key in rest}}
+
+    text = document_text(DocxTemplateEngine.render(path, replacements))
+    assert "None" not in text
+    assert first not in text
+    assert all(value in text for value in replacements.values() if value)
+
+def test_unknown_placeholders_are_kept():
+    path = TEMPLATES[0]
+    template = DocxTemplateEngine.get_template(path)
+    assert template.placeholders[0] in document_text(DocxTemplateEngine.render(path, {}))
@@ -0,0 +1,74 @@
+import time
+import pytest
+from jose import jwt
+from fastapi.testclient import TestClient
+from config.setting import env
+from app.services.HistoryService import HistoryService
+
+OWNER = "user-1"
+
+@pytest.fixture(scope="module")
+def client():
+    from main import app
+    return TestClient(app)
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Records the HistoryService calls made by the routes instead of querying Supabase."""
+    calls = []
+
+    async def get_logs(limit, **kwargs):
+        calls.append(("get_logs", kwargs))
+        return {"data": [], "next_cursor": None}
+
+    async def get_log(log_id, owner_id=None):
+        calls.append(("get_log", {"log_id": log_id, "owner_id": owner_id}))
+        return {"id": log_id}
+
+    async def delete_logs(log_ids, owner_id=None):
+        calls.append(("delete_logs", {"log_ids": log_ids, "owner_id": owner_id}))
+        return {"deleted": log_ids, "not_found": []}
+
+    monkeypatch.setattr(HistoryService, "get_logs", get_logs)
+    monkeypatch.setattr(HistoryService, "get_log", get_log)
+    monkeypatch.setattr(HistoryService, "delete_logs", delete_logs)
+    return calls
+
+def auth(sub: str = OWNER):
+    token = jwt.encode({"sub": sub, "exp": int(time.time()) + 60}, env.JWT_HS_SECRET, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+HISTORY_ROUTES = [
+    ("get", "/api/v1/history", None),
+    ("get", "/api/v1/history/log-1", None),
+    ("get", "/api/v1/history/log-1/artifacts/image", None),
+    ("delete", "/api/v1/history/log-1", None),
+    ("post", "/api/v1/history/bulk-delete", {"log_ids": ["log-1"]}),
+]
+
+@pytest.mark.parametrize("method, path, body", HISTORY_ROUTES)
+def test_every_history_route_requires_a_token(client, calls, method, path, body):
+    response = client.request(method, path, json=body)
+    assert response.status_code == 401
+    assert calls == []
+
+def test_list_is_scoped_to_the_caller(client, calls):
+    response = client.get("/api/v1/history", params={"user_id": "someone-else", "tool_type": "cv_analyze"}, headers=auth())
+    assert response.status_code == 200
+    assert calls == [("get_logs", {
+        "cursor": None, "tool_type": "cv_analyze", "user_id": OWNER, "date_from": None, "date_to": None, "offset": 0
+    })]
+
+def test_single_delete_is_scoped_to_the_caller(client, calls):
+    assert client.delete("/api/v1/history/log-1", headers=auth()).status_code == 200
+    assert calls == [("delete_logs", {"log_ids": ["log-1"], "owner_id": OWNER})]
+
+def test_deleting_another_users_log_is_not_found(client, monkeypatch):
+    async def delete_logs(log_ids, owner_id=None):
+        return {"deleted": [], "not_found": log_ids}
+    monkeypatch.setattr(HistoryService, "delete_logs", delete_logs)
+    assert client.delete("/api/v1/history/log-1", headers=auth("user-2")).status_code == 404
+
+def test_detail_is_scoped_to_the_caller(client, calls):
+    assert client.get("/api/v1/history/log-1", headers=auth()).status_code == 200
+    assert calls == [("get_log", {"log_id": "log-1", "owner_id": OWNER})]
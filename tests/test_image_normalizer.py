@@ -0,0 +1,76 @@
+import io
+import numpy as np
+import pytest
+from PIL import Image
+from app.tools.image_normalizer import ImageNormalizer
+from app.tools.media_payload import MediaPayload
+from app.tools.document_preprocessor import DocumentPreprocessor
+
+EXIF_ORIENTATION = 0x0112
+
+def phone_photo(width=4000, height=3000, orientation=None) -> bytes:
+    """A noisy card-sized document on a flat desk, saved like a phone camera would."""
+    rng = np.random.default_rng(0)
+    pixels = np.full((height, width, 3), (90, 70, 50), dtype=np.uint8)
+    top, left = height // 5, width // 5
+    card = rng.integers(150, 256, size=(height * 3 // 5, width * 3 // 5, 3), dtype=np.uint8)
+    card[:, :, 2] = 230  # blue-ish KTP background
+    pixels[top:top + card.shape[0], left:left + card.shape[1]] = card
+    img = Image.fromarray(pixels)
+    exif = Image.Exif()
+    if orientation:
+        exif[EXIF_ORIENTATION] = orientation
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=95, exif=exif)
+    return output.getvalue()
+
+@pytest.fixture(scope="module")
+def photo():
+    return phone_photo()
+
+def test_ktp_photo_is_cropped_resized_and_keeps_colour(photo):
+    normalized, mime_type, stats = ImageNormalizer.normalize(photo, "ktp")
+    img = Image.open(io.BytesIO(normalized))
+
+    assert mime_type == "image/jpeg"
+    assert stats["cropped"]
+    assert max(img.size) <= ImageNormalizer.TARGET_LONG_EDGE["ktp"]
+    assert img.mode == "RGB"
+    assert len(normalized) < len(photo) / 4
+    assert stats["saved_bytes"] == len(photo) - len(normalized)
+
+def test_letters_are_grayscale(photo):
+    normalized, _, _ = ImageNormalizer.normalize(photo, "criminal")
+    assert Image.open(io.BytesIO(normalized)).mode == "L"
+
+def test_exif_rotation_is_applied():
+    # Orientation 6: stored landscape, displayed portrait
+    normalized, _, stats = ImageNormalizer.normalize(phone_photo(orientation=6), "academic")
+    width, height = Image.open(io.BytesIO(normalized)).size
+    assert height > width
+    assert stats["original_size"] == (4000, 3000)
+
+def test_already_small_image_is_returned_unchanged():
+    output = io.BytesIO()
+    Image.new("RGB", (64, 64), (255, 255, 255)).save(output, format="PNG")
+    original = output.getvalue()
+    normalized, mime_type, stats = ImageNormalizer.normalize(original, "ktp")
+    assert normalized is original
+    assert mime_type is None
+    assert not stats["cropped"]
+
+async def test_preprocessor_normalizes_in_the_process_pool(photo, process_pool):
+    prepared, mime_type, changed = await DocumentPreprocessor.prepare(photo, "image/jpeg", "ktp")
+    assert changed and mime_type == "image/jpeg"
+    assert len(prepared) < len(photo) / 4
+
+async def test_preprocessor_never_fails_the_caller(process_pool):
+    prepared, mime_type, changed = await DocumentPreprocessor.prepare(b"not an image", "image/png", "ktp")
+    assert (prepared, mime_type, changed) == (b"not an image", "image/png", False)
+
+async def test_unchanged_document_is_not_copied(process_pool):
+    output = io.BytesIO()
+    Image.new("RGB", (64, 64), (255, 255, 255)).save(output, format="PNG")
+    payload = MediaPayload(output.getvalue(), "image/png", "small.png")
+    # The bytes come back from another process as an equal copy; the payload itself is reused
+    assert await payload.prepared("ktp") is payload
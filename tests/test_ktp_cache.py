@@ -0,0 +1,52 @@
+import io
+from PIL import Image
+from conftest import FakeVisionLLM
+from config.setting import env
+from app.tools.media_payload import MediaPayload
+from app.tools.validators.ktp_validator import KtpValidator
+
+KTP = {
+    "is_valid": True, "nik": "3171011508900001", "full_name": "BUDI SANTOSO", "address": "Jl. Melati 1, Jakarta",
+    "gender": "Laki-Laki", "birth_place": "Jakarta", "birth_date": "15-08-1990", "reasoning": "Clear KTP.",
+}
+
+def ktp_photo(shade: int = 200) -> bytes:
+    # Large enough that normalization re-encodes it, so the prepared payload has another hash
+    output = io.BytesIO()
+    Image.new("RGB", (2400, 1600), (shade, shade, 255)).save(output, format="PNG")
+    return output.getvalue()
+
+async def test_second_validation_of_the_same_upload_is_served_from_cache(ktp_cache, process_pool):
+    llm = FakeVisionLLM({"KtpValidationOutput": KTP})
+    validator = KtpValidator(llm)
+    photo = ktp_photo()
+
+    first = await validator(MediaPayload(photo, "image/png"))
+    # Another service validating the same file later in the flow
+    second = await KtpValidator(llm)(MediaPayload(photo, "image/png"))
+
+    assert len(llm.calls) == 1
+    assert second == first
+    assert first["full_name"] == "BUDI SANTOSO"
+
+async def test_a_different_upload_is_extracted_again(ktp_cache, process_pool):
+    llm = FakeVisionLLM({"KtpValidationOutput": KTP})
+    await KtpValidator(llm)(MediaPayload(ktp_photo(200), "image/png"))
+    await KtpValidator(llm)(MediaPayload(ktp_photo(201), "image/png"))
+    assert len(llm.calls) == 2
+
+def test_cached_results_are_copies(ktp_cache):
+    ktp_cache.put("a" * 64, {"full_name": "BUDI", "nik_check": {"issues": []}})
+    hit = ktp_cache.get("a" * 64)
+    hit["nik_check"]["issues"].append("changed by a caller")
+    assert ktp_cache.get("a" * 64)["nik_check"]["issues"] == []
+
+def test_entries_expire_and_are_bounded(ktp_cache, monkeypatch):
+    monkeypatch.setattr(env, "KTP_CACHE_MAX_ENTRIES", 2)
+    for key in ("a", "b", "c"):
+        ktp_cache.put(key, {"full_name": key})
+    assert ktp_cache.get("a") is None and ktp_cache.get("c") == {"full_name": "c"}
+
+    monkeypatch.setattr(env, "KTP_CACHE_TTL_SECONDS", 0)
+    ktp_cache.put("d", {"full_name": "d"})
+    assert ktp_cache.get("d") is None
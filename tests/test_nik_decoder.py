@@ -0,0 +1,35 @@
+from app.tools.nik_decoder import NikDecoder
+from app.services.CriminalLetterService import CriminalLetterService
+
+NIK = "3171011508900001"  # Jakarta, male, 15-08-1990
+
+def ktp(**fields):
+    return {"nik": NIK, "full_name": "BUDI SANTOSO", "gender": "Laki-Laki", "birth_date": "15-08-1990", **fields}
+
+def test_consistent_card_passes():
+    result = NikDecoder.reconcile(ktp())
+    assert result["nik_check"]["valid"]
+    assert result["nik_check"]["issues"] == []
+    assert result["nik_check"]["corrected_fields"] == result["nik_check"]["mismatched_fields"] == []
+
+def test_missing_fields_are_filled_from_the_nik():
+    result = NikDecoder.reconcile(ktp(birth_date="", gender=""))
+    assert (result["birth_date"], result["gender"]) == ("15-08-1990", "Laki-Laki")
+    assert result["nik_check"]["corrected_fields"] == ["birth_date", "gender"]
+    assert result["nik_check"]["issues"] == []
+
+def test_disagreement_keeps_the_card_value_and_is_reported():
+    result = NikDecoder.reconcile(ktp(birth_date="16-08-1990", gender="Perempuan"))
+    assert (result["birth_date"], result["gender"]) == ("16-08-1990", "Perempuan")
+    assert result["nik_check"]["mismatched_fields"] == ["birth_date", "gender"]
+    assert result["nik_check"]["corrected_fields"] == []
+    assert len(result["nik_check"]["issues"]) == 2
+
+    birth_date, birth_date_text, warnings = CriminalLetterService._resolve_birth_date(result)
+    assert birth_date_text == "16-08-1990" and warnings
+
+def test_invalid_nik_changes_nothing():
+    result = NikDecoder.reconcile(ktp(nik="123", birth_date=""))
+    assert not result["nik_check"]["valid"]
+    assert result["birth_date"] == ""
+    assert result["nik_check"]["issues"]
@@ -0,0 +1,27 @@
+import pytest
+from config.setting import env
+from app.tools.office_converter_pool import OfficeConverterPool, OfficeWorker
+
+@pytest.fixture
+def workers(monkeypatch):
+    """Fake LibreOffice: worker 1 fails to start, the others come up."""
+    running = set()
+
+    def start(worker):
+        if worker.index == 1:
+            raise RuntimeError(f"Office worker {worker.index} did not start")
+        running.add(worker.index)
+
+    monkeypatch.setattr(env, "OFFICE_CONVERTER_ENABLED", True)
+    monkeypatch.setattr(env, "OFFICE_CONVERTER_WORKERS", 3)
+    monkeypatch.setattr(OfficeWorker, "start", start)
+    monkeypatch.setattr(OfficeWorker, "stop", lambda worker: running.discard(worker.index))
+    yield running
+    OfficeConverterPool.shutdown()
+    OfficeConverterPool._start_lock = None
+
+async def test_failed_start_stops_the_workers_that_came_up(workers):
+    with pytest.raises(RuntimeError, match="did not start"):
+        await OfficeConverterPool.start()
+    assert workers == set()
+    assert OfficeConverterPool._idle is None and OfficeConverterPool._workers == []
@@ -0,0 +1,87 @@
+import io
+import time
+import base64
+import textwrap
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+from app.tools.papi_image_renderer import (
+    BG_COLOR, FONT_BOLD, FONT_REGULAR, FORMATS, MARGIN, STRENGTH_COLOR, TEXT_COLOR, WEAKNESS_COLOR, WIDTH,
+    PapiImageRenderer
+)
+
+PARAGRAPH = (
+    "Komitmen tinggi dalam menangani tugas satu persatu, tapi masih bisa merubah prioritas jika terpaksa. "
+    "Pekerja keras, memiliki tujuan yang jelas, memperhatikan keteraturan dan sistematika kerja."
+)
+SUMMARY = ("Candidate Name", "candidate@example.com", [PARAGRAPH] * 5, [PARAGRAPH] * 5)
+RENDERS = 10
+
+def legacy_render(name, email, strengths, weaknesses) -> bytes:
+    # Former PapiService.generate_image: fonts per call, 800x2000 canvas, char wrap, crop
+    img = Image.new("RGB", (800, 2000), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+    font_title = ImageFont.truetype(FONT_BOLD, 36)
+    font_header = ImageFont.truetype(FONT_BOLD, 24)
+    font_sub = ImageFont.truetype(FONT_REGULAR, 20)
+    font_text = ImageFont.truetype(FONT_REGULAR, 18)
+    y = 50
+    draw.text((50, y), "PAPI Kostick Summary", font=font_title, fill=TEXT_COLOR)
+    y += 60
+    draw.text((50, y), f"Candidate: {name}", font=font_header, fill=TEXT_COLOR)
+    y += 40
+    draw.text((50, y), f"Email: {email}", font=font_sub, fill=TEXT_COLOR)
+    y += 80
+    for index, (title, color, points) in enumerate((("Strengths", STRENGTH_COLOR, strengths), ("Weaknesses", WEAKNESS_COLOR, weaknesses))):
+        if index:
+            y += 30
+        draw.text((50, y), title, font=font_header, fill=color)
+        y += 40
+        for point in points:
+            for idx, line in enumerate(textwrap.wrap(point, width=70)):
+                draw.text((70, y), f"• {line}" if idx == 0 else line, font=font_text, fill=TEXT_COLOR)
+                y += 25
+            y += 10
+    img = img.crop((0, 0, 800, y + 50))
+    output = io.BytesIO()
+    img.save(output, format="PNG")
+    return output.getvalue()
+
+def best_of(func, *args, **kwargs) -> float:
+    timings = []
+    for _ in range(RENDERS):
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+@pytest.mark.parametrize("image_format", list(FORMATS))
+def test_render_formats(image_format):
+    pil_format, _, _ = FORMATS[image_format]
+    _, height = PapiImageRenderer.layout(*SUMMARY)
+    image = Image.open(io.BytesIO(PapiImageRenderer.render(*SUMMARY, image_format=image_format)))
+    assert image.format == pil_format
+    assert image.size == (WIDTH, height)
+
+def test_canvas_fits_the_content():
+    _, short = PapiImageRenderer.layout("A", "a@example.com", [PARAGRAPH], [])
+    _, long = PapiImageRenderer.layout(*SUMMARY)
+    assert short < long
+
+def test_wrap_respects_pixel_width():
+    font = PapiImageRenderer.fonts()["text"]
+    max_width = WIDTH - 3 * MARGIN
+    lines = PapiImageRenderer.wrap(PARAGRAPH + " " + "x" * 200, font, max_width, prefix="• ")
+    assert lines[0].startswith("• ")
+    assert all(font.getlength(line) <= max_width for line in lines)
+    assert "".join(lines).replace(" ", "") == ("• " + PARAGRAPH + " " + "x" * 200).replace(" ", "")
+
+def test_png_is_smaller_and_faster_than_legacy():
+    legacy = legacy_render(*SUMMARY)
+    PapiImageRenderer.fonts()
+    png = PapiImageRenderer.render(*SUMMARY)
+    assert len(png) < len(legacy) / 2
+    assert best_of(PapiImageRenderer.render, *SUMMARY) < best_of(legacy_render, *SUMMARY)
+
+async def test_render_async_in_process_pool(process_pool):
+    encoded = await PapiImageRenderer.render_async(*SUMMARY, image_format="webp")
+    assert Image.open(io.BytesIO(base64.b64decode(encoded))).format == "WEBP"
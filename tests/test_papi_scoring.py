@@ -0,0 +1,106 @@
+import time
+import numpy as np
+import pytest
+from app.tools.papi_scorer import FACTORS, N_QUESTIONS, PapiScorer
+from app.tools.papi_interpretation import (
+    INTERPRETATION_RULES, NO_INTERPRETATION, OUT_OF_RANGE, PapiInterpretation
+)
+
+CANDIDATES = 10000
+
+def legacy_scores(answers):
+    # Former PapiService.calculate_scores: per-factor COUNTIF sums over excel rows
+    def val(row_num):
+        idx = row_num - 4
+        return answers[idx] if 0 <= idx < 90 else 0
+
+    def count(rows, answer):
+        return sum(1 for r in rows if val(r) == answer)
+
+    g_rows = [4, 15, 26, 37, 48, 59, 70, 81, 92]
+    z_rows = [5, 16, 27, 38, 49, 60, 71, 82, 93]
+    scores = {}
+    scores["G"] = count(g_rows, 2)
+    scores["L"] = count([92], 1) + count([91, 80, 69, 58, 47, 36, 25, 14], 2)
+    scores["I"] = count([81, 91], 1) + count([90, 79, 68, 57, 46, 35, 24], 2)
+    scores["T"] = count([70, 80, 90], 1) + count([89, 78, 67, 56, 45, 34], 2)
+    scores["V"] = count([59, 69, 79, 89], 1) + count([88, 77, 66, 55, 44], 2)
+    scores["S"] = count([48, 58, 68, 78, 88], 1) + count([87, 76, 65, 54], 2)
+    scores["R"] = count([37, 47, 57, 67, 77, 87], 1) + count([86, 75, 64], 2)
+    scores["D"] = count([13, 23, 33, 43, 53, 63, 73, 83, 93], 1)
+    scores["C"] = count([12, 22, 32, 42, 52, 62, 72, 82], 1) + count([13], 2)
+    scores["E"] = count([11, 21, 31, 41, 51, 61, 71], 1) + count([12, 23], 2)
+    scores["N"] = count([10, 20, 30, 40, 50, 60], 1) + count([11, 22, 33], 2)
+    scores["A"] = count([9, 19, 29, 39, 49], 1) + count([10, 21, 32, 43], 2)
+    scores["P"] = count([8, 18, 28, 38], 1) + count([9, 20, 31, 42, 53], 2)
+    scores["X"] = count([7, 17, 27], 1) + count([8, 19, 30, 41, 52, 63], 2)
+    scores["B"] = count([6, 16], 1) + count([7, 18, 29, 40, 51, 62, 73], 2)
+    scores["O"] = count([5], 1) + count([6, 17, 28, 39, 50, 61, 72, 83], 2)
+    scores["Z"] = count(z_rows, 2)
+    scores["K"] = count(g_rows, 1)
+    scores["F"] = 9 - scores["L"]
+    scores["W"] = count(z_rows, 1)
+    return scores
+
+def legacy_interpretation(scores):
+    # Former PapiService interpretation: range scan over every rule of the factor
+    interprets = {}
+    for factor, score in scores.items():
+        rule = INTERPRETATION_RULES.get(factor)
+        if not rule:
+            interprets[factor] = NO_INTERPRETATION
+            continue
+        interprets[factor] = next((desc for (low, high), desc in rule.items() if low <= score <= high), OUT_OF_RANGE)
+    return interprets
+
+@pytest.fixture(scope="module")
+def answers():
+    return np.random.default_rng(42).integers(1, 3, size=(CANDIDATES, N_QUESTIONS))
+
+def test_score_matches_legacy_per_candidate(answers):
+    for row in answers[:500].tolist():
+        scores = PapiScorer.score(row)
+        assert list(scores) == FACTORS
+        assert scores == legacy_scores(row)
+
+def test_score_matrix_matches_legacy_on_a_batch(answers):
+    expected = [legacy_scores(row) for row in answers.tolist()]
+    assert PapiScorer.to_dicts(PapiScorer.score_matrix(answers)) == expected
+
+def test_score_extremes():
+    for answer in (1, 2):
+        assert PapiScorer.score([answer] * N_QUESTIONS) == legacy_scores([answer] * N_QUESTIONS)
+
+@pytest.mark.parametrize("answers", [[1] * 89, [[1] * 90, [2] * 89], [1] * 89 + [3]])
+def test_score_rejects_malformed_answers(answers):
+    with pytest.raises(ValueError):
+        PapiScorer.score_matrix(answers)
+
+def test_score_matrix_outpaces_legacy_at_10k_candidates(answers):
+    answer_lists = answers.tolist()
+    started = time.perf_counter()
+    for row in answer_lists:
+        legacy_scores(row)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    PapiScorer.to_dicts(PapiScorer.score_matrix(answers))
+    batch_seconds = time.perf_counter() - started
+    assert batch_seconds < legacy_seconds / 5
+
+def test_interpretation_matches_legacy(answers):
+    matrix = PapiScorer.score_matrix(answers)
+    score_dicts = PapiScorer.to_dicts(matrix)
+    expected = [legacy_interpretation(scores) for scores in score_dicts]
+    assert [PapiInterpretation.lookup(scores) for scores in score_dicts] == expected
+    assert PapiInterpretation.to_dicts(PapiInterpretation.lookup_matrix(matrix)) == expected
+
+def test_interpretation_covers_every_score():
+    for score in range(10):
+        scores = {factor: score for factor in FACTORS}
+        assert PapiInterpretation.lookup(scores) == legacy_interpretation(scores)
+
+def test_interpretation_out_of_range_and_unknown_factor():
+    assert PapiInterpretation.lookup({"G": 10, "?": 3}) == {"G": OUT_OF_RANGE, "?": NO_INTERPRETATION}
+    texts = PapiInterpretation.lookup_matrix([[-1] + [0] * (len(FACTORS) - 1)])
+    assert texts[0, 0] == OUT_OF_RANGE
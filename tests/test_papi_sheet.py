@@ -0,0 +1,19 @@
+import io
+import pytest
+import pandas as pd
+from app.tools.papi_sheet import PapiSheet
+
+ANSWERS = ",".join(["1", "2"] * 45)
+
+def test_csv_and_xlsx_sheets_are_read():
+    df = pd.DataFrame([{"nama": "Budi Santoso", "email": "budi@example.com", "answers": ANSWERS}])
+    xlsx = io.BytesIO()
+    df.to_excel(xlsx, index=False)
+    for file_bytes, filename in ((df.to_csv(index=False).encode(), "batch.csv"), (xlsx.getvalue(), "Batch.XLSX")):
+        candidates, answers, errors = PapiSheet.parse(file_bytes, filename)
+        assert [c["candidate_name"] for c in candidates] == ["Budi Santoso"]
+        assert answers.shape == (1, 90) and errors == []
+
+def test_legacy_xls_is_rejected_with_a_clear_error():
+    with pytest.raises(ValueError, match=r"\.xlsx or \.csv"):
+        PapiSheet.parse(b"\xd0\xcf\x11\xe0", "batch.xls")
@@ -0,0 +1,48 @@
+import time
+import asyncio
+import pytest
+from app.tools.papi_summary_cache import PapiSummaryCache
+from app.utils.AsyncUtils import LoopLagWatchdog, shutdown_executor
+
+DISK_SECONDS = 0.2
+THRESHOLD_MS = 100  # a blocking disk call would lag the loop by DISK_SECONDS (200ms)
+SUMMARY = (["Teliti dalam bekerja"], ["Kurang asertif"])
+
+class SlowDisk:
+    """sqlite connection on a busy disk (WAL checkpoint, shared volume)."""
+    def __init__(self, db):
+        self.db = db
+
+    def execute(self, *args):
+        time.sleep(DISK_SECONDS)
+        return self.db.execute(*args)
+
+    def commit(self):
+        self.db.commit()
+
+@pytest.fixture
+def cache(local_data_dir):
+    PapiSummaryCache().put("sig-1", *SUMMARY)
+    # A fresh instance stands for a restarted worker: memory is empty, sqlite is not
+    cache = PapiSummaryCache()
+    yield cache
+    shutdown_executor()
+
+async def test_summaries_survive_a_restart(cache):
+    assert await cache.aget("sig-1") == SUMMARY
+    assert await cache.aget("sig-2") is None
+
+async def test_disk_access_does_not_block_the_loop(cache):
+    cache._db = SlowDisk(cache._db)
+    LoopLagWatchdog.start(interval=0.01, threshold_ms=THRESHOLD_MS)
+    await asyncio.sleep(0.05)
+
+    # Disk hit (SELECT + UPDATE + commit), memory hit, then a write-through
+    assert await cache.aget("sig-1") == SUMMARY
+    assert await cache.aget("sig-1") == SUMMARY
+    await cache.aput("sig-2", ["Cepat beradaptasi"], ["Mudah bosan"])
+    await asyncio.sleep(0.05)
+
+    LoopLagWatchdog.stop()
+    assert LoopLagWatchdog.max_lag_ms < THRESHOLD_MS
+    assert cache.get("sig-2") == (["Cepat beradaptasi"], ["Mudah bosan"])
@@ -0,0 +1,96 @@
+import time
+import asyncio
+import functools
+import threading
+import pytest
+from pddiktipy.exceptions import APIConnectionError, APIResponseError, ValidationError
+from config.setting import env
+from app.tools import pddikti_client
+from app.tools.pddikti_client import PddiktiClient
+
+def swallow_errors(func):
+    """Same contract as pddiktipy's handle_errors: every error becomes None."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            return None
+    return wrapper
+
+class FakeApi:
+    respond = staticmethod(lambda keyword: [{"nama": keyword}])
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, base_url=None):
+        pass
+
+    @swallow_errors
+    def search_mahasiswa(self, keyword):
+        with FakeApi.lock:
+            FakeApi.running += 1
+            FakeApi.peak = max(FakeApi.peak, FakeApi.running)
+        try:
+            return FakeApi.respond(keyword)
+        finally:
+            with FakeApi.lock:
+                FakeApi.running -= 1
+
+    def close(self):
+        pass
+
+def raise_(error):
+    def respond(keyword):
+        raise error
+    return respond
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(pddikti_client, "pddikti_api", FakeApi)
+    monkeypatch.setattr(env, "PDDIKTI_CIRCUIT_FAILURES", 2)
+    FakeApi.running = FakeApi.peak = 0
+    yield PddiktiClient.get_instance()
+    PddiktiClient.shutdown()
+
+async def test_hits_are_returned_and_cached(client, monkeypatch):
+    assert await client.search_mahasiswa("Budi  Santoso") == [{"nama": "budi santoso"}]
+    monkeypatch.setattr(FakeApi, "respond", staticmethod(raise_(AssertionError("not cached"))))
+    assert await client.search_mahasiswa("budi santoso") == [{"nama": "budi santoso"}]
+
+async def test_not_found_is_an_empty_result_not_a_failure(client, monkeypatch):
+    not_found = APIResponseError("Endpoint not found", status_code=404)
+    monkeypatch.setattr(FakeApi, "respond", staticmethod(raise_(not_found)))
+    for i in range(env.PDDIKTI_CIRCUIT_FAILURES + 1):
+        assert await client.search_mahasiswa(f"nobody {'x' * i}") == []
+    assert not client.is_open
+
+async def test_rejected_lookup_falls_back_without_opening_the_circuit(client, monkeypatch):
+    monkeypatch.setattr(FakeApi, "respond", staticmethod(raise_(ValidationError("Keyword too long"))))
+    for i in range(env.PDDIKTI_CIRCUIT_FAILURES + 1):
+        assert await client.search_mahasiswa(f"long name {'x' * i}") is None
+    assert not client.is_open
+
+async def test_transport_failures_open_the_circuit(client, monkeypatch):
+    monkeypatch.setattr(FakeApi, "respond", staticmethod(raise_(APIConnectionError("Connection refused"))))
+    for i in range(env.PDDIKTI_CIRCUIT_FAILURES):
+        assert await client.search_mahasiswa(f"budi {'x' * i}") is None
+    assert client.is_open
+
+    server_error = APIResponseError("Server error", status_code=503)
+    assert PddiktiClient.is_transport_failure(server_error)
+    assert not PddiktiClient.is_transport_failure(APIResponseError("Forbidden", status_code=403))
+
+async def test_timed_out_calls_keep_their_thread(client, monkeypatch):
+    monkeypatch.setattr(env, "PDDIKTI_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(env, "PDDIKTI_CIRCUIT_FAILURES", 100)
+    monkeypatch.setattr(FakeApi, "respond", staticmethod(lambda keyword: time.sleep(0.3) or []))
+
+    names = [f"budi {'x' * i}" for i in range(env.PDDIKTI_POOL_SIZE * 3)]
+    assert await asyncio.gather(*[client.search_mahasiswa(name) for name in names]) == [None] * len(names)
+    # Second wave while the first one is still stuck in PDDIKTI
+    assert await asyncio.gather(*[client.search_mahasiswa(f"{name} y") for name in names]) == [None] * len(names)
+
+    await asyncio.sleep(0.4)
+    assert FakeApi.peak == env.PDDIKTI_POOL_SIZE
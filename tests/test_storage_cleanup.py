@@ -0,0 +1,49 @@
+import multiprocessing
+import pytest
+from config.setting import env
+from app.tools.file_handler import FileHandler
+from app.tools.storage_cleanup import StorageCleanup
+from app.utils.FileUtils import take_jsonl
+
+@pytest.fixture
+def removed(local_data_dir, monkeypatch):
+    """Paths passed to storage remove calls; paths under broken/ always fail."""
+    removed = []
+
+    async def delete_files(paths):
+        if any(path.startswith("broken/") for path in paths):
+            raise ConnectionError("storage unreachable")
+        removed.extend(paths)
+
+    monkeypatch.setattr(FileHandler, "delete_files", delete_files)
+    monkeypatch.setattr(env, "STORAGE_CLEANUP_RETRY_SECONDS", 0)
+    return removed
+
+async def test_failed_cleanup_goes_to_the_ledger_and_is_retried(removed):
+    StorageCleanup.schedule({"log-1": ["cvs/a.pdf"], "log-2": ["broken/b.pdf"]})
+    while StorageCleanup._tasks:
+        await next(iter(StorageCleanup._tasks))
+
+    assert removed == ["cvs/a.pdf"]
+    assert await StorageCleanup.retry_orphans() == 0
+    # Still failing: kept for the next start
+    assert [entry["paths"] for entry in take_jsonl(StorageCleanup.ledger_path())] == [["broken/b.pdf"]]
+
+def record_from_worker(local_data_dir: str, worker: int, count: int):
+    env.LOCAL_DATA_DIR = local_data_dir
+    for n in range(count):
+        StorageCleanup.record_orphans(f"log-{worker}-{n}", [f"outputs/{worker}/{n}.docx"], "timeout")
+
+async def test_retry_never_drops_orphans_recorded_by_other_workers(removed, local_data_dir):
+    workers, count = 4, 200
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=record_from_worker, args=(str(local_data_dir), w, count)) for w in range(workers)]
+    for process in processes:
+        process.start()
+    while any(process.is_alive() for process in processes):
+        await StorageCleanup.retry_orphans()
+    for process in processes:
+        process.join()
+    await StorageCleanup.retry_orphans()
+
+    assert sorted(removed) == sorted(f"outputs/{w}/{n}.docx" for w in range(workers) for n in range(count))